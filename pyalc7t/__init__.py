@@ -1 +1,13 @@
-from .pyalc7tmain import main
+#
+# Das Hauptprogramm wird erst beim Aufruf geladen, damit Module ohne Qt
+# Abhängigkeit (z.B. der Emulator) ohne Qt importiert werden können
+#
+def main():
+   from .pyalc7tmain import main as pyalc7t_main
+   pyalc7t_main()
+#
+# Daemon ohne Qt
+#
+def daemon():
+   from .alcdaemon import main as daemon_main
+   daemon_main()
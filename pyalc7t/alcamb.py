@@ -0,0 +1,321 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Binäres Format der Logdatei (.amb) -----------------------------------------
+#
+# Alternative zur Textdatei .amw, ausgewählt mit dem Konfigurationsparameter
+# logformat. Eine Aufzeichnung besteht aus zwei Dateien:
+#
+# N_kanalK.amb: fester Dateikopf mit den Einstellungen des Kanals beim Start
+#    der Aufzeichnung (KOPF_FORMAT), danach Messwerte als Sätze fester Länge
+#    (SATZ_FORMAT: Laufzeit in ns, Spannung V, Strom A). Die Datei kann mit
+#    mmap gelesen werden, Satz i liegt bei KOPF_GROESSE+ i* SATZ_GROESSE.
+# N_kanalK.ame: Ereignistabelle, pro Eintrag die Anzahl der vorher
+#    geschriebenen Messwerte und der Text der Ereigniszeilen wie in der .amw
+#    Datei (EREIGNIS_FORMAT + UTF-8 Text).
+#
+# Alle Werte little endian. amw_export() erzeugt daraus genau die .amw Datei,
+# die der Textwriter geschrieben hätte, so dass vorhandene Auswertungen und
+# GNUPLOT Skripte weiter verwendet werden können:
+#
+#    python3 -m pyalc7t.alcamb 0_kanal1.amb [0_kanal1.amw]
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+# - Anhängen an eine vorhandene Datei (Fortsetzen einer Aufzeichnung)
+#
+import argparse
+import errno
+import mmap
+import os
+import struct
+import sys
+import time
+
+from .alcconst import STRR_UNDEF
+from .alclogreader import cls_logreader
+from .alclogwriter import cls_logkopf, messwertzeile, FLUSH_INTERVALL, FLUSH_GROESSE, SYNC_MODI, SYNC_NIE, SYNC_SCHLIESSEN, SYNC_EREIGNIS, SYNC_IMMER
+
+MAGIC=b"AMB1"
+VERSION=1
+#
+# Dateikopf: Magic, Version, Flags, Kanal, Programm, Zellenzahl, Akkutyp,
+# Nennspannung, Ladestrom, Nennkapazität, Entladestrom, Datum, Uhrzeit
+#
+KOPF_FORMAT=struct.Struct("<4sHHHHHH4d10s8s6x")
+KOPF_GROESSE=KOPF_FORMAT.size
+FLAG_SUBSECONDS=1
+#
+# Messwert: Laufzeit ns, Spannung, Strom
+#
+SATZ_FORMAT=struct.Struct("<qdd")
+SATZ_GROESSE=SATZ_FORMAT.size
+#
+# Ereignis: Anzahl Messwerte davor, Länge des Textes in Bytes
+#
+EREIGNIS_FORMAT=struct.Struct("<qI")
+
+#
+# Name der Ereignistabelle zu einer .amb Datei
+#
+def ereignisdatei(dateiname):
+   return os.path.splitext(dateiname)[0]+ ".ame"
+#
+# Dateikopf packen und entpacken, gibt (cls_logkopf, subseconds) zurück.
+# Keine .amb Datei: OSError
+#
+def kopf_packen(logkopf,subseconds):
+   flags= FLAG_SUBSECONDS if subseconds else 0
+   return KOPF_FORMAT.pack(MAGIC,VERSION,flags,logkopf.kanal,logkopf.programm,logkopf.zellen,logkopf.akkutyp,logkopf.unenn,logkopf.ilad,logkopf.cnenn,logkopf.ientl,logkopf.datum.encode("ascii"),logkopf.zeit.encode("ascii"))
+
+def kopf_entpacken(daten):
+   if len(daten) < KOPF_GROESSE or daten[0:4] != MAGIC:
+      raise OSError(errno.EINVAL,"Keine pyalc7t Binärdatei")
+   magic, version, flags, kanal, programm, zellen, akkutyp, unenn, ilad, cnenn, ientl, datum, zeit= KOPF_FORMAT.unpack(daten[:KOPF_GROESSE])
+   if version != VERSION:
+      raise OSError(errno.EINVAL,"Version %d der Binärdatei nicht unterstützt" % version)
+   logkopf= cls_logkopf(datum.decode("ascii"),zeit.decode("ascii"),kanal,programm,zellen,akkutyp,unenn,ilad,cnenn,ientl)
+   return logkopf, bool(flags & FLAG_SUBSECONDS)
+#
+# Vollständige Einträge der Ereignistabelle in daten ab offset, gibt die
+# Liste von (Anzahl Messwerte davor, Text) und den neuen offset zurück
+#
+def ereignisse_entpacken(daten,offset=0):
+   eintraege= [ ]
+   while offset+ EREIGNIS_FORMAT.size <= len(daten):
+      position, laenge= EREIGNIS_FORMAT.unpack_from(daten,offset)
+      ende= offset+ EREIGNIS_FORMAT.size+ laenge
+      if ende > len(daten):
+         break
+      eintraege.append((position, bytes(daten[offset+ EREIGNIS_FORMAT.size:ende]).decode("utf-8",errors="replace")))
+      offset= ende
+   return eintraege, offset
+
+#
+# Messwertsätze aus einem Puffer an einen cls_messwertspeicher anhängen.
+# Auf little endian Rechnern werden die Spalten über memoryviews ohne
+# Entpacken einzelner Sätze gelesen
+#
+def saetze(messwerte,puffer):
+   anzahl= len(puffer) // SATZ_GROESSE
+   if sys.byteorder == "little":
+      ganz= puffer.cast("q")
+      real= puffer.cast("d")
+      messwerte.erweitern([t/ 1e9 for t in ganz[0::3]],real[1::3],real[2::3],bytes([STRR_UNDEF])* anzahl)
+      ganz.release()
+      real.release()
+   else:
+      for laufzeit_ns, spannung, strom in SATZ_FORMAT.iter_unpack(puffer):
+         messwerte.append(laufzeit_ns/ 1e9,spannung,strom,STRR_UNDEF)
+#
+# Schreiben, gleiche Schnittstelle und Puffer-/Sync-Regeln wie cls_logwriter.
+# Beim Anhängen werden unvollständige Sätze und Einträge am Dateiende
+# abgeschnitten, die Zahl der Messwerte ergibt sich aus der Dateigröße
+#
+class cls_ambwriter(object):
+
+   def __init__(self,dateiname,subseconds=False,intervall=FLUSH_INTERVALL,groesse=FLUSH_GROESSE,sync=SYNC_SCHLIESSEN,uhr=time.monotonic,anhaengen=False):
+      self.subseconds= subseconds
+      self.intervall= intervall
+      self.groesse= groesse
+      if sync not in SYNC_MODI:
+         sync= SYNC_SCHLIESSEN
+      self.sync= sync
+      self.uhr= uhr
+      self.puffer= bytearray()
+      self.anzahl= 0
+      modus= "ab" if anhaengen else "wb"
+      self.datei= open(dateiname,modus)
+      try:
+         self.ereignisse= open(ereignisdatei(dateiname),modus)
+         if anhaengen:
+            self.abschneiden()
+      except OSError:
+         self.datei.close()
+         raise
+      self.letzte= self.uhr()
+
+   def abschneiden(self):
+      groesse= os.fstat(self.datei.fileno()).st_size
+      if groesse >= KOPF_GROESSE:
+         self.anzahl= (groesse- KOPF_GROESSE) // SATZ_GROESSE
+         self.datei.truncate(KOPF_GROESSE+ self.anzahl* SATZ_GROESSE)
+      with open(ereignisdatei(self.datei.name),"rb") as f:
+         eintraege, laenge= ereignisse_entpacken(f.read())
+      self.ereignisse.truncate(laenge)
+
+   def kopf(self,logkopf):
+      self.datei.write(kopf_packen(logkopf,self.subseconds))
+      self.flush(self.sync in (SYNC_EREIGNIS, SYNC_IMMER))
+
+   def messwert(self,laufzeit_ns,spannung,strom):
+      self.puffer+= SATZ_FORMAT.pack(laufzeit_ns,spannung,strom)
+      self.anzahl+= 1
+      if len(self.puffer) >= self.groesse or self.uhr()- self.letzte >= self.intervall:
+         self.flush()
+
+   def ereignis(self,zeilen):
+      text= zeilen.encode("utf-8")
+      self.ereignisse.write(EREIGNIS_FORMAT.pack(self.anzahl,len(text))+ text)
+      self.flush(self.sync in (SYNC_EREIGNIS, SYNC_IMMER))
+
+   def flush(self,sync=None):
+      if self.puffer:
+         self.datei.write(self.puffer)
+         self.puffer= bytearray()
+      self.datei.flush()
+      self.ereignisse.flush()
+      self.letzte= self.uhr()
+      if sync is None:
+         sync= self.sync == SYNC_IMMER
+      if sync:
+         os.fsync(self.datei.fileno())
+         os.fsync(self.ereignisse.fileno())
+
+   def close(self):
+      try:
+         self.flush(self.sync != SYNC_NIE)
+      finally:
+         self.datei.close()
+         self.ereignisse.close()
+
+   def verwerfen(self):
+      self.puffer= bytearray()
+      for d in (self.datei, self.ereignisse):
+         try:
+            d.close()
+         except OSError:
+            pass
+
+#
+# Inkrementelles Lesen mit mmap, gleiche Schnittstelle wie cls_logreader.
+# Zusätzlich: logkopf, subseconds und positionen (Einträge der
+# Ereignistabelle als (Anzahl Messwerte davor, Text))
+#
+class cls_ambreader(cls_logreader):
+
+   def reset(self):
+      super().reset()
+      self.logkopf= None
+      self.subseconds= False
+      self.positionen= [ ]
+      self.ereignis_offset= 0
+
+   def lesen(self):
+      try:
+         f= open(self.dateiname,"rb")
+      except FileNotFoundError:
+         if self.offset == 0:
+            return False
+         self.reset()
+         return True
+      with f:
+         st= os.fstat(f.fileno())
+         neu= False
+         if self.offset > 0 and self.ersetzt(f,st):
+            self.reset()
+            neu= True
+         self.inode= st.st_ino
+         if self.offset == 0:
+            if st.st_size < KOPF_GROESSE:
+               return neu
+            self.kopf= f.read(KOPF_GROESSE)
+            self.logkopf, self.subseconds= kopf_entpacken(self.kopf)
+            self.offset= KOPF_GROESSE
+            neu= True
+         anzahl= (st.st_size- self.offset) // SATZ_GROESSE
+         if anzahl > 0:
+            with mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ) as m:
+               with memoryview(m) as v:
+                  saetze(self.messwerte,v[self.offset:self.offset+ anzahl* SATZ_GROESSE])
+            self.offset+= anzahl* SATZ_GROESSE
+      return self.ereignisse_lesen() or neu or anzahl > 0
+#
+#  Neue Einträge der Ereignistabelle lesen
+#
+   def ereignisse_lesen(self):
+      try:
+         with open(ereignisdatei(self.dateiname),"rb") as f:
+            f.seek(self.ereignis_offset)
+            daten= f.read()
+      except FileNotFoundError:
+         return False
+      eintraege, laenge= ereignisse_entpacken(daten)
+      self.ereignis_offset+= laenge
+      for position, text in eintraege:
+         self.positionen.append((position,text))
+         for zeile in text.splitlines():
+            self.zeile(zeile)
+      return len(eintraege) > 0
+
+#
+# Leser passend zur Endung der Logdatei
+#
+def logreader(dateiname):
+   if dateiname.endswith(".amb"):
+      return cls_ambreader(dateiname)
+   return cls_logreader(dateiname)
+
+#
+# .amb Datei als .amw Datei ausgeben
+#
+def amw_export(quelle,ziel):
+   with open(quelle,"rb") as f:
+      logkopf, subseconds= kopf_entpacken(f.read(KOPF_GROESSE))
+      try:
+         with open(ereignisdatei(quelle),"rb") as e:
+            ereignisse, laenge= ereignisse_entpacken(e.read())
+      except FileNotFoundError:
+         ereignisse= [ ]
+      groesse= os.fstat(f.fileno()).st_size
+      anzahl= (groesse- KOPF_GROESSE) // SATZ_GROESSE
+      with open(ziel,"w") as z:
+         z.write(logkopf.text())
+         j= 0
+         if anzahl > 0:
+            with mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ) as m:
+               with memoryview(m) as v:
+                  for i, (laufzeit_ns, spannung, strom) in enumerate(SATZ_FORMAT.iter_unpack(v[KOPF_GROESSE:KOPF_GROESSE+ anzahl* SATZ_GROESSE])):
+                     while j < len(ereignisse) and ereignisse[j][0] <= i:
+                        z.write(ereignisse[j][1])
+                        j+= 1
+                     z.write(messwertzeile(laufzeit_ns,spannung,strom,subseconds))
+         for position, text in ereignisse[j:]:
+            z.write(text)
+   return anzahl
+
+def main():
+   parser=argparse.ArgumentParser(description='Convert a pyalc7t binary log file (.amb) to the .amw text format')
+   parser.add_argument('datei',help='.amb file')
+   parser.add_argument('ziel',nargs='?',help='.amw file (default: same name with .amw)')
+   args=parser.parse_args()
+   ziel= args.ziel
+   if ziel is None:
+      ziel= os.path.splitext(args.datei)[0]+ ".amw"
+   anzahl= amw_export(args.datei,ziel)
+   print("%d Messwerte nach %s geschrieben" % (anzahl,ziel))
+
+if __name__ == "__main__":
+   main()
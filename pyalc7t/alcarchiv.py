@@ -0,0 +1,216 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Archivierung der Logdateien -----------------------------------------------
+#
+# Jede Aufzeichnung wird in eine eigene Datei mit Zeitstempel im Namen
+# geschrieben, z.B. kanal1_20261018-142305.amw oder kanal2_g2_...amb (mit
+# Ereignistabelle .ame). Beim Start einer Aufzeichnung wird damit nur eine
+# Datei angelegt, es wird nichts umbenannt oder gelöscht.
+#
+# Die vorherige Aufzeichnung des Kanals wird dann an einen Hintergrundthread
+# übergeben. Dieser komprimiert sie optional (gzip oder xz) und löscht
+# Aufzeichnungen des Kanals, die über die eingestellte Anzahl hinausgehen
+# oder älter als die eingestellte Zahl von Tagen sind. Die jeweils letzte
+# abgeschlossene Aufzeichnung bleibt unkomprimiert, damit sie im
+# Messwertfenster angezeigt werden kann. Dateien mit anderen Namen, z.B. die
+# früheren 0_kanal1.amw ... 3_kanal1.amw, werden nicht angetastet.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+#
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+
+try:
+   import gzip
+   HAS_GZIP=True
+except ImportError:
+   HAS_GZIP=False
+try:
+   import lzma
+   HAS_LZMA=True
+except ImportError:
+   HAS_LZMA=False
+
+#
+# Kompressionsverfahren
+#
+KOMPRESSION_KEINE=""
+KOMPRESSION_GZIP="gzip"
+KOMPRESSION_XZ="xz"
+#
+# Endungen der Dateien einer Aufzeichnung und komprimierter Dateien
+#
+ENDUNGEN=(".amw", ".amb", ".ame")
+KOMPRIMIERT=(".gz", ".xz")
+#
+# Wartezeit auf den Hintergrundthread beim Beenden in Sekunden
+#
+WARTEZEIT_ENDE=30
+
+class cls_logarchiv(object):
+#
+#  kompression: "", "gzip" oder "xz", anzahl: Zahl der Aufzeichnungen pro
+#  Kanal, die erhalten bleiben, alter: Alter in Tagen, ab dem Aufzeichnungen
+#  gelöscht werden. 0 bedeutet jeweils unbegrenzt. verzeichnis: "" ist das
+#  aktuelle Verzeichnis (Arbeitsverzeichnis)
+#
+   def __init__(self,kompression=KOMPRESSION_KEINE,anzahl=0,alter=0,verzeichnis=""):
+      if kompression == KOMPRESSION_GZIP and not HAS_GZIP:
+         kompression= KOMPRESSION_KEINE
+      if kompression == KOMPRESSION_XZ and not HAS_LZMA:
+         kompression= KOMPRESSION_KEINE
+      if kompression not in (KOMPRESSION_GZIP, KOMPRESSION_XZ):
+         kompression= KOMPRESSION_KEINE
+      self.kompression= kompression
+      self.anzahl= anzahl
+      self.alter= alter
+      self.verzeichnis= verzeichnis
+      self.auftraege= queue.Queue()
+      self.thread= threading.Thread(target=self.run,name="logarchiv",daemon=True)
+      self.thread.start()
+#
+#  Präfix der Dateinamen eines Kanals
+#
+   def praefix(self,kanal,suffix):
+      return "kanal%d%s_" % (kanal,suffix)
+
+   def muster(self,kanal,suffix):
+      return re.compile(re.escape(self.praefix(kanal,suffix))+ r"(\d{8}-\d{6}(-\d+)?)(\.am[wbe])(\.gz|\.xz)?$")
+#
+#  Name für eine neue Aufzeichnung, beginn ist ein datetime
+#
+   def neuer_name(self,kanal,suffix,endung,beginn):
+      basis= self.praefix(kanal,suffix)+ beginn.strftime("%Y%m%d-%H%M%S")
+      name= basis+ endung
+      i= 1
+      while self.vorhanden(name):
+         name= "%s-%d%s" % (basis,i,endung)
+         i+= 1
+      return os.path.join(self.verzeichnis,name)
+
+   def vorhanden(self,name):
+      pfad= os.path.join(self.verzeichnis,name)
+      return any(os.path.exists(pfad+ k) for k in ("",)+ KOMPRIMIERT)
+#
+#  Letzte unkomprimierte Aufzeichnung des Kanals, None wenn es keine gibt
+#
+   def letzte(self,kanal,suffix,endung):
+      m= self.muster(kanal,suffix)
+      namen= [ ]
+      for e in os.scandir(self.verzeichnis or "."):
+         t= m.match(e.name)
+         if t is not None and t.group(3) == endung and t.group(4) is None:
+            namen.append(e.name)
+      if not namen:
+         return None
+      return os.path.join(self.verzeichnis,max(namen,key=self.sortierschluessel))
+#
+#  Sortierung nach Zeitstempel, bei gleicher Sekunde nach laufender Nummer
+#
+   def sortierschluessel(self,name):
+      t= re.search(r"(\d{8}-\d{6})(?:-(\d+))?\.am",name)
+      if t is None:
+         return ("", 0)
+      return (t.group(1), int(t.group(2) or 0))
+#
+#  Abgeschlossene Aufzeichnung archivieren (im Hintergrund)
+#
+   def archivieren(self,dateiname,kanal,suffix):
+      self.auftraege.put((dateiname,kanal,suffix))
+#
+#  Hintergrundthread beenden, laufende Arbeiten werden noch abgeschlossen
+#
+   def beenden(self):
+      self.auftraege.put(None)
+      self.thread.join(WARTEZEIT_ENDE)
+
+   def run(self):
+      while True:
+         auftrag= self.auftraege.get()
+         if auftrag is None:
+            break
+         dateiname, kanal, suffix= auftrag
+         try:
+            if self.muster(kanal,suffix).match(os.path.basename(dateiname)):
+               self.komprimieren(dateiname)
+            self.aufraeumen(kanal,suffix)
+         except OSError:
+            pass
+#
+#  Aufzeichnung komprimieren, bei .amb auch die Ereignistabelle. Die
+#  komprimierte Datei wird erst unter einem temporären Namen geschrieben,
+#  ein Abbruch hinterlässt also keine unvollständige Datei
+#
+   def komprimieren(self,dateiname):
+      if self.kompression == KOMPRESSION_KEINE:
+         return
+      dateien= [dateiname]
+      basis, endung= os.path.splitext(dateiname)
+      if endung == ".amb":
+         dateien.append(basis+ ".ame")
+      for d in dateien:
+         if not os.path.isfile(d):
+            continue
+         if self.kompression == KOMPRESSION_GZIP:
+            ziel= d+ ".gz"
+            oeffnen= gzip.open
+         else:
+            ziel= d+ ".xz"
+            oeffnen= lzma.open
+         tmp= ziel+ ".tmp"
+         with open(d,"rb") as q, oeffnen(tmp,"wb") as z:
+            shutil.copyfileobj(q,z)
+         shutil.copystat(d,tmp)
+         os.replace(tmp,ziel)
+         os.remove(d)
+#
+#  Aufzeichnungen des Kanals über die Anzahl hinaus oder zu alte löschen,
+#  die neueste Aufzeichnung bleibt immer erhalten
+#
+   def aufraeumen(self,kanal,suffix):
+      if self.anzahl <= 0 and self.alter <= 0:
+         return
+      m= self.muster(kanal,suffix)
+      aufzeichnungen= { }
+      for e in os.scandir(self.verzeichnis or "."):
+         t= m.match(e.name)
+         if t is not None:
+            aufzeichnungen.setdefault(t.group(1),[ ]).append(e)
+      schluessel= sorted(aufzeichnungen,key=lambda s: self.sortierschluessel(s+ ".am"),reverse=True)
+      grenze= time.time()- self.alter* 86400
+      for i, s in enumerate(schluessel):
+         if i == 0:
+            continue
+         dateien= aufzeichnungen[s]
+         zu_alt= self.alter > 0 and max(e.stat().st_mtime for e in dateien) < grenze
+         if (self.anzahl > 0 and i >= self.anzahl) or zu_alt:
+            for e in dateien:
+               os.remove(e.path)
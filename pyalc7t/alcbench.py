@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Messung der Startzeit der GUI (nur Linux/macOS) ---------------------------
+#
+# Startet pyALC7T mehrfach in einem eigenen Prozess mit einer temporären
+# Konfiguration und dem Emulator als Ladegerät und misst die Zeit bis das
+# Hauptfenster zum ersten Mal gezeichnet wird (time-to-window) sowie den
+# maximalen Speicherbedarf (peak RSS) bis zu diesem Zeitpunkt. Die Zeit
+# wird ab dem Start des Prozesses gemessen, enthält also auch den Start des
+# Python Interpreters.
+#
+# Aufruf: python3 -m pyalc7t.alcbench [--runs N] [--platform offscreen]
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+#
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .alcconst import VERSION
+
+#
+# Wartezeit auf einen Start in Sekunden
+#
+TIMEOUT=60
+
+#
+# Kindprozess: GUI starten, beim ersten Zeichnen des Hauptfensters Zeit
+# seit Prozessstart und peak RSS ausgeben und sofort beenden
+#
+def fenster():
+   t0= time.perf_counter()
+   from . import pyalc7tmain
+   from .alcwidgets import cls_ui
+   QtCore= pyalc7tmain.QtCore
+   QtWidgets= pyalc7tmain.QtWidgets
+
+   class cls_filter(QtCore.QObject):
+      def eventFilter(self,obj,event):
+         if event.type() == QtCore.QEvent.Paint and isinstance(obj,cls_ui):
+            maxrss= resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform != "darwin":
+               maxrss*= 1024
+            print(json.dumps({"python": time.perf_counter()- t0, "maxrss": maxrss}),flush=True)
+            os._exit(0)
+         return False
+
+   pyalc7tmain.vorbereiten()
+   app= QtWidgets.QApplication(sys.argv)
+   f= cls_filter()
+   app.installEventFilter(f)
+   class args: instance=""
+   alc7t= pyalc7tmain.cls_alc7t(args)
+   app.exec()
+
+#
+# Einen Start messen, gibt (time-to-window, python, maxrss) zurück
+#
+def messen(env):
+   beginn= time.perf_counter()
+   p= subprocess.Popen([sys.executable,"-m","pyalc7t.alcbench","--fenster"],env=env,stdout=subprocess.PIPE,universal_newlines=True)
+   try:
+      zeile= p.stdout.readline()
+      ende= time.perf_counter()
+      p.wait(TIMEOUT)
+   except subprocess.TimeoutExpired:
+      p.kill()
+      raise
+   if not zeile:
+      raise RuntimeError("pyALC7T wurde ohne Hauptfenster beendet")
+   werte= json.loads(zeile)
+   return ende- beginn, werte["python"], werte["maxrss"]
+
+#
+# Hauptprogramm ---------------------------------------------------------------
+#
+def main():
+   parser=argparse.ArgumentParser(description='Measure pyalc7t GUI startup: time-to-window and peak RSS')
+   parser.add_argument('--runs', type=int, default=5, help="number of startups")
+   parser.add_argument('--platform', default="", help="Qt platform plugin, e.g. offscreen")
+   parser.add_argument('--fenster', action='store_true', help=argparse.SUPPRESS)
+   args=parser.parse_args()
+   if args.fenster:
+      fenster()
+      return
+   from .alcemu import cls_alc7000emu
+   emu= cls_alc7000emu()
+   home= tempfile.mkdtemp()
+   try:
+      workdir= os.path.join(home,"work")
+      os.makedirs(workdir)
+      configdir= os.path.join(home,".config","pyalc7t")
+      os.makedirs(configdir)
+      config= {"pyalc7t_tty": emu.start(), "pyalc7t_workdir": workdir, "pyalc7t_version": VERSION,
+               "pyalc7t_position": [100,100], "pyalc7t_gnuplot": "", "pyalc7t_plotsize": 400, "pyalc7t_helpposition": ""}
+      with open(os.path.join(configdir,"pyalc7t1"),"w") as f:
+         json.dump(config,f)
+      env= dict(os.environ,HOME=home)
+      env["PYTHONPATH"]= os.pathsep.join([os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]+ [p for p in [os.environ.get("PYTHONPATH")] if p])
+      if args.platform:
+         env["QT_QPA_PLATFORM"]= args.platform
+      ergebnisse= [ ]
+      for i in range(args.runs):
+         t, py, rss= messen(env)
+         ergebnisse.append((t,py,rss))
+         print("run %d: time-to-window %6.3f s (python %6.3f s), peak RSS %6.1f MB" % (i+1, t, py, rss/ 1048576),flush=True)
+      t= statistics.median(e[0] for e in ergebnisse)
+      py= statistics.median(e[1] for e in ergebnisse)
+      rss= statistics.median(e[2] for e in ergebnisse)
+      print("median: time-to-window %6.3f s (python %6.3f s), peak RSS %6.1f MB" % (t, py, rss/ 1048576))
+   finally:
+      emu.stop()
+      shutil.rmtree(home,ignore_errors=True)
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Sicherung des Aufzeichnungszustands eines Kanals --------------------------
+#
+# Während einer Aufzeichnung wird der Zustand des Kanals (Logdatei,
+# Sitzung, Laufzeit, berechnete Kapazitäten, Min/Max Spannung, Delta-Peak
+# usw.) regelmäßig in eine kleine JSON Datei geschrieben. Die Datei wird
+# zuerst unter einem temporären Namen geschrieben und dann mit os.replace
+# ersetzt, sie ist also immer vollständig, auch nach einem Absturz oder
+# Stromausfall. Nach einem Neustart oder Reconnect kann die Aufzeichnung
+# damit fortgesetzt werden, ohne die Logdatei neu auswerten zu müssen. Die
+# Messwerte vor der Unterbrechung werden erst bei Bedarf (Messwertfenster,
+# Sitzungsdatenbank) aus der Logdatei geladen.
+# Beim normalen Ende der Aufzeichnung wird die Datei gelöscht.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+#
+import json
+import os
+
+#
+# Version des Dateiinhalts, Dateien anderer Versionen werden ignoriert
+#
+VERSION=1
+
+class cls_checkpoint(object):
+
+   def __init__(self,dateiname):
+      self.dateiname= dateiname
+#
+#  Zustand (dict) atomar schreiben, Fehler lösen OSError aus
+#
+   def schreiben(self,zustand):
+      zustand= dict(zustand,version=VERSION)
+      tmp= self.dateiname+ ".tmp"
+      with open(tmp,"w") as f:
+         json.dump(zustand,f)
+         f.flush()
+         os.fsync(f.fileno())
+      os.replace(tmp,self.dateiname)
+#
+#  Gesicherten Zustand lesen, None wenn keiner vorhanden oder die Datei
+#  unlesbar ist
+#
+   def lesen(self):
+      try:
+         with open(self.dateiname,"r") as f:
+            zustand= json.load(f)
+      except (OSError, ValueError):
+         return None
+      if not isinstance(zustand,dict) or zustand.get("version") != VERSION:
+         return None
+      return zustand
+
+   def loeschen(self):
+      try:
+         os.remove(self.dateiname)
+      except FileNotFoundError:
+         pass
@@ -29,7 +29,10 @@
 # - von pyILPER übernommen
 # 14.05.2017 jsi:
 # - Fehlermeldung eingedeutscht
+# 18.10.2026 agent:
+# - Standardwerte der Konfiguration für GUI und Daemon (defaults)
 #
+import os
 from .userconfig import cls_userconfig, ConfigError
 
 
@@ -75,6 +78,38 @@ class cls_alcconfig:
             p=default
       return(p)
 #
+#  Set the default values of all keys that do not exist yet
+#
+   def defaults(self,name):
+      self.get(name,"tty","")
+      self.get(name,"workdir", os.path.expanduser('~'))
+      self.get(name,"gnuplot", "")
+      self.get(name,"plotsize", 400)
+      self.get(name,"version","0.0.0")
+      self.get(name,"position","")
+      self.get(name,"helpposition","")
+      self.get(name,"delay",2)
+      self.get(name,"devices",[])
+      self.get(name,"period",0)
+      self.get(name,"idleperiod",10)
+      self.get(name,"probeperiod",15)
+      self.get(name,"subseconds",False)
+      self.get(name,"refreshinterval",1.0)
+      self.get(name,"logflushinterval",10.0)
+      self.get(name,"logflushsize",8192)
+      self.get(name,"logsync","close")
+      self.get(name,"logformat","amw")
+      self.get(name,"sessiondb","sessions.db")
+      self.get(name,"logarchive",True)
+      self.get(name,"logcompress","gzip")
+      self.get(name,"logkeep",0)
+      self.get(name,"logmaxage",0)
+      self.get(name,"checkpointinterval",30.0)
+      self.get(name,"metricsport",0)
+      self.get(name,"metricsaddress","127.0.0.1")
+      self.get(name,"metricsfile","")
+      self.get(name,"serialtrace",False)
+#
 #  Put a key into the configuration dictrionary
 #
    def put(self,name,param,value):
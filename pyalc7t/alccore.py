@@ -42,119 +42,19 @@
 # - Version 1.1.0
 # 05.02.2024 jsi
 # - Version 1.1.1
+# 18.10.2026 agent
+# - Konstanten nach alcconst.py ausgelagert
+# - QtPrintSupport, QtWebKitWidgets und QtWebEngineWidgets werden nicht mehr
+#   beim Import geladen, Web View über webview_klasse() (HAS_WEBENGINE und
+#   HAS_WEBKIT entfallen)
 #
-import platform
 import sys
+from .alcconst import *
 #
-#  Plattform bestimmen
-#
-def isLINUX():
-   return platform.system()=="Linux"
-def isWINDOWS():
-   return platform.system()=="Windows"
-def isMACOS():
-   return platform.system()=="Darwin"
-#
-# encode/decode version number 
-#
-def decode_version(version_number):
-   version=str(version_number)
-   major=int(version[0])
-   minor=int(version[1:3])
-   subversion=int(version[3:5])
-   return "{:d}.{:d}.{:d}".format(major,minor,subversion)
-
-def encode_version(version_string):
-   v=version_string.split(".")
-   major="".join(filter(lambda x: x.isdigit(),v[0]))
-   minor="".join(filter(lambda x: x.isdigit(),v[1]))
-   subversion="".join(filter(lambda x: x.isdigit(),v[2]))
-   return int(major)*10000+ int(minor)*100 + int(subversion)
-
-
-#
-# Programmkonstanten ----------------------------------------------------------------
-#
-PRODUCION= True       # Production/Development Version
-VERSION="1.1.1"       # pyalc7t version number
-CONFIG_VERSION="1"    # Version number of alc7t config file, must be string
-#
-# Python minimum version
-#
-PYTHON_REQUIRED_MAJOR=3
-PYTHON_REQUIRED_MINOR=4
-
-#
-# bei Entwicklungsversionen "(Development)" an Versionsnummer und "d" an config file anfügen
-#
-if not PRODUCION:
-   VERSION=VERSION+" (Development)"
-   CONFIG_VERSION= CONFIG_VERSION+"d"
-
-# Programme
-PROG_LADEN = 0
-PROG_ENTLADEN = 1
-PROG_ENTLADEN_LADEN = 2
-PROG_TEST = 3
-PROG_ZYKLISCH = 4
-PROG_REFRESH = 5
-PROG_UNKNOWN = 6
-dict_programme = { PROG_LADEN : 'Laden', PROG_ENTLADEN_LADEN : 'Entl./Laden', PROG_ENTLADEN : 'Entladen', PROG_TEST : 'Test', PROG_REFRESH : 'Auffríschen', PROG_ZYKLISCH : 'Zyklisch', PROG_UNKNOWN: '----'}
-
-# Kanäle
-KANAL1 = 1
-KANAL2 = 2
-KANAL3 = 3
-KANAL4 = 4
-
-# Akkutypen
-AKKU_TYP_NICD_NIMH = 0
-AKKU_TYP_BLEI = 1
-dict_akku_typ = { AKKU_TYP_NICD_NIMH: 'NiCd/NiMH', AKKU_TYP_BLEI: 'Blei'}
-dict_akku_spannung = { AKKU_TYP_NICD_NIMH : 1.2, AKKU_TYP_BLEI: 2 }
-
-# Kanalstatus
-KSTAT_INAKTIV = 0
-KSTAT_AKTIV = 1
-KSTAT_UNKNOWN = 6
-dict_kstat = { KSTAT_INAKTIV: 'inaktiv', KSTAT_AKTIV: 'aktiv', KSTAT_UNKNOWN: '-' }
-
-# Akkustatus
-AKSTAT_KEIN_AKKU = 0
-AKSTAT_AKKU_ANG = 1
-AKSTAT_AKKU_VOLL = 2
-AKSTAT_AKKU_LEER = 3
-dict_akku_status = { AKSTAT_KEIN_AKKU: 'kein Akku', AKSTAT_AKKU_ANG: 'Akku ang.', AKSTAT_AKKU_VOLL: 'Akku voll', AKSTAT_AKKU_LEER: 'Akku leer' }
-
-# Stromrichtung
-STRR_UNDEF = 0
-STRR_LADEN = 1
-STRR_ENTLADEN = 2
-dict_strr= { STRR_UNDEF : '-', STRR_LADEN : 'laden', STRR_ENTLADEN : 'entladen' }
-
-# Status Kanäle, Gerät
-STAT_DISABLED = 0
-STAT_ENABLED = 1
-UMIN_INIT = 99.999
-
-# Max Ladekapazität (120%)
-CGRENZ=1.2
-# Max Lade-/Entladestrom (120%)
-IGRENZ=1.2
-# Zeitdauer seit Beginn der Aufzeichnung, in dem die Lade-/Entladestromüberprüfung ausgesetzt wird (Sek)
-TCHECKDELAY=120
-
-class KanalError(Exception):
-   def __init__(self,msg,add_msg= None):
-      self.msg= msg
-      self.add_msg = add_msg
-
-#
-# QT Bindings bestimmen
+# QT Bindings bestimmen. Es wird nur QtCore und QtGui geladen, die Web Engine
+# für die Online-Hilfe erst mit webview_klasse()
 #
 QTBINDINGS="None"
-HAS_WEBENGINE=False
-HAS_WEBKIT=False
 # already loaded
 for _b in('PyQt5','PySide6'):
    if _b+'.QtCore' in sys.modules:
@@ -174,31 +74,44 @@ else:
          raise ImportError("No Qt bindings found")
       else:
          QTBINDINGS="PyQt5"
-         from PyQt5 import QtPrintSupport,QtGui
-         QT_FORM_A4=QtPrintSupport.QPrinter.A4
-         QT_FORM_LETTER=QtPrintSupport.QPrinter.Letter
+   else:
+      QTBINDINGS="PySide6"
+if QTBINDINGS=="PyQt5":
+   from PyQt5 import QtGui
+   QT_FORM_A4=QtGui.QPagedPaintDevice.A4
+   QT_FORM_LETTER=QtGui.QPagedPaintDevice.Letter
+else:
+   from PySide6 import QtGui
+   QT_FORM_A4=QtGui.QPageSize.A4
+   QT_FORM_LETTER=QtGui.QPageSize.Letter
+#
+# Klasse der Web View für die Online-Hilfe, wird beim ersten Aufruf geladen.
+# None, wenn weder QtWebEngine noch QtWebKit verfügbar sind. Bei PyQt5 wird
+# QtWebKit bevorzugt
+#
+_WEBVIEW=[ ]
+
+def webview_klasse():
+   if not _WEBVIEW:
+      klasse= None
+      if QTBINDINGS=="PySide6":
          try:
-            from PyQt5 import QtWebKitWidgets
-            HAS_WEBKIT=True
-         except:
+            from PySide6 import QtWebEngineWidgets
+            klasse= QtWebEngineWidgets.QWebEngineView
+         except ImportError:
             pass
+      if QTBINDINGS=="PyQt5":
          try:
-            from PyQt5 import QtWebEngineWidgets
-            HAS_WEBENGINE=True
-         except:
-            pass
-         if HAS_WEBKIT and HAS_WEBENGINE:
-           HAS_WEBENGINE=False
-   else:
-      QTBINDINGS="PySide6"
-      from PySide6 import QtGui
-      QT_FORM_A4=QtGui.QPageSize.A4
-      QT_FORM_LETTER=QtGui.QPageSize.Letter
-      try:
-         from PySide6 import QtWebEngineWidgets
-         HAS_WEBENGINE=True
-      except:
-         pass
+            from PyQt5 import QtWebKitWidgets
+            klasse= QtWebKitWidgets.QWebView
+         except ImportError:
+            try:
+               from PyQt5 import QtWebEngineWidgets
+               klasse= QtWebEngineWidgets.QWebEngineView
+            except ImportError:
+               pass
+      _WEBVIEW.append(klasse)
+   return _WEBVIEW[0]
 
 #
 # Fonts, wird in cls_ui initialisiert
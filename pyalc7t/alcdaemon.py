@@ -0,0 +1,231 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Daemon ohne GUI -----------------------------------------------------------
+#
+# Fragt alle konfigurierten Geräte ab und zeichnet wie das GUI Programm in
+# Logdateien, Sitzungsdatenbank und Archiv auf. Verwendet die gleiche
+# Konfigurationsdatei (Option --instance wie beim GUI Programm) und
+# importiert kein Qt. Statusmeldungen werden auf stdout ausgegeben. Geräte
+# ohne Verbindung werden regelmäßig neu verbunden, laufende Aufzeichnungen
+# werden dabei fortgesetzt. SIGTERM oder SIGINT beenden den Daemon, laufende
+# Aufzeichnungen werden nur unterbrochen.
+#
+# Aufruf: pyalc7t-daemon [--instance INSTANCE] oder
+#         python3 -m pyalc7t.alcdaemon
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+# - Metriken (Konfigurationsparameter metricsport, metricsaddress,
+#   metricsfile)
+# - Absturz eines I/O Threads wird in der Hauptschleife aufgeräumt
+#
+import argparse
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+
+from .alcconst import *
+from .alcconfig import ALCCONFIG, AlcConfigError
+from .alcdevicekern import cls_devicekern, cls_deviceregistry
+from .alcrs232 import Rs232Error
+from .alcsessiondb import cls_sessiondb, SessionDbError
+from .alcarchiv import cls_logarchiv
+from .alcmetrics import cls_metriken, cls_metrikexport
+
+#
+# Wartezeit zwischen Verbindungsversuchen in Sekunden
+#
+RECONNECT_INTERVALL=30.0
+
+#
+# Gerät des Daemons: der Absturz des I/O Threads wird wie im GUI Programm an
+# den Hauptthread übergeben, damit nur dieser verbindet und disabled
+#
+class cls_daemondevice(cls_devicekern):
+
+   def emit_crash(self):
+      self.alc7t.absturz(self)
+
+class cls_daemon(object):
+
+   def __init__(self,instance="",reconnect=RECONNECT_INTERVALL):
+      self.name= "pyalc7t"
+      self.instance= instance if instance.isalnum() else ""
+      self.reconnect= reconnect
+      self.status= STAT_DISABLED
+      self.sessiondb= None
+      self.logarchiv= None
+      self.metriken= None
+      self.metrikexport= None
+      self.message=""
+      self.lock= threading.Lock()
+      self.ende= threading.Event()
+      self.wecker= threading.Event()
+      self.abstuerze= queue.Queue()
+      ALCCONFIG.open(self.name,CONFIG_VERSION,self.instance) # throws AlcConfigError
+      ALCCONFIG.defaults(self.name)
+      ALCCONFIG.save()
+      self.devices= cls_deviceregistry(self,cls_daemondevice)
+#
+#  Statusmeldung ausgeben, wird von den I/O Threads aufgerufen
+#
+   def show_refresh_message(self):
+      with self.lock:
+         message= self.devices.messages()
+         if message == self.message:
+            return
+         self.message= message
+         print(time.strftime("%Y-%m-%d %H:%M:%S"),message,flush=True)
+
+   def meldung(self,message):
+      with self.lock:
+         print(time.strftime("%Y-%m-%d %H:%M:%S"),message,flush=True)
+#
+#  I/O Thread eines Geräts abgestürzt, wird vom Thread aufgerufen
+#
+   def absturz(self,device):
+      self.abstuerze.put(device)
+      self.wecker.set()
+#
+#  Abgestürzte Geräte disablen, im Hauptthread
+#
+   def aufraeumen(self):
+      while True:
+         try:
+            device= self.abstuerze.get_nowait()
+         except queue.Empty:
+            return
+         device.do_crash_cleanup()
+#
+#  Arbeitsverzeichnis, Sitzungsdatenbank und Archiv öffnen, Geräte
+#  verbinden. False wenn das Arbeitsverzeichnis nicht verfügbar ist
+#
+   def enable(self):
+      if self.status== STAT_ENABLED:
+         return True
+      try:
+         os.chdir(ALCCONFIG.get(self.name,"workdir"))
+      except (EnvironmentError, TypeError):
+         self.meldung("Kann nicht auf Arbeitsverzeichnis wechseln")
+         return False
+      dbname= ALCCONFIG.get(self.name,"sessiondb")
+      if dbname != "":
+         try:
+            self.sessiondb= cls_sessiondb(dbname)
+         except SessionDbError as e:
+            self.meldung("Kann Sitzungsdatenbank nicht öffnen: "+e.value)
+      if ALCCONFIG.get(self.name,"logarchive"):
+         self.logarchiv= cls_logarchiv(ALCCONFIG.get(self.name,"logcompress"),ALCCONFIG.get(self.name,"logkeep"),ALCCONFIG.get(self.name,"logmaxage"))
+      port= ALCCONFIG.get(self.name,"metricsport")
+      datei= ALCCONFIG.get(self.name,"metricsfile")
+      if port or datei != "":
+         self.metriken= cls_metriken()
+         self.metrikexport= cls_metrikexport(self.metriken,port,ALCCONFIG.get(self.name,"metricsaddress"),datei)
+         if self.metrikexport.meldung != "":
+            self.meldung(self.metrikexport.meldung)
+      self.status= STAT_ENABLED
+      self.verbinden()
+      return True
+#
+#  Geräte ohne Verbindung verbinden
+#
+   def verbinden(self):
+      for d in self.devices:
+         if d.status != STAT_DISABLED:
+            continue
+         try:
+            d.enable()
+         except Rs232Error as e:
+            self.meldung(d.name+": "+e.value)
+            continue
+         if d.meldung != "":
+            self.meldung(d.name+": "+d.meldung)
+
+   def disable(self):
+      if self.status== STAT_DISABLED:
+         return
+      for d in self.devices:
+         d.disable()
+      if self.sessiondb is not None:
+         self.sessiondb.close()
+         self.sessiondb= None
+      if self.logarchiv is not None:
+         self.logarchiv.beenden()
+         self.logarchiv= None
+      if self.metrikexport is not None:
+         self.metrikexport.beenden()
+         self.metrikexport= None
+      self.metriken= None
+      self.status= STAT_DISABLED
+#
+#  Hauptschleife bis beenden aufgerufen wird, gibt den Exit Code zurück.
+#  Abstürze werden sofort aufgeräumt, die Geräte beim nächsten Termin neu
+#  verbunden
+#
+   def run(self):
+      if not self.enable():
+         return 1
+      try:
+         termin= time.monotonic()+ self.reconnect
+         while True:
+            self.wecker.wait(max(0.0,termin- time.monotonic()))
+            self.wecker.clear()
+            self.aufraeumen()
+            if self.ende.is_set():
+               break
+            if time.monotonic() >= termin:
+               self.verbinden()
+               termin= time.monotonic()+ self.reconnect
+      finally:
+         self.disable()
+      return 0
+
+   def beenden(self,signum=None,frame=None):
+      self.ende.set()
+      self.wecker.set()
+
+#
+# Hauptprogramm ---------------------------------------------------------------
+#
+def main():
+   parser=argparse.ArgumentParser(description='pyalc7t daemon: poll and log ALC 7000 chargers without GUI')
+   parser.add_argument('--instance', '-instance', default="", help="use the configuration of pyalc7t instance INSTANCE")
+   parser.add_argument('--reconnect', type=float, default=RECONNECT_INTERVALL, help="seconds between reconnect attempts")
+   args=parser.parse_args()
+   try:
+      daemon= cls_daemon(args.instance,args.reconnect)
+   except AlcConfigError as e:
+      print(e.msg+': '+str(e.add_msg),file=sys.stderr)
+      sys.exit(1)
+   signal.signal(signal.SIGTERM, daemon.beenden)
+   signal.signal(signal.SIGINT, daemon.beenden)
+   sys.exit(daemon.run())
+
+if __name__ == "__main__":
+   main()
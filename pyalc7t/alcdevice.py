@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# GUI Geräteklasse: ein ALC 7000 mit Menüs und Anzeigebereich im Hauptfenster
+# ---------------------------------------------------------------------------
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version, aus pyalc7tmain.py ausgelagert
+# - Zugriff auf die Sitzungsdatenbank und das Logarchiv
+# - Verbindung, Thread und Geräteliste nach alcdevicekern.py ausgelagert,
+#   cls_device ergänzt Menüs, Anzeige und queued signals
+#
+from .alccore import *
+if QTBINDINGS=="PySide6":
+   from PySide6 import QtCore, QtWidgets
+if QTBINDINGS=="PyQt5":
+   from PyQt5 import QtCore, QtWidgets
+
+from .alcdevicekern import cls_devicekern, cls_deviceregistry
+from .alckanal import cls_kanal
+
+#
+# Ein ALC 7000 -----------------------------------------------------------------
+#
+class cls_device(cls_devicekern, QtCore.QObject):
+
+   if QTBINDINGS=="PySide6":
+      sig_show_message=QtCore.Signal(str)
+      sig_crash=QtCore.Signal()
+   if QTBINDINGS=="PyQt5":
+      sig_show_message=QtCore.pyqtSignal(str)
+      sig_crash=QtCore.pyqtSignal()
+
+   kanalklasse= cls_kanal
+
+   def __init__(self,alc7t,devnr):
+      QtCore.QObject.__init__(self)
+      self.ui= alc7t.ui
+#
+#     Statusmeldung und Absturz werden vom Thread gemeldet, daher queued
+#
+      self.sig_show_message.connect(self.show_message, QtCore.Qt.QueuedConnection)
+      self.sig_crash.connect(self.do_crash_cleanup, QtCore.Qt.QueuedConnection)
+      cls_devicekern.__init__(self,alc7t,devnr)
+#
+#  Menüs und Anzeigebereich im Hauptfenster, dann Kanäle erzeugen
+#
+   def kanaele_erzeugen(self):
+      self.kmenus, self.hbox= self.ui.add_device(self.devnr,self.name)
+      super().kanaele_erzeugen()
+#
+#  Statusmeldung, wird vom Thread über ein queued signal ausgegeben
+#
+   def emit_message(self,s):
+      self.sig_show_message.emit(s)
+
+   def emit_crash(self):
+      self.sig_crash.emit()
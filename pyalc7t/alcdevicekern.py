@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Geräteklassen ohne Qt: ein ALC 7000 mit Verbindung, I/O Thread und Kanälen
+# sowie die Liste aller angeschlossenen Geräte -----------------------------
+#
+# Das Programm (alc7t) muss sessiondb, logarchiv, metriken und
+# show_refresh_message bereitstellen. Die GUI leitet cls_device davon ab und
+# erzeugt Kanäle mit Anzeige, der Daemon verwendet die Klassen direkt.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version, aus alcdevice.py ausgelagert
+# - Befehle und Messungen in den Metriken des Programms erfassen
+# - Aufzeichnung der seriellen Kommunikation (Konfigurationsparameter
+#   serialtrace)
+#
+import time
+from .alcconst import *
+from .alcrs232 import cls_rs232, Rs232Error
+from .alcconfig import ALCCONFIG
+from .alckanalkern import cls_kanalkern
+from .alcthread import cls_AlcThread
+
+#
+# Ein ALC 7000 -----------------------------------------------------------------
+#
+class cls_devicekern(object):
+#
+#  Klasse der Kanäle
+#
+   kanalklasse= cls_kanalkern
+
+   def __init__(self,alc7t,devnr):
+      self.alc7t= alc7t
+      self.devnr= devnr
+      self.status= STAT_DISABLED
+      self.commobject= None
+      self.commthread= None
+      self.kennung=""
+      self.version=""
+      self.message=""
+      self.meldung=""
+      self.kanaele= { }
+#
+#     Gerät 1 behält die bisherigen Namen der Logdateien
+#
+      if devnr == 0:
+         self.name= "ALC 7000"
+         self.suffix= ""
+      else:
+         self.name= "ALC 7000 (%d)" % (devnr+1)
+         self.suffix= "_g%d" % (devnr+1)
+      self.kanaele_erzeugen()
+#
+#  Kanäle erzeugen
+#
+   def kanaele_erzeugen(self):
+      for k in ( KANAL1, KANAL2, KANAL3, KANAL4 ) :
+         self.kanaele[k]=self.kanalklasse(self,k)
+#
+#  Schnittstelle des Geräts aus der Konfiguration
+#
+   def tty(self):
+      if self.devnr == 0:
+         return ALCCONFIG.get("pyalc7t","tty")
+      devices= ALCCONFIG.get("pyalc7t","devices")
+      if self.devnr > len(devices):
+         return ""
+      return devices[self.devnr-1]
+#
+#  Gerät enablen, Rs232Error wenn das Gerät nicht erreichbar ist. Warnungen
+#  (Trace kann nicht geschrieben werden) stehen danach in meldung
+#
+   def enable(self):
+      if self.status== STAT_ENABLED:
+         return
+#
+#     Verbindung zu ALC7000 aufbauen
+#
+      try:
+         self.commobject=cls_rs232(self.tty())
+         self.commobject.set_metriken(self.metriken(),self.name)
+         if ALCCONFIG.get("pyalc7t","serialtrace"):
+            self.commobject.set_trace("serial%s_%s.trc" % (self.suffix,time.strftime("%Y%m%d-%H%M%S")))
+         self.commobject.open()
+         self.meldung= self.commobject.meldung
+         self.kennung= self.commobject.read_ident()
+         self.version=self.commobject.read_version()
+      except Rs232Error:
+         self.close()
+         raise
+      if not self.kennung == "ALC7000":
+         self.close()
+         raise Rs232Error("Gerät nicht gefunden")
+#
+#     Thread erzeugen und starten
+#
+      self.commthread= cls_AlcThread(self, self.kanaele)
+      self.commthread.start()
+      self.status= STAT_ENABLED
+#
+#  Gerät disablen
+#
+   def disable(self):
+      if self.status== STAT_DISABLED:
+         return
+#
+#     stop thread
+#
+      if self.commthread is not None:
+         if self.commthread.isRunning():
+            self.commthread.finish()
+#
+#     Kanäle disablen
+#
+      for k in self.kanaele:
+         self.kanaele[k].disable()
+      self.close()
+      self.status= STAT_DISABLED
+
+   def close(self):
+      if self.commobject != None:
+         try:
+            self.commobject.close()
+         except:
+            pass
+      self.commobject=None
+#
+#  clean up from crash
+#
+   def do_crash_cleanup(self):
+      self.commthread=None
+      self.disable()
+#
+#  Statusmeldung, wird vom Thread aufgerufen. Ohne GUI wird sie direkt
+#  ausgegeben
+#
+   def emit_message(self,s):
+      self.show_message(s)
+#
+#  Absturz des Threads, wird vom Thread nach dem Ende der Hauptschleife
+#  aufgerufen
+#
+   def emit_crash(self):
+      self.do_crash_cleanup()
+#
+#  Sitzungsdatenbank des Programms, None wenn nicht verwendet
+#
+   def sessiondb(self):
+      return self.alc7t.sessiondb
+#
+#  Archiv der Logdateien, None wenn die alten Logdateien verschoben werden
+#
+   def logarchiv(self):
+      return self.alc7t.logarchiv
+#
+#  Metriken des Programms, None wenn nicht erfasst
+#
+   def metriken(self):
+      return self.alc7t.metriken
+
+   def show_message(self,message):
+      self.message=self.kennung+' '+self.version+': '+message
+      self.alc7t.show_refresh_message()
+
+#
+# Liste der angeschlossenen Geräte -------------------------------------------
+#
+class cls_deviceregistry(object):
+
+   def __init__(self,alc7t,deviceklasse=cls_devicekern):
+      self.devices= [ ]
+      anzahl= 1+ len(ALCCONFIG.get("pyalc7t","devices"))
+      for devnr in range(anzahl):
+         self.devices.append(deviceklasse(alc7t,devnr))
+
+   def __iter__(self):
+      return iter(self.devices)
+
+   def __len__(self):
+      return len(self.devices)
+#
+#  Alle Kanäle aller Geräte
+#
+   def kanaele(self):
+      for d in self.devices:
+         for k in d.kanaele:
+            yield d.kanaele[k]
+#
+#  Statusmeldungen aller Geräte
+#
+   def messages(self):
+      if len(self.devices) == 1:
+         return self.devices[0].message
+      return " | ".join(d.message for d in self.devices if d.message != "")
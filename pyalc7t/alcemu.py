@@ -0,0 +1,396 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ALC 7000 Emulator an einem Pseudo-Terminal (nur Linux/macOS) ---------------
+#
+# Der Emulator öffnet ein pty und beantwortet die Befehle des Protokolls aus
+# alcrs232.py. Er simuliert Lade- und Entladekurven von NiCd/NiMH und
+# Bleiakkus auf vier Kanälen. Antwortverzögerung und Zeitraffer sind
+# einstellbar.
+#
+# Aufruf: python3 -m pyalc7t.alcemu [--speed N] [--latency SEK] [--empty 3,4]
+# Der Gerätename des pty wird ausgegeben und in pyALC7T als serielle
+# Schnittstelle eingetragen.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+#
+import argparse
+import os
+import threading
+import time
+import tty
+
+from .alcconst import *
+from .alcrs232 import encode_byte, STX, ETX, ESC, ACK
+
+EMU_KENNUNG="ALC7000"
+EMU_VERSION="1.05"
+#
+# Akkumodell: Zellenspannung beim Laden, Entladen und in Ruhe
+# x ist der Ladezustand bezogen auf die tatsächliche Kapazität
+#
+def zelle_laden(aktyp,x):
+   if aktyp == AKKU_TYP_BLEI:
+      if x < 0.95:
+         return 2.05+ 0.35*x/0.95
+      return 2.40
+   if x < 0.8:
+      return 1.30+ 0.08*x/0.8
+   if x < 1.0:
+      return 1.38+ 0.10*(x-0.8)/0.2
+#
+#  Überladung: Spannungsrückgang (Delta-Peak)
+#
+   return 1.48- 0.2*(x-1.0)
+
+def zelle_entladen(aktyp,x):
+   if x < 0.0:
+      x= 0.0
+   if aktyp == AKKU_TYP_BLEI:
+      return 1.80+ 0.25* x**0.5
+   return 1.00+ 0.22* x**0.25
+
+def zelle_ruhe(aktyp,x):
+   if aktyp == AKKU_TYP_BLEI:
+      return 1.95+ 0.20*x
+   return 1.20+ 0.10*x
+#
+# Ablauf der Ladeprogramme: L=Laden, E=Entladen
+#
+dict_emu_phasen= { PROG_LADEN: 'L', PROG_ENTLADEN: 'E', PROG_ENTLADEN_LADEN: 'EL', PROG_TEST: 'LEL', PROG_ZYKLISCH: 'ELEL', PROG_REFRESH: 'ELEL' }
+
+#
+# Simulierter Kanal ------------------------------------------------------------
+#
+class cls_emukanal(object):
+
+   def __init__(self,kanalnr,akku=True,ladezustand=0.3):
+      self.kanalnummer= kanalnr
+      self.Progr= PROG_LADEN
+      self.AnzZellen= 4
+      self.AKTyp= AKKU_TYP_NICD_NIMH
+      self.ILad= 500           # mA
+      self.IEntl= 500          # mA
+      self.CNenn= 100          # 10 mAh
+      self.KanStatus= KSTAT_INAKTIV
+      self.IRichtg= STRR_UNDEF
+      self.akku= akku
+      self.AkStatus= AKSTAT_AKKU_ANG if akku else AKSTAT_KEIN_AKKU
+#
+#     Akku: Kapazität und Ladung in Ah
+#
+      self.kapazitaet= 0.9
+      self.ladung= self.kapazitaet* ladezustand
+#
+#     Ablauf
+#
+      self.phasen=""
+      self.phase=0
+      self.spitze=0.0
+      self.U=0.0               # V
+      self.I=0.0               # A
+      self.C=0.0               # Ah der laufenden Phase
+      self.update_ruhe()
+
+   def update_ruhe(self):
+      self.I=0.0
+      if self.akku:
+         self.U= zelle_ruhe(self.AKTyp,self.ladung/self.kapazitaet)* self.AnzZellen
+      else:
+         self.U=0.0
+#
+#  Programm starten/beenden
+#
+   def aktivieren(self,aktion):
+      if aktion and self.akku:
+         self.kapazitaet= max(self.CNenn/100*0.9,0.05)
+         if self.ladung > self.kapazitaet:
+            self.ladung= self.kapazitaet
+         self.KanStatus= KSTAT_AKTIV
+         self.AkStatus= AKSTAT_AKKU_ANG
+         self.phasen= dict_emu_phasen[self.Progr]
+         self.phase=0
+         self.start_phase()
+      else:
+         self.KanStatus= KSTAT_INAKTIV
+         self.IRichtg= STRR_UNDEF
+         if self.akku:
+            self.AkStatus= AKSTAT_AKKU_ANG
+         self.update_ruhe()
+
+   def start_phase(self):
+      self.C=0.0
+      self.spitze=0.0
+      if self.phasen[self.phase]== 'L':
+         self.IRichtg= STRR_LADEN
+      else:
+         self.IRichtg= STRR_ENTLADEN
+
+   def ende_phase(self):
+      self.phase+=1
+      if self.phase < len(self.phasen):
+         self.start_phase()
+         return
+      if self.phasen[-1]== 'L':
+         self.AkStatus= AKSTAT_AKKU_VOLL
+      else:
+         self.AkStatus= AKSTAT_AKKU_LEER
+      self.I=0.0
+#
+#  Simulation um dt Sekunden fortschreiben
+#
+   def step(self,dt):
+      if self.KanStatus != KSTAT_AKTIV:
+         self.update_ruhe()
+         return
+      if self.AkStatus != AKSTAT_AKKU_ANG:
+         self.I=0.0
+         return
+      x= self.ladung/self.kapazitaet
+      if self.IRichtg== STRR_LADEN:
+         self.I= self.ILad/1000
+#
+#        Blei: Konstantspannungsphase mit abnehmendem Strom
+#
+         if self.AKTyp== AKKU_TYP_BLEI and x >= 0.95:
+            self.I= self.I* max(0.0,(1.0-x)/0.05)
+         dq= self.I* dt/3600
+         self.C+= dq
+         self.ladung= min(self.ladung+ dq*0.95, self.kapazitaet*1.2)
+         x= self.ladung/self.kapazitaet
+         self.U= zelle_laden(self.AKTyp,x)* self.AnzZellen
+         if self.U > self.spitze:
+            self.spitze= self.U
+         if self.AKTyp== AKKU_TYP_BLEI:
+            if self.I < self.ILad/1000*0.05:
+               self.ende_phase()
+         elif self.spitze- self.U >= 0.005* self.AnzZellen or x >= 1.2:
+            self.ende_phase()
+      else:
+         self.I= self.IEntl/1000
+         dq= self.I* dt/3600
+         self.C+= dq
+         self.ladung-= dq
+         self.U= zelle_entladen(self.AKTyp,self.ladung/self.kapazitaet)* self.AnzZellen
+         if self.ladung <= 0.0:
+            self.ladung= 0.0
+            self.ende_phase()
+#
+#  Messwerte für Befehl 'w': Spannung mV, Strom mA, Kapazität 10 mAh
+#
+   def messwerte(self):
+      return (int(round(self.U*1000)), int(round(self.I*1000)), int(round(self.C*100)))
+
+#
+# Emulator ---------------------------------------------------------------------
+#
+class cls_alc7000emu(object):
+
+   def __init__(self,speed=1.0,latency=0.0,leer=()):
+      self.speed= speed
+      self.latency= latency
+      self.kanaele= { }
+      for k in (KANAL1, KANAL2, KANAL3, KANAL4):
+         self.kanaele[k]= cls_emukanal(k, not k in leer)
+      self.__master__= None
+      self.__slave__= None
+      self.__thread__= None
+      self.__running__= False
+      self.__lock__= threading.Lock()
+      self.__zeit__= time.monotonic()
+      self.device=""
+      self.anz_befehle=0
+#
+#  pty öffnen und Emulator starten
+#
+   def start(self):
+      self.__master__, self.__slave__= os.openpty()
+      tty.setraw(self.__slave__)
+      self.device= os.ttyname(self.__slave__)
+      self.__zeit__= time.monotonic()
+      self.__running__= True
+      self.__thread__= threading.Thread(target=self.run,name="alc7000emu",daemon=True)
+      self.__thread__.start()
+      return self.device
+
+   def stop(self):
+      self.__running__= False
+      if self.__thread__ is not None:
+         self.__thread__.join(1.0)
+         self.__thread__= None
+      for fd in (self.__master__, self.__slave__):
+         if fd is not None:
+            try:
+               os.close(fd)
+            except OSError:
+               pass
+      self.__master__= None
+      self.__slave__= None
+#
+#  Simulation bis zur aktuellen (beschleunigten) Zeit fortschreiben
+#
+   def advance(self):
+      jetzt= time.monotonic()
+      dt= (jetzt- self.__zeit__)* self.speed
+      self.__zeit__= jetzt
+#
+#     in Schritten von höchstens 10 simulierten Sekunden rechnen
+#
+      while dt > 0:
+         d= min(dt,10.0)
+         for k in self.kanaele:
+            self.kanaele[k].step(d)
+         dt-= d
+#
+#  Empfangsschleife: Frames dekodieren und beantworten
+#
+   def run(self):
+      import select
+      frame= None
+      escape= False
+      while self.__running__:
+         r,w,x= select.select([self.__master__],[],[],0.1)
+         if not r:
+            continue
+         try:
+            data= os.read(self.__master__,256)
+         except OSError:
+            break
+         for c in data:
+            if c == STX:
+               frame= bytearray()
+               escape= False
+               continue
+            if frame is None:
+               continue
+            if escape:
+               frame.append(c-0x10)
+               escape= False
+            elif c == ESC:
+               escape= True
+            elif c == ETX:
+               self.reply(frame)
+               frame= None
+            else:
+               frame.append(c)
+
+   def send(self,b):
+      if self.latency > 0:
+         time.sleep(self.latency)
+      os.write(self.__master__,bytes(b))
+
+   def send_value(self,v,length):
+      b=bytearray()
+      b.append(STX)
+      if length == 1:
+         b+= encode_byte(v & 0xFF)
+      else:
+         for w in v:
+            b+= encode_byte((w >> 8) & 0xFF)
+            b+= encode_byte(w & 0xFF)
+      b.append(ETX)
+      self.send(b)
+#
+#  Befehl ausführen
+#
+   def reply(self,frame):
+      if len(frame) == 0:
+         return
+      self.anz_befehle+=1
+      befehl= chr(frame[0])
+      if befehl == 'v' or befehl== 'V':
+         s= EMU_KENNUNG if befehl== 'v' else EMU_VERSION
+         self.send(bytes([STX])+ s.encode('ascii')+ bytes([ETX]))
+         return
+      if len(frame) < 4 or frame[1] > 3:
+         return
+      with self.__lock__:
+         self.advance()
+         k= self.kanaele[frame[1]+1]
+         param1= frame[2]
+         param2= frame[2]*256+ frame[3]
+         if befehl == 'f':
+            self.send_value(k.Progr,1)
+         elif befehl == 'u':
+            self.send_value(k.AnzZellen,1)
+         elif befehl == 'i':
+            self.send_value([k.ILad],2)
+         elif befehl == 'e':
+            self.send_value([k.IEntl],2)
+         elif befehl == 'k':
+            self.send_value([k.CNenn],2)
+         elif befehl == 't':
+            self.send_value(k.AKTyp,1)
+         elif befehl == 'w':
+            self.send_value(k.messwerte(),6)
+         elif befehl == 'a':
+            self.send_value(k.KanStatus,1)
+         elif befehl == 's':
+            self.send_value(k.AkStatus,1)
+         elif befehl == 'h':
+            self.send_value(k.IRichtg,1)
+         else:
+            if befehl == 'F':
+               k.Progr= param1
+            elif befehl == 'U':
+               k.AnzZellen= param1
+            elif befehl == 'T':
+               k.AKTyp= param1
+            elif befehl == 'A':
+               k.aktivieren(param1)
+            elif befehl == 'I':
+               k.ILad= param2
+            elif befehl == 'E':
+               k.IEntl= param2
+            elif befehl == 'K':
+               k.CNenn= param2
+            else:
+               return
+            if k.KanStatus != KSTAT_AKTIV:
+               k.update_ruhe()
+            self.send(bytes([ACK]))
+
+#
+# Hauptprogramm ---------------------------------------------------------------
+#
+def main():
+   parser=argparse.ArgumentParser(description='ALC 7000 emulator on a pseudo terminal')
+   parser.add_argument('--speed', type=float, default=1.0, help="time lapse factor of the simulation")
+   parser.add_argument('--latency', type=float, default=0.0, help="reply latency in seconds")
+   parser.add_argument('--empty', default="", help="comma separated list of channels without battery")
+   args=parser.parse_args()
+   leer= [int(k) for k in args.empty.split(",") if k.strip() != ""]
+   emu= cls_alc7000emu(args.speed,args.latency,leer)
+   print(emu.start(),flush=True)
+   try:
+      while True:
+         time.sleep(1)
+   except KeyboardInterrupt:
+      pass
+   emu.stop()
+
+if __name__ == "__main__":
+   main()
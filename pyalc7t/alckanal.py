@@ -45,43 +45,83 @@
 # - PySide6 Migration
 # 05.02.2024 jsi
 # - removed deprecation warnings
+# 18.10.2026 agent
+# - Kanalabfrage mit poll_Kanal in einem Durchgang
+# - Kanäle gehören zu einem Gerät (cls_device), Gerätesuffix im Namen der
+#   Logdatei
+# - Befehle werden als Auftrag an den I/O Thread übergeben, Anzeige wird
+#   über ein queued signal im GUI Thread aktualisiert
+# - Zeitplan der Messungen bestimmt der I/O Thread
+# - Abfrageklasse für die adaptive Kanalabfrage (pollklasse)
+# - Laufzeit und Kapazitätsberechnung mit dem monotonen Zeitstempel der
+#   Messung, Wanduhrzeit nur noch für den Dateikopf. Optional Laufzeit mit
+#   Sekundenbruchteilen in der Logdatei (Konfigurationsparameter subseconds)
+# - Messwertspeicher als cls_messwertspeicher statt Liste von Strings
+# - Logdatei wird über cls_logwriter gepuffert geschrieben
+#   (Konfigurationsparameter logflushinterval, logflushsize, logsync)
+# - optional binäre Logdatei .amb (Konfigurationsparameter logformat)
+# - Aufzeichnungen werden in der Sitzungsdatenbank eingetragen, beim Disable
+#   wird die Logdatei vor dem Zurücksetzen der Messwerte geschlossen
+# - Logdateien mit Zeitstempel und Archivierung über cls_logarchiv statt
+#   Verschieben von 0_ ... 3_ (Konfigurationsparameter logarchive)
+# - Zustand der Aufzeichnung wird regelmäßig gesichert, nach Absturz oder
+#   Reconnect wird die Aufzeichnung in der gleichen Logdatei fortgesetzt
+#   (Konfigurationsparameter checkpointinterval)
+# - Messwertverarbeitung und Aufzeichnung nach cls_kanalkern (alckanalkern.py)
+#   ausgelagert, cls_kanal enthält nur noch Menü, Anzeige und Befehle
+# - KanalError (keine Verbindung) bei Befehlen aus dem Menü abfangen
+# - Messwerte einer fortgesetzten Aufzeichnung für das Messwertfenster im
+#   I/O Thread nachladen (messwerte_anfordern)
+# - Messwertfenster (alcplot.py) wird erst beim ersten Öffnen importiert
 #
 
-import datetime
-import os
-import time
 from .alccore import *
 if QTBINDINGS=="PySide6":
    from PySide6 import QtCore, QtWidgets
 if QTBINDINGS=="PyQt5":
    from PyQt5 import QtCore,  QtWidgets
 
+from .alckanalkern import cls_kanalkern
 from .alcwidgets import cls_KanalWidget, cls_KanalConfigWindow, cls_AlcMessageBox
-from .alcconfig import ALCCONFIG
-from .alcplot import cls_PlotDialog
 from .alcrs232 import Rs232Error
 
+#
+# Meldungstext eines KanalError, add_msg ist bei fehlender Verbindung leer
+#
+def kanalfehler(e):
+   if e.add_msg:
+      return e.msg+": "+str(e.add_msg)
+   return e.msg
+
 #
 # Objektklasse für die Kanäle -----------------------------------------------------
 #
-class cls_kanal(QtCore.QObject):
+class cls_kanal(cls_kanalkern, QtCore.QObject):
 
    if QTBINDINGS=="PySide6":
       sig_refresh= QtCore.Signal()
+      sig_anzeige= QtCore.Signal()
+      sig_befehl= QtCore.Signal(object)
    if QTBINDINGS=="PyQt5":
       sig_refresh= QtCore.pyqtSignal()
+      sig_anzeige= QtCore.pyqtSignal()
+      sig_befehl= QtCore.pyqtSignal(object)
 
    def __init__(self, alc7t, kanalnr):
-      super().__init__()
-      self.kanalnummer = kanalnr
+      QtCore.QObject.__init__(self)
+      cls_kanalkern.__init__(self, alc7t, kanalnr)
       self.ui= alc7t.ui
-      self.alc7t= alc7t
-      self.delay=0
       self.rs232=None
 #
+#     Anzeige und Befehlsergebnisse kommen aus dem I/O Thread
+#
+      self.sig_anzeige.connect(self.do_anzeige, QtCore.Qt.QueuedConnection)
+      self.anzeige_aktiv= False
+      self.sig_befehl.connect(self.do_befehl_fertig, QtCore.Qt.QueuedConnection)
+#
 #     Menü erzeugen
 #
-      self.kmenu= self.ui.kmenus[self.kanalnummer]
+      self.kmenu= self.alc7t.kmenus[self.kanalnummer]
       self.actionConfig= self.kmenu.addAction("Konfigurieren")
       self.actionConfig.triggered.connect(self.do_config_kanal)
 
@@ -122,42 +162,10 @@ class cls_kanal(QtCore.QObject):
 #
 #     Kanalwidget erzeugen
 #
-      self.ui.hbox.addSpacing(50)
+      self.alc7t.hbox.addSpacing(50)
       self.kwidget= cls_KanalWidget(self.kanalnummer)
-      self.ui.hbox.addWidget(self.kwidget)
+      self.alc7t.hbox.addWidget(self.kwidget)
       self.kwidget.reset()
-
-#
-#     Kanalkonfiguration
-#
-      self.Progr= PROG_UNKNOWN
-      self.AnzZellen=0
-      self.UNenn=0.0
-      self.ILad=0.0
-      self.IEntl=0.0
-      self.CNenn=0.0
-      self.AKTyp= AKKU_TYP_NICD_NIMH
-      self.Beschreibung=""
-#
-#     Status
-#
-      self.status= STAT_DISABLED
-      self.KanStatus= KSTAT_UNKNOWN
-      self.AkStatus= AKSTAT_KEIN_AKKU
-#
-#     Log Datei
-#    
-      self.logfile= None
-      self.logfilename="0_kanal%d.amw" % kanalnr
-#
-#     Messwertspeicher
-#
-      self.messwerte = []
-      self.anz_messwerte=0
-#
-#     Variablen initialisieren
-#
-      self.reset_vars()
 #
 #     Menü initialisieren
 #
@@ -166,6 +174,7 @@ class cls_kanal(QtCore.QObject):
 #     Messwertanzeige
 # 
       self.PlotDialog= None 
+      self.laden_angefordert= False
 #
 #     Kanalmenü konfigurieren
 #
@@ -229,106 +238,11 @@ class cls_kanal(QtCore.QObject):
          self.actionRefresh.setEnabled(True)
          self.actionZyklisch.setEnabled(True)
 #
-#  Kanal enablen, Konfiguration lesen, wird vom thread aufgerufen
+#  Kanal disablen und Anzeige zurücksetzen
 #
-   def enable(self):
-      self.reset_vars()
-      self.delay= ALCCONFIG.get("pyalc7t","delay")
-      self.ui.emit_message("Lese Konfiguration für Kanal "+str(self.kanalnummer))
-      self.readconfig() # throws KanalError
-      self.status= STAT_ENABLED
-      self.config_menu()
-      self.show_conf()
-
    def disable(self):
-      self.reset_vars()
+      super().disable()
       self.kwidget.reset()
-      try:
-         self.close_log()
-      except:
-         pass
-      self.status= STAT_DISABLED
-      
-#
-#
-#  Reset des Kanals, z.B. bei Neustart ---
-#
-   def reset_vars(self):
-#
-#     Messwerte vom ALC 7000
-#
-      self.UMess=0.0
-      self.IMess=0.0
-      self.CMess=0.0
-      self.CMessAlt=0.0
-#
-#     errechnete Messwerte
-#
-      self.UMin= UMIN_INIT
-      self.UMax=0.0
-      self.DPMax=0.0
-      self.DP=0.0
-      self.CLad=0.0
-      self.CEntl=0.0
-      self.CEntlAlt=0.0
-#
-#     Status
-#
-      self.IRichtg= STRR_UNDEF
-      self.IRichtgAlt = STRR_UNDEF
-#
-#     Ablaufkontrolle
-#
-      self.IStart=0.009
-      self.Aufz= False
-      self.CFlag = False
-      self.CGrFlag= False
-      self.IGrFlag= False
-#
-#     Zeitmessung
-#
-      self.DeltaTime= None
-      self.DeltaTimeAlt= None
-      self.TStart= None
-      self.TAlt= None
-#
-#     Messwertspeicher
-#
-      self.messwerte = []
-      self.anz_messwerte=0
-#
-#
-#  Kanalkonfiguration auslesen ---
-#
-   def readconfig(self):
-#
-#     Kanalkonfiguration abfragen
-#
-      kanalnr= self.kanalnummer
-      try:
-         self.Progr= self.alc7t.commobject.read_Progr(kanalnr)
-         self.AnzZellen= self.alc7t.commobject.read_AnzZellen(kanalnr)
-         self.ILad= self.alc7t.commobject.read_ILad(kanalnr)
-         self.IEntl= self.alc7t.commobject.read_IEntl(kanalnr)
-         self.CNenn= self.alc7t.commobject.read_CNenn(kanalnr)
-         self.AKTyp= self.alc7t.commobject.read_AKTyp(kanalnr)
-      except Rs232Error as e:
-         raise KanalError('Kann Kanalkonfiguration nicht abfragen', e.value)
-
-      self.UNenn= dict_akku_spannung[self.AKTyp]* self.AnzZellen
-      self.CLadGr= self.CNenn* CGRENZ
-      self.ILadGr= self.ILad* IGRENZ
-      self.IEntlGr= self.IEntl* IGRENZ
-
-#
-#     Neuberechnung des Schwellenwertes, ab dem Aufzeichnung beginnt
-#
-      self.IStart= self.IEntl
-      if self.ILad < self.IEntl:
-         self.IStart= self.ILad
-      self.IStart= self.IStart / 10.0
-      if self.IStart == 0:
-         self.IStart= 0.009
 #
 #  Konfiguration anzeigen
 #  
@@ -376,333 +290,104 @@ class cls_kanal(QtCore.QObject):
 
       self.kwidget.display_mess(kanalstatus,akkustatus,aufzdauer,akt_spannung,maximalspannung,minimalspannung,delta_peak,akt_strom,stromrichtung,letzte_gel_kapazitaet,letzte_entl_kapazitaet,messwertdatei)
 #
-#  Messung pro Kanal ausführen und Verarbeiten ---
-#
-   def messung(self):
-      kanalnr=self.kanalnummer
-      time.sleep(self.delay)
-      self.ui.emit_message("Lese Messwerte für Kanal "+str(self.kanalnummer))
-      try:    
-#
-#        Kanal- und Akkustatus lesen
-#
-         oldstatus=self.KanStatus
-         self.KanStatus= self.alc7t.commobject.read_KanStatus(kanalnr)
-         if oldstatus != self.KanStatus:
-            self.config_menu()
-         self.AkStatus = self.alc7t.commobject.read_AkStatus(kanalnr)
-#
-#        Stromrichtung lesen
-#
-         self.IRichtgAlt = self.IRichtg
-         self.IRichtg= self.alc7t.commobject.read_IRichtg(kanalnr)
-         if self.IRichtgAlt == STRR_UNDEF:
-            self.IRichtgAlt= self.IRichtg
-#
-#        Messwerte lesen
-#
-         m= self.alc7t.commobject.read_Mess(kanalnr)
-         self.UMess= m[0] / 1000
-         self.IMess= m[1] / 1000
-         self.CMess= m[2] / 100
-      except Rs232Error as e:
-         raise KanalError('Kann Messwerte nicht lesen', e.value)
-#
-#     Min Max Spannung
-#
-      if self.UMess > 0.0 :
-         if self.UMess < self.UMin:
-            self.UMin= self.UMess
-      if self.UMess > self.UMax:
-         self.UMax = self.UMess
-      if self.UMess > self.DPMax:
-         self.DPMax= self.UMess
-#
-#     Aufzeichnung beginnen wenn Akku geladen wird und Strom fliesst
-#
-      if not self.Aufz and self.AkStatus== AKSTAT_AKKU_ANG and self.KanStatus== KSTAT_AKTIV and self.IMess > self.IStart:
-         self.IMess= self.IStart
-         self.TStart= datetime.datetime.now()
-         self.TAlt= None
-         self.DeltaTimeAlt= datetime.timedelta(hours=0)
-         self.Aufz= True
-#
-#        Dateikopf schreiben 
+#  Menü, Konfiguration und Messwerte anzeigen, wird vom I/O Thread über
+#  sig_anzeige ausgelöst. Solange die Anzeige noch aussteht, wird kein
+#  weiteres Signal gesendet, damit die Event-Loop nicht überläuft
 #
-         try:
-            self.open_log()
-         except EnvironmentError as e:
-            raise KanalError('Kann Logdatei nicht öffnen',e.strerror)
+   def anzeige(self):
+      if not self.anzeige_aktiv:
+         self.anzeige_aktiv= True
+         self.sig_anzeige.emit()
 
-      if not self.Aufz:
-         self.show_mess()
-         return
-#
-#     Wenn Akku geladen wird, dann Delta-Peak berechnen
-#
-      if self.AkStatus == AKSTAT_AKKU_ANG and  self.IRichtg == STRR_LADEN and self.UMess <= self.DPMax:
-         self.DP= self.DPMax - self.UMess
-
-#
-#     Laufzeit berechnen
-#
-      if self.KanStatus== KSTAT_AKTIV:
-         self.DeltaTime= datetime.datetime.now() - self.TStart
+   def do_anzeige(self):
+      self.anzeige_aktiv= False
+      self.config_menu()
+      self.show_conf()
+      self.show_mess()
 #
-#     eingeladene bzw. entladene Kapazität berechnen
+#  Messwertfenster aktualisieren
 #
-      Intervall= self.DeltaTime.total_seconds() - self.DeltaTimeAlt.total_seconds()
-      if self.IRichtg== STRR_ENTLADEN:
-         self.CEntl= self.CEntl+ self.IMess* Intervall/3600 * 0.975
-      if self.IRichtg== STRR_LADEN:
-         self.CLad= self.CLad + self.IMess * Intervall/3600 * 0.975
-      self.DeltaTimeAlt= self.DeltaTime
+   def refresh(self):
+      self.sig_refresh.emit()
 #
-#     wenn Entladekapazität vom ALC7000 gelöscht wird (bei Überhitzung), dann soll die
-#     berechnete Kapazität verwendet werden
+#  Befehl an den I/O Thread übergeben. job wird vor der nächsten Messung im
+#  I/O Thread ausgeführt, danach wird fertig(future) im GUI Thread aufgerufen
 #
-      if self.IRichtg == STRR_ENTLADEN:
-         if self.CMess < self.CMessAlt:
-            self.CFlag= True
-         self.CMessAlt= self.CMess
-
-      if self.CFlag:
-         self.CMess= self.CEntl
-#
-#     Lade- oder Entladestrom zu hoch (mehr als IGRENZ%)
-#
-      if self.Progr != PROG_REFRESH:
-          Laufzeit= int(self.DeltaTime.total_seconds())
-          if ((self.IRichtg== STRR_LADEN and (self.IMess > self.ILadGr)) or (self.IRichtg==STRR_ENTLADEN and (self.IMess > self.IEntlGr))) and Laufzeit > TCHECKDELAY:
-            if (self.IRichtg== STRR_LADEN):
-               self.write_log_msg("Ladestrom überschritten %1.3f A (Grenzwert %1.3f A)" % (self.IMess, self.ILadGr) )
-            else:
-               self.write_log_msg("Entladestrom überschritten %1.3f A (Grenzwert %1.3f A)" % (self.IMess, self.IEntldGr) )
-            try:
-               self.alc7t.commobject.write_KanAktivieren(kanalnr,KSTAT_INAKTIV)
-               self.KanStatus= self.alc7t.commobject.read_KanStatus(kanalnr)
-
-            except Rs232Error as e:
-               raise KanalError('Kann Kanal nicht deaktivieren',e.value)
-
-            self.IGrFlag= True
-            self.AkStatus= AKSTAT_AKKU_VOLL
-
+   def befehl(self,job,fertig):
+      if self.alc7t.commthread is None:
+         return
+      g=QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+      future= self.alc7t.commthread.submit(job,kanal=self.kanalnummer)
+      future.add_done_callback(lambda f: self.sig_befehl.emit((f,fertig)))
+   def do_befehl_fertig(self,arg):
+      future, fertig= arg
+      g=QtWidgets.QApplication.restoreOverrideCursor()
+      if not future.cancelled():
+         fertig(future)
 #
-#     Kapazitätsgrenze überschritten?
+#  Neue Konfiguration für Kanal einstellen ---
 #
-      if self.IRichtg== STRR_LADEN and self.Progr != PROG_REFRESH and self.CLad > self.CLadGr:
-         self.write_log_msg("Kapazitätsgrenze überschritten %6.3f Ah (Grenzwert %5.3f Ah)" % (self.CLad, self.CLadGr) )
+   def kanal_programmieren(self, config):
+      def job():
+         self.reset_vars()
+         self.Progr= PROG_LADEN
+         self.KanStatus=KSTAT_INAKTIV
          try:
-            self.alc7t.commobject.write_KanAktivieren(kanalnr,KSTAT_INAKTIV)
-            self.KanStatus= self.alc7t.commobject.read_KanStatus(kanalnr)
-
+            self.alc7t.commobject.write_AKTyp(self.kanalnummer,config['AKTyp'])
+            self.alc7t.commobject.write_AnzZellen(self.kanalnummer,config['AnzZellen'])
+            self.alc7t.commobject.write_CNenn(self.kanalnummer,config['CNenn'])
+            self.alc7t.commobject.write_ILad(self.kanalnummer,config['ILad'])
+            self.alc7t.commobject.write_IEntl(self.kanalnummer,config['IEntl'])
+            self.alc7t.commobject.write_Progr(self.kanalnummer,PROG_LADEN)
+            while True:
+               p= self.alc7t.commobject.read_Progr(self.kanalnummer)
+               if p == PROG_LADEN:
+                  break
+            self.readconfig() # throws KanalError
          except Rs232Error as e:
-            raise KanalError('Kann Kanal nicht deaktivieren',e.value)
-
-         self.CGrFlag= True
-         self.AkStatus= AKSTAT_AKKU_VOLL
-#
-#        Änderung der Stromrichtung
-#
-      if self.IRichtg != self.IRichtgAlt:
-         if self.IRichtgAlt== STRR_LADEN:
-            self.CEntl= 0
-            self.CEntlAlt=0
-            self.CFlag= False
-#
-#           Ausgabe in Datei 
-#
-            try:
-               self.write_log_msg("Umgeschaltet auf Entladen - geladene Kapazität %6.3f Ah - Delta-Peak %5.3f V" % (self.CLad, self.DP) )
-            except EnvironmentError as e:
-               raise KanalError('Kann nicht auf Logdatei schreiben',e.strerror)
+            raise KanalError("Kann neue Kanaleinstellung nicht vornehmen",e.value)
 
-         if self.IRichtgAlt== STRR_ENTLADEN:
-            self.CLad=0
-            self.DP=0
-            self.DPMax=0
-#
-#           Ausgabe in Datei 
-#
-            try:
-               self.write_log_msg("Umgeschaltet auf Laden - entladene Kapazität %6.3f Ah" % self.CMess)
-            except EnvironmentError as e:
-               raise KanalError('Kann nicht auf Logdatei schreiben',e.strerror)
-
-      if self.IRichtg == self.IRichtgAlt and self.AkStatus == AKSTAT_AKKU_ANG:
-#
-#        Ausgabe in Datei
-#
+      def fertig(future):
          try:
-            self.write_log_mess()
-         except EnvironmentError as e:
-            raise KanalError('Kann nicht auf Logdatei schreiben',e.strerror)
+            future.result()
+         except KanalError as e:
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kanalkonfiguration kann nicht eingestellt werden. "+e.msg,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+         self.show_conf()
+         self.config_menu()
 
-      self.show_mess()
-      self.sig_refresh.emit()
-#
-#        Messprogrammende, Dateien schliessen
-#
-      if self.AkStatus > AKSTAT_AKKU_ANG or self.KanStatus == KSTAT_INAKTIV:
-         try:
-            self.close_log()
-         except EnvironmentError as e:
-            raise KanalError('Kann Logdatei nicht abschließen',e.strerror)
-
-         self.Aufz= False        
-#
-#  Alte Logdateien sichern, neue Datei öffnen und Header schreiben ---
-#  Fehlerbehandlung in Methode messung
-#
-   def open_log(self):
-      kanalnr= self.kanalnummer
-      if os.path.isfile(self.logfilename):
-         j=3
-         while True:
-            name_old= "%d_kanal%d.amw" % (j, kanalnr)
-            name_new= "%d_kanal%d.amw" % (j-1,kanalnr)
-            if os.path.isfile(name_old):
-               os.remove(name_old)
-            if os.path.isfile(name_new):
-               os.rename(name_new, name_old)
-            j=j-1
-            if j == 0 :
-               break
-      self.logfile=open(self.logfilename,"w")
-      l= self.logfile
-      dt=datetime.datetime.now()
-      time=dt.strftime("%H:%M:%S")
-      date=dt.strftime("%d-%m-%Y")
-      try:
-         l.write("# Messdatendatei des Programms pyalc7t angelegt "+date+" "+time+"\n")
-         l.write("#\n")
-         l.write("# Konfiguration des Kanals\n")
-         l.write("#\n")
-         l.write("# Einstellungen beim Start der Aufzeichnung:\n")
-         l.write("# Kanal:         %6d         Programm:     %s\n" % (kanalnr, dict_programme[self.Progr]))
-         l.write("# Zellenzahl:    %6d         Akkutyp:      %s\n" % (self.AnzZellen, dict_akku_typ[self.AKTyp]))
-         l.write("# Nennspannung:  %6.2f V     Ladestrom:    %5.3f A\n" % (self.UNenn, self.ILad))
-         l.write("# Nennkapazität: %6.3f Ah    Entladestrom: %5.3f A\n" % (self.CNenn, self.IEntl))
-         l.write("#\n")
-         l.write("# Messwerte\n")
-         l.write("# Zeit [Sek] Spannung [V] Strom [A]\n")
-      except EnvironmentError:
-         l.close()
-         raise
-        
-#
-#  Messwerte in Logdatei schreiben und in Messwertspeicher für Messw.fenster ---
-#  Fehlerbehandlung in Methode messung
-#    
-   def write_log_mess(self): 
-      l=self.logfile
-      Laufzeit= int(self.DeltaTime.total_seconds())
-      try:
-         l.write("  %06d        %2.3f      %1.3f\n" % ( Laufzeit, self.UMess, self.IMess ))
-         l.flush()
-      except EnvironmentError:
-         l.close()
-         raise
-      self.messwerte.append(["%06d" % Laufzeit, "%6.3f" % self.UMess, "%5.3f" % self.IMess])
-      self.anz_messwerte+=1
-
-   def write_log_msg(self,msg):
-      l=self.logfile
-      Laufzeit= int(self.DeltaTime.total_seconds())
-      try:
-         l.write("# %06d %s\n" % (Laufzeit, msg))
-         l.flush()
-      except EnvironmentError:
-         l.close()
-         raise
-#
-#  Log Datei schließen, Trailer schreiben ---
-#  Fehlerbehandlung in Methode messung
-#
-   def close_log(self):
-      l=self.logfile
-      try:
-         if l is None:
-            return
-         if self.CGrFlag:
-            self.write_log_msg("Abbruch: Ladekapazitätsgrenzwert (%6.3f Ah) erreicht." % self.CLadGr)
-         elif self.IGrFlag:
-            self.write_log_msg("Abbruch: Lade-/Entladestrom zu groß (%6.3f Ah) erreicht." % self.IMess)
-         else:
-            l.write("#\n")
-            l.write("# Programmende\n")
-            l.write("# Zuletzt geladen:     %6.3f Ah\n" % self.CLad)
-            l.write("# Zuletzt entladen:    %6.3f Ah\n" % self.CEntl)
-            l.write("# Maximalspannung:     %6.3f V \n" % self.UMax)
-            l.write("# Minimalspannung:     %6.3f V \n" % self.UMin)
-            l.write("# Delta-Peak Spannung: %6.3f V \n" % self.DP)
-      except EnvironmentError:
-         l.close()
-         self.logfile= None
-         raise
-      l.close()
-      self.logfile= None
-#
-#  Neue Konfiguration für Kanal einstellen ---
-#
-   def kanal_programmieren(self, config):
-      self.reset_vars()
-      self.Progr= PROG_LADEN
-      self.KanStatus=KSTAT_INAKTIV
-      self.alc7t.commthread.halt()
-#     time.sleep(0.5)
-      try:
-         self.alc7t.commobject.write_AKTyp(self.kanalnummer,config['AKTyp'])
-#        time.sleep(0.5)
-         self.alc7t.commobject.write_AnzZellen(self.kanalnummer,config['AnzZellen'])
-#        time.sleep(0.5)
-         self.alc7t.commobject.write_CNenn(self.kanalnummer,config['CNenn'])
-#        time.sleep(0.5)
-         self.alc7t.commobject.write_ILad(self.kanalnummer,config['ILad'])
-#        time.sleep(0.5)
-         self.alc7t.commobject.write_IEntl(self.kanalnummer,config['IEntl'])
-#        time.sleep(0.5)
-         self.alc7t.commobject.write_Progr(self.kanalnummer,PROG_LADEN)
-#        time.sleep(0.5)
-         while True:
-            p= self.alc7t.commobject.read_Progr(self.kanalnummer)
-            if p == PROG_LADEN:
-               break
-         self.readconfig() # throws KanalError
-      except Rs232Error as e:
-         raise KanalError("Kann neue Kanaleinstellung nicht vornehmen",e.value)
-      self.show_conf()
-      self.config_menu()
-      self.alc7t.commthread.resume()
+      self.befehl(job,fertig)
 #
 #  Kanal konfigurieren
 #
    def do_config_kanal(self):
       dummy= cls_KanalConfigWindow.getKanalConfig(self)
-
 #
 #  Neues Programm für eine Kanal einstellen, Kanal bleibt inaktiv ---
 #
    def do_config_program(self,programm):
-      g=QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
-      self.reset_vars()
-      self.alc7t.commthread.halt()
-      try:
+      def job():
+         self.reset_vars()
          self.alc7t.commobject.write_Progr(self.kanalnummer,programm)
          while True:
             p= self.alc7t.commobject.read_Progr(self.kanalnummer)
             if p == programm:
-               g=QtWidgets.QApplication.restoreOverrideCursor()
                break
-      except Rs232Error as e:
-         g=QtWidgets.QApplication.restoreOverrideCursor()
-         self.alc7t.commthread.resume()
-         reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Ladeprogramm nicht einstellen: "+e.value,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
-      self.Progr=programm
-      self.show_conf()
-      self.config_menu()
-      self.alc7t.commthread.resume()
+
+      def fertig(future):
+         try:
+            future.result()
+         except Rs232Error as e:
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Ladeprogramm nicht einstellen: "+e.value,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+         except KanalError as e:
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Ladeprogramm nicht einstellen: "+kanalfehler(e),QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+            self.show_conf()
+            self.config_menu()
+            return
+         self.Progr=programm
+         self.show_conf()
+         self.config_menu()
+
+      self.befehl(job,fertig)
 #
 # Eingestelltes Programm des Kanals starten
 #
@@ -763,51 +448,82 @@ class cls_kanal(QtCore.QObject):
          mb.setDetailedText(meldungen)
          mb.exec()
          return
-      g=QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
-      self.reset_vars()
-      self.alc7t.commthread.halt()
-      try:
+      def job():
+         self.reset_vars()
          self.alc7t.commobject.write_KanAktivieren(self.kanalnummer,1)
          while True:
             p= self.alc7t.commobject.read_KanStatus(self.kanalnummer)
             if p == 1:
-               g=QtWidgets.QApplication.restoreOverrideCursor()
                break
-      except Rs232Error as e:
-         g=QtWidgets.QApplication.restoreOverrideCursor()
-         self.alc7t.commthread.resume()
-         reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Ladeprogramm nicht starten: "+e.value,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
-         return
-      self.KanStatus=p
-      self.config_menu()
-      self.alc7t.commthread.resume()
+         self.KanStatus=p
+
+      def fertig(future):
+         try:
+            future.result()
+         except Rs232Error as e:
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Ladeprogramm nicht starten: "+e.value,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+            return
+         except KanalError as e:
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Ladeprogramm nicht starten: "+kanalfehler(e),QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+            self.config_menu()
+            return
+         self.config_menu()
+
+      self.befehl(job,fertig)
 #
 # laufendes Programm des Kanals stoppen ---
 #
    def do_stop(self):
-      g=QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
-      self.alc7t.commthread.halt()
-      try:
+      def job():
          self.alc7t.commobject.write_KanAktivieren(self.kanalnummer,0)
          while True:
             p= self.alc7t.commobject.read_KanStatus(self.kanalnummer)
             if p == 0:
-               g=QtWidgets.QApplication.restoreOverrideCursor()
                break
-      except Rs232Error as e:
-         g=QtWidgets.QApplication.restoreOverrideCursor()
-         self.alc7t.commthread.resume()
-         reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Ladeprogramm nicht beenden: "+e.value,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+         self.KanStatus=p
+
+      def fertig(future):
+         try:
+            future.result()
+         except Rs232Error as e:
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Ladeprogramm nicht beenden: "+e.value,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+            return
+         except KanalError as e:
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Ladeprogramm nicht beenden: "+kanalfehler(e),QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+            self.config_menu()
+            return
+         self.config_menu()
+
+      self.befehl(job,fertig)
+#
+#  Messwerte einer fortgesetzten Aufzeichnung im I/O Thread aus der
+#  Logdatei laden lassen, wird vom Messwertfenster aufgerufen. Danach wird
+#  das Fenster aufgefrischt
+#
+   def messwerte_anfordern(self):
+      if not self.messwerte_ausstehend or self.laden_angefordert or self.alc7t.commthread is None:
          return
-      self.KanStatus=p
-      self.config_menu()
-      self.alc7t.commthread.resume()
+      self.laden_angefordert= True
+      def job():
+         self.messwerte_laden()
+
+      def fertig(future):
+         self.laden_angefordert= False
+         try:
+            future.result()
+         except EnvironmentError as e:
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Messwerte nicht aus Logdatei laden: "+e.strerror,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+         except KanalError as e:
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Messwerte nicht aus Logdatei laden: "+kanalfehler(e),QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+         self.sig_refresh.emit()
+
+      self.befehl(job,fertig)
 #
 #  Messwertfenster für Kanal öffnen ---
 #
    def do_messwerte(self):
       if self.PlotDialog== None:
+         from .alcplot import cls_PlotDialog
          self.PlotDialog= cls_PlotDialog(self)
       self.PlotDialog.show()
       self.sig_refresh.emit()
-
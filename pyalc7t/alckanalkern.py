@@ -0,0 +1,694 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+#
+# Messwertverarbeitung eines Kanals ohne Qt -----------------------------------
+#
+# cls_kanalkern enthält die Ablaufsteuerung eines Kanals: Konfiguration lesen,
+# Messwerte verarbeiten, Aufzeichnung in Logdatei und Sitzungsdatenbank,
+# Sicherung und Fortsetzung der Aufzeichnung. Alle Methoden werden vom I/O
+# Thread aufgerufen. Die Anzeige erfolgt über die Methoden anzeige und
+# refresh, die von der GUI (cls_kanal) überschrieben werden.
+#
+# Das Gerät (alc7t) muss commobject, name, suffix, emit_message, sessiondb
+# und logarchiv bereitstellen.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version, aus alckanal.py ausgelagert
+# - aktuelle Messwerte an die Metriken melden (metriken_melden)
+# - Messwerte einer fortgesetzten Aufzeichnung werden erst bei Bedarf aus
+#   der Logdatei geladen (messwerte_laden)
+#
+import datetime
+import os
+import time
+from .alcconst import *
+from .alcconfig import ALCCONFIG
+from .alclogwriter import cls_logwriter, cls_logkopf
+from .alcamb import cls_ambwriter, ereignisdatei, logreader
+from .alccheckpoint import cls_checkpoint
+from .alcsessiondb import SessionDbError
+from .alcrs232 import Rs232Error
+from .alcstore import cls_messwertspeicher
+from .alcsched import POLL_KRITISCH, POLL_AKTIV, POLL_RUHE, POLL_LEER
+
+#
+# Variablen, die für die Fortsetzung einer Aufzeichnung gesichert werden
+#
+ZUSTAND= ("UMax", "UMin", "DPMax", "DP", "CLad", "CEntl", "CEntlAlt", "CMessAlt", "CFlag", "IRichtg")
+
+#
+# Kanal ohne Anzeige ----------------------------------------------------------
+#
+class cls_kanalkern(object):
+
+   def __init__(self, alc7t, kanalnr):
+      self.kanalnummer = kanalnr
+      self.alc7t= alc7t
+#
+#     Kanalkonfiguration
+#
+      self.Progr= PROG_UNKNOWN
+      self.AnzZellen=0
+      self.UNenn=0.0
+      self.ILad=0.0
+      self.IEntl=0.0
+      self.CNenn=0.0
+      self.AKTyp= AKKU_TYP_NICD_NIMH
+      self.Beschreibung=""
+#
+#     Status
+#
+      self.status= STAT_DISABLED
+      self.KanStatus= KSTAT_UNKNOWN
+      self.AkStatus= AKSTAT_KEIN_AKKU
+#
+#     Log Datei
+#    
+      self.logfile= None
+      self.sitzung= None
+      if ALCCONFIG.get("pyalc7t","logformat") == "amb":
+         self.logwriter= cls_ambwriter
+         self.logendung= ".amb"
+      else:
+         self.logwriter= cls_logwriter
+         self.logendung= ".amw"
+      self.logfilename="0_kanal%d%s%s" % (kanalnr,self.alc7t.suffix,self.logendung)
+#
+#     Sicherung des Aufzeichnungszustands
+#
+      self.checkpointdatei= cls_checkpoint("kanal%d%s.state" % (kanalnr,self.alc7t.suffix))
+      self.checkpointintervall= 0
+      self.checkpoint_zeit= 0.0
+#
+#     Messwertspeicher
+#
+      self.messwerte = cls_messwertspeicher()
+#
+#     Variablen initialisieren
+#
+      self.reset_vars()
+#
+#  Kanal enablen, Konfiguration lesen, wird vom thread aufgerufen
+#
+   def enable(self):
+      self.reset_vars()
+      self.alc7t.emit_message("Lese Konfiguration für Kanal "+str(self.kanalnummer))
+      self.readconfig() # throws KanalError
+      self.subseconds= ALCCONFIG.get("pyalc7t","subseconds")
+      self.logflush= (ALCCONFIG.get("pyalc7t","logflushinterval"), ALCCONFIG.get("pyalc7t","logflushsize"), ALCCONFIG.get("pyalc7t","logsync"))
+#
+#     Logdatei der letzten Aufzeichnung für das Messwertfenster
+#
+      archiv= self.alc7t.logarchiv()
+      if archiv is not None:
+         letzte= archiv.letzte(self.kanalnummer,self.alc7t.suffix,self.logendung)
+         if letzte is not None:
+            self.logfilename= letzte
+#
+#     Unterbrochene Aufzeichnung fortsetzen oder abschließen
+#
+      self.checkpointintervall= ALCCONFIG.get("pyalc7t","checkpointinterval")
+      zustand= self.checkpointdatei.lesen()
+      if zustand is not None:
+         self.fortsetzen(zustand) # throws KanalError
+      self.status= STAT_ENABLED
+      self.anzeige()
+#
+#  Kanal disablen. Eine laufende Aufzeichnung wird nur unterbrochen, wenn
+#  der Zustand gesichert wird, sonst abgeschlossen
+#
+   def disable(self):
+      try:
+         if self.Aufz and self.checkpointintervall > 0:
+            self.unterbrechen()
+         else:
+            self.close_log(True)
+      except:
+         pass
+      self.reset_vars()
+      self.status= STAT_DISABLED
+      
+#
+#
+#  Reset des Kanals, z.B. bei Neustart ---
+#
+   def reset_vars(self):
+#
+#     Messwerte vom ALC 7000
+#
+      self.UMess=0.0
+      self.IMess=0.0
+      self.CMess=0.0
+      self.CMessAlt=0.0
+#
+#     errechnete Messwerte
+#
+      self.UMin= UMIN_INIT
+      self.UMax=0.0
+      self.DPMax=0.0
+      self.DP=0.0
+      self.CLad=0.0
+      self.CEntl=0.0
+      self.CEntlAlt=0.0
+#
+#     Status
+#
+      self.IRichtg= STRR_UNDEF
+      self.IRichtgAlt = STRR_UNDEF
+#
+#     Ablaufkontrolle
+#
+      self.IStart=0.009
+      self.Aufz= False
+      self.CFlag = False
+      self.CGrFlag= False
+      self.IGrFlag= False
+#
+#     Zeitmessung: TStart ist die Wanduhrzeit beim Beginn der Aufzeichnung,
+#     alle Zeitdifferenzen werden aus den monotonen Zeitstempeln der
+#     Messungen (ns) berechnet
+#
+      self.DeltaTime= None
+      self.TStart= None
+      self.TStart_ns= None
+      self.Laufzeit_ns= 0
+      self.LaufzeitAlt_ns= 0
+#
+#     Messwertspeicher, ein neuer Speicher pro Aufzeichnung. Views auf den
+#     alten Speicher bleiben gültig. Bei einer fortgesetzten Aufzeichnung
+#     stehen die Messwerte vor der Unterbrechung nur in der Logdatei
+#
+      self.messwerte = cls_messwertspeicher()
+      self.messwerte_ausstehend= False
+#
+#
+#  Kanalkonfiguration auslesen ---
+#
+   def readconfig(self):
+#
+#     Kanalkonfiguration abfragen
+#
+      kanalnr= self.kanalnummer
+      try:
+         self.Progr= self.alc7t.commobject.read_Progr(kanalnr)
+         self.AnzZellen= self.alc7t.commobject.read_AnzZellen(kanalnr)
+         self.ILad= self.alc7t.commobject.read_ILad(kanalnr)
+         self.IEntl= self.alc7t.commobject.read_IEntl(kanalnr)
+         self.CNenn= self.alc7t.commobject.read_CNenn(kanalnr)
+         self.AKTyp= self.alc7t.commobject.read_AKTyp(kanalnr)
+      except Rs232Error as e:
+         raise KanalError('Kann Kanalkonfiguration nicht abfragen', e.value)
+
+      self.UNenn= dict_akku_spannung[self.AKTyp]* self.AnzZellen
+      self.CLadGr= self.CNenn* CGRENZ
+      self.ILadGr= self.ILad* IGRENZ
+      self.IEntlGr= self.IEntl* IGRENZ
+
+#
+#     Neuberechnung des Schwellenwertes, ab dem Aufzeichnung beginnt
+#
+      self.IStart= self.IEntl
+      if self.ILad < self.IEntl:
+         self.IStart= self.ILad
+      self.IStart= self.IStart / 10.0
+      if self.IStart == 0:
+         self.IStart= 0.009
+#
+#  Aktuelle Messwerte und Status an die Metriken (alcmetrics.cls_metriken)
+#  melden, wird vom I/O Thread nach jeder Messung aufgerufen
+#
+   def metriken_melden(self,metriken):
+      metriken.messung(self.alc7t.name,self.kanalnummer,self.UMess,self.IMess,self.CLad,self.CEntl,self.KanStatus,self.AkStatus,self.Aufz)
+#
+#  Abfrageklasse für den Zeitplan des I/O Threads: kurz vor Delta-Peak oder
+#  einem Grenzwert kritisch, bei Aufzeichnung oder laufendem Programm aktiv,
+#  ohne Akku leer, sonst ruhend
+#
+   def pollklasse(self):
+      if self.AkStatus == AKSTAT_KEIN_AKKU:
+         return POLL_LEER
+      if not self.Aufz:
+         if self.KanStatus == KSTAT_AKTIV:
+            return POLL_AKTIV
+         return POLL_RUHE
+      if self.IRichtg == STRR_LADEN:
+         if self.DP > DP_NAEHE* self.AnzZellen or self.CLad > self.CNenn* GRENZNAEHE:
+            return POLL_KRITISCH
+         if self.Progr != PROG_REFRESH and self.CLad > self.CLadGr* GRENZNAEHE:
+            return POLL_KRITISCH
+      if self.IRichtg == STRR_ENTLADEN and self.UMess < self.UNenn* GRENZNAEHE:
+         return POLL_KRITISCH
+      return POLL_AKTIV
+#
+#  Anzeige aktualisieren, wird vom I/O Thread nach jeder Messung und bei
+#  Statusänderungen aufgerufen. Der Kern hat keine Anzeige
+#
+   def anzeige(self):
+      pass
+#
+#  Neue Messwerte für das Messwertfenster, wird vom I/O Thread aufgerufen
+#
+   def refresh(self):
+      pass
+#
+#  Messung pro Kanal ausführen und Verarbeiten, wird vom I/O Thread
+#  aufgerufen ---
+#
+   def messung(self):
+      kanalnr=self.kanalnummer
+      try:    
+#
+#        Kanal- und Akkustatus, Stromrichtung und Messwerte in einer
+#        Abfrage lesen
+#
+         z= self.alc7t.commobject.poll_Kanal(kanalnr)
+      except Rs232Error as e:
+         raise KanalError('Kann Messwerte nicht lesen', e.value)
+      self.KanStatus= z.KanStatus
+      self.AkStatus = z.AkStatus
+#
+#     Stromrichtung
+#
+      self.IRichtgAlt = self.IRichtg
+      self.IRichtg= z.IRichtg
+      if self.IRichtgAlt == STRR_UNDEF:
+         self.IRichtgAlt= self.IRichtg
+#
+#     Messwerte
+#
+      m= z.Mess
+      self.UMess= m[0] / 1000
+      self.IMess= m[1] / 1000
+      self.CMess= m[2] / 100
+#
+#     Min Max Spannung
+#
+      if self.UMess > 0.0 :
+         if self.UMess < self.UMin:
+            self.UMin= self.UMess
+      if self.UMess > self.UMax:
+         self.UMax = self.UMess
+      if self.UMess > self.DPMax:
+         self.DPMax= self.UMess
+#
+#     Aufzeichnung beginnen wenn Akku geladen wird und Strom fliesst
+#
+      if not self.Aufz and self.AkStatus== AKSTAT_AKKU_ANG and self.KanStatus== KSTAT_AKTIV and self.IMess > self.IStart:
+         self.IMess= self.IStart
+         self.TStart= datetime.datetime.now()
+         self.TStart_ns= z.Zeit_ns
+         self.Laufzeit_ns= 0
+         self.LaufzeitAlt_ns= 0
+         self.Aufz= True
+#
+#        Dateikopf schreiben 
+#
+         try:
+            self.open_log()
+         except EnvironmentError as e:
+            raise KanalError('Kann Logdatei nicht öffnen',e.strerror)
+
+      if not self.Aufz:
+         self.anzeige()
+         return
+#
+#     Wenn Akku geladen wird, dann Delta-Peak berechnen
+#
+      if self.AkStatus == AKSTAT_AKKU_ANG and  self.IRichtg == STRR_LADEN and self.UMess <= self.DPMax:
+         self.DP= self.DPMax - self.UMess
+
+#
+#     Laufzeit berechnen
+#
+      if self.KanStatus== KSTAT_AKTIV:
+         self.Laufzeit_ns= z.Zeit_ns - self.TStart_ns
+         self.DeltaTime= datetime.timedelta(microseconds=self.Laufzeit_ns//1000)
+#
+#     eingeladene bzw. entladene Kapazität berechnen
+#
+      Intervall= (self.Laufzeit_ns - self.LaufzeitAlt_ns) / 1e9
+      if self.IRichtg== STRR_ENTLADEN:
+         self.CEntl= self.CEntl+ self.IMess* Intervall/3600 * 0.975
+      if self.IRichtg== STRR_LADEN:
+         self.CLad= self.CLad + self.IMess * Intervall/3600 * 0.975
+      self.LaufzeitAlt_ns= self.Laufzeit_ns
+#
+#     wenn Entladekapazität vom ALC7000 gelöscht wird (bei Überhitzung), dann soll die
+#     berechnete Kapazität verwendet werden
+#
+      if self.IRichtg == STRR_ENTLADEN:
+         if self.CMess < self.CMessAlt:
+            self.CFlag= True
+         self.CMessAlt= self.CMess
+
+      if self.CFlag:
+         self.CMess= self.CEntl
+#
+#     Lade- oder Entladestrom zu hoch (mehr als IGRENZ%)
+#
+      if self.Progr != PROG_REFRESH:
+          Laufzeit= int(self.DeltaTime.total_seconds())
+          if ((self.IRichtg== STRR_LADEN and (self.IMess > self.ILadGr)) or (self.IRichtg==STRR_ENTLADEN and (self.IMess > self.IEntlGr))) and Laufzeit > TCHECKDELAY:
+            if (self.IRichtg== STRR_LADEN):
+               self.write_log_msg("Ladestrom überschritten %1.3f A (Grenzwert %1.3f A)" % (self.IMess, self.ILadGr) )
+            else:
+               self.write_log_msg("Entladestrom überschritten %1.3f A (Grenzwert %1.3f A)" % (self.IMess, self.IEntldGr) )
+            try:
+               self.alc7t.commobject.write_KanAktivieren(kanalnr,KSTAT_INAKTIV)
+               self.KanStatus= self.alc7t.commobject.read_KanStatus(kanalnr)
+
+            except Rs232Error as e:
+               raise KanalError('Kann Kanal nicht deaktivieren',e.value)
+
+            self.IGrFlag= True
+            self.AkStatus= AKSTAT_AKKU_VOLL
+
+#
+#     Kapazitätsgrenze überschritten?
+#
+      if self.IRichtg== STRR_LADEN and self.Progr != PROG_REFRESH and self.CLad > self.CLadGr:
+         self.write_log_msg("Kapazitätsgrenze überschritten %6.3f Ah (Grenzwert %5.3f Ah)" % (self.CLad, self.CLadGr) )
+         try:
+            self.alc7t.commobject.write_KanAktivieren(kanalnr,KSTAT_INAKTIV)
+            self.KanStatus= self.alc7t.commobject.read_KanStatus(kanalnr)
+
+         except Rs232Error as e:
+            raise KanalError('Kann Kanal nicht deaktivieren',e.value)
+
+         self.CGrFlag= True
+         self.AkStatus= AKSTAT_AKKU_VOLL
+#
+#        Änderung der Stromrichtung
+#
+      if self.IRichtg != self.IRichtgAlt:
+         if self.IRichtgAlt== STRR_LADEN:
+            self.CEntl= 0
+            self.CEntlAlt=0
+            self.CFlag= False
+#
+#           Ausgabe in Datei 
+#
+            try:
+               self.write_log_msg("Umgeschaltet auf Entladen - geladene Kapazität %6.3f Ah - Delta-Peak %5.3f V" % (self.CLad, self.DP) )
+            except EnvironmentError as e:
+               raise KanalError('Kann nicht auf Logdatei schreiben',e.strerror)
+
+         if self.IRichtgAlt== STRR_ENTLADEN:
+            self.CLad=0
+            self.DP=0
+            self.DPMax=0
+#
+#           Ausgabe in Datei 
+#
+            try:
+               self.write_log_msg("Umgeschaltet auf Laden - entladene Kapazität %6.3f Ah" % self.CMess)
+            except EnvironmentError as e:
+               raise KanalError('Kann nicht auf Logdatei schreiben',e.strerror)
+
+      if self.IRichtg == self.IRichtgAlt and self.AkStatus == AKSTAT_AKKU_ANG:
+#
+#        Ausgabe in Datei
+#
+         try:
+            self.write_log_mess()
+            self.checkpoint()
+         except EnvironmentError as e:
+            raise KanalError('Kann nicht auf Logdatei schreiben',e.strerror)
+
+      self.anzeige()
+      self.refresh()
+#
+#        Messprogrammende, Dateien schliessen
+#
+      if self.AkStatus > AKSTAT_AKKU_ANG or self.KanStatus == KSTAT_INAKTIV:
+         try:
+            self.close_log()
+         except EnvironmentError as e:
+            raise KanalError('Kann Logdatei nicht abschließen',e.strerror)
+
+         self.Aufz= False        
+#
+#  Neue Logdatei öffnen und Header schreiben. Mit Archivierung wird eine Datei
+#  mit Zeitstempel angelegt und die vorherige an das Archiv übergeben, sonst
+#  werden die alten Logdateien 0_ ... 3_ verschoben ---
+#  Fehlerbehandlung in Methode messung
+#
+   def open_log(self):
+      kanalnr= self.kanalnummer
+      archiv= self.alc7t.logarchiv()
+      if archiv is not None:
+         vorherige= self.logfilename
+         self.logfilename= archiv.neuer_name(kanalnr,self.alc7t.suffix,self.logendung,datetime.datetime.now())
+         if os.path.isfile(vorherige):
+            archiv.archivieren(vorherige,kanalnr,self.alc7t.suffix)
+      elif os.path.isfile(self.logfilename):
+         j=3
+         while True:
+            name_old= "%d_kanal%d%s%s" % (j, kanalnr, self.alc7t.suffix, self.logendung)
+            name_new= "%d_kanal%d%s%s" % (j-1,kanalnr, self.alc7t.suffix, self.logendung)
+            namen= [(name_old, name_new)]
+            if self.logendung == ".amb":
+               namen.append((ereignisdatei(name_old), ereignisdatei(name_new)))
+            for name_old, name_new in namen:
+               if os.path.isfile(name_old):
+                  os.remove(name_old)
+               if os.path.isfile(name_new):
+                  os.rename(name_new, name_old)
+            j=j-1
+            if j == 0 :
+               break
+      self.logfile=self.logwriter(self.logfilename,self.subseconds,*self.logflush)
+      l= self.logfile
+      dt=datetime.datetime.now()
+      logkopf= cls_logkopf(dt.strftime("%d-%m-%Y"),dt.strftime("%H:%M:%S"),kanalnr,self.Progr,self.AnzZellen,self.AKTyp,self.UNenn,self.ILad,self.CNenn,self.IEntl)
+      try:
+         l.kopf(logkopf)
+      except EnvironmentError:
+         l.verwerfen()
+         raise
+#
+#     Sitzung in der Datenbank anlegen, Fehler der Datenbank unterbrechen
+#     die Aufzeichnung nicht
+#
+      self.sitzung= None
+      db= self.alc7t.sessiondb()
+      if db is not None:
+         try:
+            self.sitzung= db.beginn(self.alc7t.name,logkopf,self.Beschreibung,self.logfilename)
+         except SessionDbError as e:
+            self.alc7t.emit_message("Sitzungsdatenbank: "+e.value)
+        
+#
+#  Messwerte in Logdatei schreiben und in Messwertspeicher für Messw.fenster ---
+#  Fehlerbehandlung in Methode messung
+#    
+   def write_log_mess(self): 
+      l=self.logfile
+      try:
+         l.messwert(self.Laufzeit_ns, self.UMess, self.IMess)
+      except EnvironmentError:
+         l.verwerfen()
+         raise
+      self.messwerte.append(self.Laufzeit_ns / 1e9, self.UMess, self.IMess, self.IRichtg)
+
+   def write_log_msg(self,msg):
+      l=self.logfile
+      Laufzeit= int(self.DeltaTime.total_seconds())
+      try:
+         l.ereignis("# %06d %s\n" % (Laufzeit, msg))
+      except EnvironmentError:
+         l.verwerfen()
+         raise
+#
+#  Log Datei schließen, Trailer schreiben, Sitzung abschließen ---
+#  unterbrochen: Aufzeichnung endet, weil der Kanal disabled wird
+#  Fehlerbehandlung in Methode messung
+#
+   def close_log(self,unterbrochen=False):
+      l=self.logfile
+      if l is None:
+         return
+      abbruch= None
+      try:
+         if self.CGrFlag:
+            abbruch= "Abbruch: Ladekapazitätsgrenzwert (%6.3f Ah) erreicht." % self.CLadGr
+            self.write_log_msg(abbruch)
+         elif self.IGrFlag:
+            abbruch= "Abbruch: Lade-/Entladestrom zu groß (%6.3f Ah) erreicht." % self.IMess
+            self.write_log_msg(abbruch)
+         else:
+            if unterbrochen:
+               abbruch= "Aufzeichnung unterbrochen"
+            l.ereignis("#\n"+
+               "# Programmende\n"+
+               "# Zuletzt geladen:     %6.3f Ah\n" % self.CLad+
+               "# Zuletzt entladen:    %6.3f Ah\n" % self.CEntl+
+               "# Maximalspannung:     %6.3f V \n" % self.UMax+
+               "# Minimalspannung:     %6.3f V \n" % self.UMin+
+               "# Delta-Peak Spannung: %6.3f V \n" % self.DP)
+         l.close()
+      except EnvironmentError:
+         l.verwerfen()
+         raise
+      finally:
+         self.logfile= None
+         self.sitzung_abschliessen(abbruch)
+         self.checkpointdatei.loeschen()
+#
+#  Aufzeichnung unterbrechen: Zustand sichern und Logdatei ohne Trailer
+#  schließen, die Sitzung bleibt offen ---
+#
+   def unterbrechen(self):
+      l=self.logfile
+      if l is None:
+         return
+      try:
+         self.checkpoint(True)
+         l.close()
+      except EnvironmentError:
+         l.verwerfen()
+         raise
+      finally:
+         self.logfile= None
+         self.sitzung= None
+#
+#  Zustand der Aufzeichnung sichern, höchstens alle checkpointintervall
+#  Sekunden oder sofort. Die Logdatei wird vorher geleert, damit sie zum
+#  Zustand passt. Fehler beim Leeren lösen EnvironmentError aus, Fehler beim
+#  Sichern werden nur gemeldet ---
+#
+   def checkpoint(self,sofort=False):
+      if self.logfile is None or self.checkpointintervall <= 0:
+         return
+      jetzt= time.monotonic()
+      if not sofort and jetzt- self.checkpoint_zeit < self.checkpointintervall:
+         return
+      self.checkpoint_zeit= jetzt
+      self.logfile.flush()
+      zustand= {k: getattr(self,k) for k in ZUSTAND}
+      zustand.update(Progr=self.Progr, AnzZellen=self.AnzZellen, AKTyp=self.AKTyp,
+         TStart=self.TStart.isoformat(), Laufzeit_ns=self.Laufzeit_ns,
+         wand=time.time(), logfilename=self.logfilename,
+         subseconds=self.subseconds, sitzung=self.sitzung)
+      try:
+         self.checkpointdatei.schreiben(zustand)
+      except OSError as e:
+         self.alc7t.emit_message("Kann Zustand von Kanal %d nicht sichern: %s" % (self.kanalnummer,e.strerror))
+#
+#  Gesicherten Zustand einer unterbrochenen Aufzeichnung übernehmen, wird von
+#  enable aufgerufen. Läuft auf dem Kanal noch das gleiche Programm, wird die
+#  Aufzeichnung in der gleichen Logdatei und Sitzung fortgesetzt. Die
+#  Laufzeit zählt die Unterbrechung mit, die Kapazität wird bei der nächsten
+#  Messung mit dem aktuellen Strom über die Unterbrechung fortgeschrieben.
+#  Sonst wird die Aufzeichnung mit Trailer abgeschlossen. Die Logdatei wird
+#  dabei nicht gelesen, die Messwerte für Messwertfenster und
+#  Sitzungsdatenbank lädt erst messwerte_laden ---
+#
+   def fortsetzen(self,zustand):
+      try:
+         z= self.alc7t.commobject.poll_Kanal(self.kanalnummer)
+      except Rs232Error as e:
+         raise KanalError('Kann Messwerte nicht lesen', e.value)
+      try:
+         werte= {k: zustand[k] for k in ZUSTAND}
+         TStart= datetime.datetime.fromisoformat(zustand["TStart"])
+         laufzeit_ns= int(zustand["Laufzeit_ns"])
+         pause_ns= max(int((time.time()- zustand["wand"])*1e9),0)
+         logfilename= zustand["logfilename"]
+         subseconds= zustand["subseconds"]
+         sitzung= zustand["sitzung"]
+         gleich= all(zustand[k] == getattr(self,k) for k in ("Progr","AnzZellen","AKTyp"))
+      except (KeyError, TypeError, ValueError):
+         self.checkpointdatei.loeschen()
+         return
+      if not os.path.isfile(logfilename):
+         self.checkpointdatei.loeschen()
+         return
+      if logfilename.endswith(".amb"):
+         writer= cls_ambwriter
+      else:
+         writer= cls_logwriter
+      try:
+         self.logfile= writer(logfilename,subseconds,*self.logflush,anhaengen=True)
+      except EnvironmentError as e:
+         self.checkpointdatei.loeschen()
+         raise KanalError('Kann Logdatei nicht öffnen',e.strerror)
+      for k in werte:
+         setattr(self,k,werte[k])
+      self.TStart= TStart
+      self.Laufzeit_ns= laufzeit_ns
+      self.LaufzeitAlt_ns= laufzeit_ns
+      self.DeltaTime= datetime.timedelta(microseconds=laufzeit_ns//1000)
+      self.logfilename= logfilename
+      self.subseconds= subseconds
+      self.sitzung= sitzung
+      self.messwerte= cls_messwertspeicher()
+      self.messwerte_ausstehend= True
+      self.Aufz= True
+      try:
+         if gleich and z.KanStatus == KSTAT_AKTIV and z.AkStatus == AKSTAT_AKKU_ANG:
+            self.TStart_ns= z.Zeit_ns- laufzeit_ns- pause_ns
+            self.DeltaTime= datetime.timedelta(microseconds=(laufzeit_ns+ pause_ns)//1000)
+            self.write_log_msg("Aufzeichnung fortgesetzt nach %d s Unterbrechung" % (pause_ns// 1000000000))
+            self.checkpoint(True)
+         else:
+            self.close_log(True)
+            self.reset_vars()
+      except EnvironmentError as e:
+         raise KanalError('Kann nicht auf Logdatei schreiben',e.strerror)
+#
+#  Messwerte einer fortgesetzten Aufzeichnung aus der Logdatei laden. Die
+#  Logdatei enthält auch die Messwerte seit der Fortsetzung, sie ersetzt
+#  daher den Messwertspeicher. Wird im I/O Thread aufgerufen, wenn die
+#  Messwerte angezeigt oder in die Sitzungsdatenbank geschrieben werden.
+#  Fehler lösen EnvironmentError aus
+#
+   def messwerte_laden(self):
+      if not self.messwerte_ausstehend:
+         return
+      if self.logfile is not None:
+         self.logfile.flush()
+      r= logreader(self.logfilename)
+      r.lesen()
+      self.messwerte= r.messwerte
+      self.messwerte_ausstehend= False
+#
+#  Zusammenfassung und Messwerte in die Sitzungsdatenbank
+#
+   def sitzung_abschliessen(self,abbruch):
+      db= self.alc7t.sessiondb()
+      if self.sitzung is None or db is None:
+         return
+      try:
+         self.messwerte_laden()
+      except EnvironmentError as e:
+         self.alc7t.emit_message("Kann Messwerte nicht aus Logdatei laden: "+e.strerror)
+      umin= None if self.UMin == UMIN_INIT else self.UMin
+      try:
+         db.abschliessen(self.sitzung,self.CLad,self.CEntl,self.UMax,umin,self.DP,abbruch,self.messwerte)
+      except SessionDbError as e:
+         self.alc7t.emit_message("Sitzungsdatenbank: "+e.value)
+      self.sitzung= None
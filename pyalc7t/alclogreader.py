@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Inkrementelles Lesen einer Logdatei (.amw) ---------------------------------
+#
+# Der Leser merkt sich die Byteposition hinter der letzten vollständigen
+# Zeile und liest bei jedem Aufruf von lesen() nur die seitdem angehängten
+# Zeilen. Eine unvollständige letzte Zeile wird erst gelesen, wenn sie mit
+# einem Zeilenende abgeschlossen ist. Messwertzeilen kommen in einen
+# cls_messwertspeicher, Zeilen mit "#" in die Liste ereignisse als
+# (zeit, text). Die Zeit ist None bei Kopf- und Trailerzeilen ohne Laufzeit.
+#
+# Wurde die Datei ersetzt (neue Aufzeichnung, Logdateien verschoben) oder
+# gekürzt, beginnt der Leser von vorn. Das wird an Inode, Größe und erster
+# Zeile erkannt. Der Leser benötigt kein Qt und kann eine Logdatei, die ein
+# anderes Programm schreibt, mit geringem Aufwand verfolgen.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+#
+import os
+
+from .alcconst import STRR_UNDEF
+from .alcstore import cls_messwertspeicher
+
+#
+# Länge des Dateianfangs, an dem eine ersetzte Datei erkannt wird
+#
+KOPF_LAENGE=128
+
+class cls_logreader(object):
+
+   def __init__(self,dateiname):
+      self.dateiname= dateiname
+      self.reset()
+
+   def reset(self):
+      self.messwerte= cls_messwertspeicher()
+      self.ereignisse= [ ]
+      self.offset= 0
+      self.inode= None
+      self.kopf= b""
+#
+#  Neue Zeilen lesen. Gibt True zurück, wenn neue Messwerte oder Ereignisse
+#  gelesen wurden oder der Leser von vorn begonnen hat. Existiert die Datei
+#  nicht, bleibt alles leer. Lesefehler lösen OSError aus.
+#
+   def lesen(self):
+      try:
+         f= open(self.dateiname,"rb")
+      except FileNotFoundError:
+         if self.offset == 0:
+            return False
+         self.reset()
+         return True
+      with f:
+         st= os.fstat(f.fileno())
+         neu= False
+         if self.offset > 0 and self.ersetzt(f,st):
+            self.reset()
+            neu= True
+         self.inode= st.st_ino
+         if st.st_size <= self.offset:
+            return neu
+         f.seek(self.offset)
+         daten= f.read(st.st_size- self.offset)
+      ende= daten.rfind(b"\n")
+      if ende < 0:
+         return neu
+      daten= daten[:ende+1]
+      if self.offset < KOPF_LAENGE:
+         self.kopf= (self.kopf+ daten)[:KOPF_LAENGE]
+      self.offset+= len(daten)
+      anzahl= len(self.messwerte)+ len(self.ereignisse)
+      for zeile in daten.decode("utf-8",errors="replace").splitlines():
+         self.zeile(zeile)
+      return neu or len(self.messwerte)+ len(self.ereignisse) != anzahl
+#
+#  Wurde die Datei seit dem letzten Lesen ersetzt oder gekürzt?
+#
+   def ersetzt(self,f,st):
+      if st.st_ino != self.inode or st.st_size < self.offset:
+         return True
+      f.seek(0)
+      return f.read(len(self.kopf)) != self.kopf
+#
+#  Eine Zeile auswerten, fehlerhafte Zeilen werden übergangen
+#
+   def zeile(self,zeile):
+      werte= zeile.split()
+      if not werte:
+         return
+      if werte[0] == "#":
+         if len(werte) == 1:
+            return
+         try:
+            zeit= float(werte[1])
+            text= " ".join(werte[2:])
+         except ValueError:
+            zeit= None
+            text= zeile.strip()[1:].strip()
+         self.ereignisse.append((zeit,text))
+         return
+      try:
+         self.messwerte.append(float(werte[0]),float(werte[1]),float(werte[2]),STRR_UNDEF)
+      except (ValueError, IndexError):
+         pass
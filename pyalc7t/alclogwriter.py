@@ -0,0 +1,197 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Gepuffertes Schreiben einer Logdatei (.amw) --------------------------------
+#
+# Messwertzeilen werden im Speicher gesammelt und erst geschrieben, wenn
+# seit dem letzten Schreiben intervall Sekunden vergangen sind oder groesse
+# Zeichen anstehen. Ereigniszeilen (Dateikopf, Grenzwerte, Umschaltung der
+# Stromrichtung, Programmende) werden zusammen mit den anstehenden
+# Messwerten sofort geschrieben. Damit wird pro Kanal nicht mehr bei jeder
+# Messung auf das Medium geschrieben, was z.B. SD-Karten schont.
+#
+# Wann zusätzlich os.fsync() aufgerufen wird, legt sync fest:
+#   never:  nie, das Betriebssystem entscheidet
+#   close:  beim Schließen der Datei (Standard)
+#   event:  nach Ereigniszeilen und beim Schließen
+#   always: nach jedem Schreiben
+#
+# Bei einem Absturz gehen höchstens die Messwerte der letzten intervall
+# Sekunden verloren. Leser wie cls_logreader sehen nur vollständige Zeilen.
+#
+# Dateikopf (cls_logkopf) und Messwertzeilen (messwertzeile) werden hier
+# formatiert, damit das Binärformat (alcamb.py) exakt dieselbe .amw Datei
+# erzeugen kann.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+# - Dateikopf und Messwertzeilen werden im Logwriter formatiert
+# - Anhängen an eine vorhandene Logdatei (Fortsetzen einer Aufzeichnung)
+#
+import os
+import time
+
+from .alcconst import dict_programme, dict_akku_typ
+
+SYNC_NIE="never"
+SYNC_SCHLIESSEN="close"
+SYNC_EREIGNIS="event"
+SYNC_IMMER="always"
+SYNC_MODI=(SYNC_NIE, SYNC_SCHLIESSEN, SYNC_EREIGNIS, SYNC_IMMER)
+#
+# Standardwerte: Sekunden bzw. Zeichen bis zum Schreiben der Messwerte
+#
+FLUSH_INTERVALL=10.0
+FLUSH_GROESSE=8192
+
+#
+# Einstellungen des Kanals beim Start der Aufzeichnung -----------------------
+#
+class cls_logkopf(object):
+
+   def __init__(self,datum,zeit,kanal,programm,zellen,akkutyp,unenn,ilad,cnenn,ientl):
+      self.datum= datum
+      self.zeit= zeit
+      self.kanal= kanal
+      self.programm= programm
+      self.zellen= zellen
+      self.akkutyp= akkutyp
+      self.unenn= unenn
+      self.ilad= ilad
+      self.cnenn= cnenn
+      self.ientl= ientl
+#
+#  Dateikopf der .amw Datei
+#
+   def text(self):
+      return ("# Messdatendatei des Programms pyalc7t angelegt "+self.datum+" "+self.zeit+"\n"+
+         "#\n"+
+         "# Konfiguration des Kanals\n"+
+         "#\n"+
+         "# Einstellungen beim Start der Aufzeichnung:\n"+
+         "# Kanal:         %6d         Programm:     %s\n" % (self.kanal, dict_programme[self.programm])+
+         "# Zellenzahl:    %6d         Akkutyp:      %s\n" % (self.zellen, dict_akku_typ[self.akkutyp])+
+         "# Nennspannung:  %6.2f V     Ladestrom:    %5.3f A\n" % (self.unenn, self.ilad)+
+         "# Nennkapazität: %6.3f Ah    Entladestrom: %5.3f A\n" % (self.cnenn, self.ientl)+
+         "#\n"+
+         "# Messwerte\n"+
+         "# Zeit [Sek] Spannung [V] Strom [A]\n")
+#
+# Messwertzeile der .amw Datei, Laufzeit in ns
+#
+def messwertzeile(laufzeit_ns,spannung,strom,subseconds):
+   if subseconds:
+      laufzeit= "%010.3f" % (laufzeit_ns / 1e9)
+   else:
+      laufzeit= "%06d" % (laufzeit_ns // 1000000000)
+   return "  %s        %2.3f      %1.3f\n" % (laufzeit, spannung, strom)
+
+class cls_logwriter(object):
+#
+#  Datei neu anlegen oder mit anhaengen an eine vorhandene Datei anhängen,
+#  eine unvollständige letzte Zeile wird dabei abgeschlossen. Unbekannte sync
+#  Modi werden wie "close" behandelt. Fehler beim Öffnen lösen OSError aus
+#
+   def __init__(self,dateiname,subseconds=False,intervall=FLUSH_INTERVALL,groesse=FLUSH_GROESSE,sync=SYNC_SCHLIESSEN,uhr=time.monotonic,anhaengen=False):
+      self.subseconds= subseconds
+      self.intervall= intervall
+      self.groesse= groesse
+      if sync not in SYNC_MODI:
+         sync= SYNC_SCHLIESSEN
+      self.sync= sync
+      self.uhr= uhr
+      self.puffer= [ ]
+      self.pufferlaenge= 0
+      if anhaengen:
+         self.datei= open(dateiname,"a")
+         if not self.zeilenende(dateiname):
+            self.puffer.append("\n")
+      else:
+         self.datei= open(dateiname,"w")
+      self.letzte= self.uhr()
+#
+#  Endet die Datei mit einem Zeilenende (oder ist leer)?
+#
+   def zeilenende(self,dateiname):
+      with open(dateiname,"rb") as f:
+         f.seek(0,os.SEEK_END)
+         if f.tell() == 0:
+            return True
+         f.seek(-1,os.SEEK_END)
+         return f.read(1) == b"\n"
+
+#
+#  Dateikopf schreiben
+#
+   def kopf(self,logkopf):
+      self.ereignis(logkopf.text())
+#
+#  Messwert, Laufzeit in ns, wird gepuffert
+#
+   def messwert(self,laufzeit_ns,spannung,strom):
+      zeile= messwertzeile(laufzeit_ns,spannung,strom,self.subseconds)
+      self.puffer.append(zeile)
+      self.pufferlaenge+= len(zeile)
+      if self.pufferlaenge >= self.groesse or self.uhr()- self.letzte >= self.intervall:
+         self.flush()
+#
+#  Ereigniszeile(n), werden mit den anstehenden Messwerten sofort geschrieben
+#
+   def ereignis(self,zeilen):
+      self.puffer.append(zeilen)
+      self.flush(self.sync in (SYNC_EREIGNIS, SYNC_IMMER))
+#
+#  Anstehende Zeilen schreiben, bei sync auch auf das Medium
+#
+   def flush(self,sync=None):
+      if self.puffer:
+         self.datei.write("".join(self.puffer))
+         self.puffer.clear()
+         self.pufferlaenge= 0
+      self.datei.flush()
+      self.letzte= self.uhr()
+      if sync is None:
+         sync= self.sync == SYNC_IMMER
+      if sync:
+         os.fsync(self.datei.fileno())
+#
+#  Schreiben, synchronisieren (außer bei "never") und schließen
+#
+   def close(self):
+      try:
+         self.flush(self.sync != SYNC_NIE)
+      finally:
+         self.datei.close()
+#
+#  Nach einem Schreibfehler: Puffer verwerfen und ohne weitere Fehler
+#  schließen
+#
+   def verwerfen(self):
+      self.puffer.clear()
+      self.pufferlaenge= 0
+      try:
+         self.datei.close()
+      except OSError:
+         pass
@@ -0,0 +1,270 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Laufzeitmetriken ----------------------------------------------------------
+#
+# cls_metriken sammelt die Dauer jedes Befehls an den ALC 7000 als
+# Histogramm, Fehler, Timeouts und Wiederholungen der seriellen
+# Schnittstelle, die Zahl der Messungen und die erreichte Messrate pro Kanal,
+# die verspäteten Abfragen pro Gerät sowie die aktuellen Werte jedes Kanals
+# (Spannung, Strom, Kapazität, Status). Die Werte werden von den I/O Threads
+# eingetragen.
+#
+# cls_metrikexport stellt die Metriken im Textformat von Prometheus unter
+# http://adresse:port/metrics bereit und/oder schreibt sie regelmäßig in eine
+# Datei (z.B. für den textfile collector des node_exporter). Kann der Port
+# nicht geöffnet werden, wird auf die Datei ausgewichen.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+#
+import bisect
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+#
+# Obergrenzen der Histogrammklassen für die Befehlsdauer in Sekunden
+#
+GRENZEN=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+#
+# Zeitraum für die Ermittlung der Messrate in Sekunden
+#
+RATE_INTERVALL=5.0
+#
+# Datei, wenn der Port nicht geöffnet werden kann und keine Datei eingestellt
+# ist, und Schreibintervall in Sekunden
+#
+DATEI_STANDARD="pyalc7t.prom"
+DATEI_INTERVALL=15.0
+
+CONTENT_TYPE="text/plain; version=0.0.4; charset=utf-8"
+
+class cls_histogramm(object):
+
+   def __init__(self,grenzen=GRENZEN):
+      self.grenzen= grenzen
+      self.anzahlen= [0]* (len(grenzen)+1)
+      self.summe= 0.0
+      self.anzahl= 0
+
+   def beobachten(self,wert):
+      self.anzahlen[bisect.bisect_left(self.grenzen,wert)]+=1
+      self.summe+= wert
+      self.anzahl+=1
+
+#
+# Label im Textformat, Werte mit \, " und Zeilenende maskiert
+#
+def labels(**werte):
+   return "{"+ ",".join('%s="%s"' % (k, str(v).replace("\\","\\\\").replace('"','\\"').replace("\n","\\n")) for k, v in werte.items())+ "}"
+
+class cls_metriken(object):
+
+   def __init__(self,uhr=time.monotonic):
+      self.uhr= uhr
+      self.lock= threading.Lock()
+      self.dauer= { }
+      self.fehler= { }
+      self.timeouts= { }
+      self.wiederholungen= { }
+      self.messungen= { }
+      self.raten= { }
+      self.rate_basis= { }
+      self.kanaele= { }
+      self.verspaetet= { }
+#
+#  Befehl an Gerät geraet ausgeführt: Dauer in Sekunden, Zahl der Timeouts
+#  und Wiederholungen während des Befehls, fehler True wenn er mit einem
+#  Fehler abgebrochen wurde
+#
+   def befehl(self,geraet,befehl,dauer,timeouts=0,wiederholungen=0,fehler=False):
+      with self.lock:
+         h= self.dauer.get((geraet,befehl))
+         if h is None:
+            h= self.dauer[(geraet,befehl)]= cls_histogramm()
+         h.beobachten(dauer)
+         if fehler:
+            self.fehler[(geraet,befehl)]= self.fehler.get((geraet,befehl),0)+1
+         if timeouts:
+            self.timeouts[geraet]= self.timeouts.get(geraet,0)+ timeouts
+         if wiederholungen:
+            self.wiederholungen[geraet]= self.wiederholungen.get(geraet,0)+ wiederholungen
+#
+#  Messung eines Kanals verarbeitet: zählen, Messrate ermitteln, aktuelle
+#  Werte übernehmen
+#
+   def messung(self,geraet,kanal,spannung,strom,geladen,entladen,kanalstatus,akkustatus,aufzeichnung):
+      schluessel= (geraet,kanal)
+      jetzt= self.uhr()
+      with self.lock:
+         n= self.messungen.get(schluessel,0)+1
+         self.messungen[schluessel]= n
+         basis= self.rate_basis.get(schluessel)
+         if basis is None:
+            self.rate_basis[schluessel]= (jetzt,n)
+         elif jetzt- basis[0] >= RATE_INTERVALL:
+            self.raten[schluessel]= (n- basis[1])/ (jetzt- basis[0])
+            self.rate_basis[schluessel]= (jetzt,n)
+         self.kanaele[schluessel]= (spannung,strom,geladen,entladen,kanalstatus,akkustatus,1 if aufzeichnung else 0)
+#
+#  Zahl der verspäteten Abfragen eines Geräts (cls_pollscheduler.verpasst)
+#
+   def abfragen(self,geraet,verpasst):
+      with self.lock:
+         self.verspaetet[geraet]= verpasst
+#
+#  Alle Metriken im Textformat von Prometheus
+#
+   def text(self):
+      z= [ ]
+      with self.lock:
+         z.append("# HELP pyalc7t_command_duration_seconds Round trip time of ALC 7000 commands")
+         z.append("# TYPE pyalc7t_command_duration_seconds histogram")
+         for (geraet,befehl), h in sorted(self.dauer.items()):
+            summe= 0
+            for grenze, anzahl in zip(h.grenzen,h.anzahlen):
+               summe+= anzahl
+               z.append("pyalc7t_command_duration_seconds_bucket%s %d" % (labels(device=geraet,command=befehl,le=repr(grenze)), summe))
+            z.append("pyalc7t_command_duration_seconds_bucket%s %d" % (labels(device=geraet,command=befehl,le="+Inf"), h.anzahl))
+            z.append("pyalc7t_command_duration_seconds_sum%s %r" % (labels(device=geraet,command=befehl), h.summe))
+            z.append("pyalc7t_command_duration_seconds_count%s %d" % (labels(device=geraet,command=befehl), h.anzahl))
+         self.__zaehler__(z,"pyalc7t_command_errors_total","Failed ALC 7000 commands",
+            [(labels(device=g,command=b), n) for (g,b), n in sorted(self.fehler.items())])
+         self.__zaehler__(z,"pyalc7t_serial_timeouts_total","Read timeouts on the serial line",
+            [(labels(device=g), n) for g, n in sorted(self.timeouts.items())])
+         self.__zaehler__(z,"pyalc7t_serial_retries_total","Resent commands and skipped bytes on the serial line",
+            [(labels(device=g), n) for g, n in sorted(self.wiederholungen.items())])
+         self.__zaehler__(z,"pyalc7t_samples_total","Processed channel measurements",
+            [(labels(device=g,channel=k), n) for (g,k), n in sorted(self.messungen.items())])
+         self.__zaehler__(z,"pyalc7t_polls_late_total","Channel polls started later than scheduled",
+            [(labels(device=g), n) for g, n in sorted(self.verspaetet.items())])
+         self.__messwert__(z,"pyalc7t_samples_per_second","Achieved measurement rate per channel",
+            [(labels(device=g,channel=k), r) for (g,k), r in sorted(self.raten.items())])
+         for i, (name, hilfe) in enumerate((
+               ("pyalc7t_channel_voltage_volts","Battery voltage"),
+               ("pyalc7t_channel_current_amperes","Charge or discharge current"),
+               ("pyalc7t_channel_charged_amperehours","Charged capacity of the current recording"),
+               ("pyalc7t_channel_discharged_amperehours","Discharged capacity of the current recording"),
+               ("pyalc7t_channel_status","Channel status (0 inactive, 1 active, 6 unknown)"),
+               ("pyalc7t_channel_battery_status","Battery status (0 none, 1 connected, 2 full, 3 empty)"),
+               ("pyalc7t_channel_recording","1 while the channel is recording"))):
+            self.__messwert__(z,name,hilfe,
+               [(labels(device=g,channel=k), w[i]) for (g,k), w in sorted(self.kanaele.items())])
+      return "\n".join(z)+ "\n"
+
+   def __zaehler__(self,z,name,hilfe,werte):
+      z.append("# HELP %s %s" % (name,hilfe))
+      z.append("# TYPE %s counter" % name)
+      for l, w in werte:
+         z.append("%s%s %d" % (name,l,w))
+
+   def __messwert__(self,z,name,hilfe,werte):
+      z.append("# HELP %s %s" % (name,hilfe))
+      z.append("# TYPE %s gauge" % name)
+      for l, w in werte:
+         z.append("%s%s %r" % (name,l,float(w)))
+
+#
+# HTTP Endpunkt ---------------------------------------------------------------
+#
+class cls_metrikhandler(BaseHTTPRequestHandler):
+
+   def do_GET(self):
+      if self.path.split("?")[0] not in ("/metrics", "/"):
+         self.send_error(404)
+         return
+      daten= self.server.metriken.text().encode("utf-8")
+      self.send_response(200)
+      self.send_header("Content-Type",CONTENT_TYPE)
+      self.send_header("Content-Length",str(len(daten)))
+      self.end_headers()
+      self.wfile.write(daten)
+
+   def log_message(self,format,*args):
+      pass
+
+#
+# Export über HTTP oder Datei ------------------------------------------------
+#
+class cls_metrikexport(object):
+#
+#  port: 0 kein HTTP Endpunkt, datei: "" keine Datei. Kann der Port nicht
+#  geöffnet werden, wird stattdessen die Datei geschrieben, meldung enthält
+#  dann einen Hinweis
+#
+   def __init__(self,metriken,port=0,adresse="127.0.0.1",datei="",intervall=DATEI_INTERVALL):
+      self.metriken= metriken
+      self.server= None
+      self.datei= datei
+      self.intervall= intervall
+      self.meldung= ""
+      self.ende= threading.Event()
+      self.threads= [ ]
+      if port:
+         try:
+            self.server= ThreadingHTTPServer((adresse,port),cls_metrikhandler)
+         except OSError as e:
+            if self.datei == "":
+               self.datei= DATEI_STANDARD
+            self.meldung= "Metriken: kann Port %d nicht öffnen (%s), schreibe %s" % (port, e.strerror, self.datei)
+         else:
+            self.server.daemon_threads= True
+            self.server.metriken= metriken
+            self.threads.append(threading.Thread(target=self.server.serve_forever,name="metriken-http",daemon=True))
+      if self.datei != "":
+         self.threads.append(threading.Thread(target=self.run,name="metriken-datei",daemon=True))
+      for t in self.threads:
+         t.start()
+#
+#  Datei zuerst unter einem temporären Namen schreiben, dann ersetzen
+#
+   def schreiben(self):
+      tmp= self.datei+ ".tmp"
+      try:
+         with open(tmp,"w") as f:
+            f.write(self.metriken.text())
+         os.replace(tmp,self.datei)
+      except OSError:
+         pass
+
+   def run(self):
+      while not self.ende.wait(self.intervall):
+         self.schreiben()
+#
+#  Endpunkt schließen, Datei ein letztes Mal schreiben
+#
+   def beenden(self):
+      if self.server is not None:
+         self.server.shutdown()
+         self.server.server_close()
+         self.server= None
+      self.ende.set()
+      for t in self.threads:
+         t.join()
+      self.threads= [ ]
+      if self.datei != "":
+         self.schreiben()
@@ -34,9 +34,32 @@
 # Layoutfehler beseitigt, Auffrischen Tabelle/Plot per Signal, Plotgröße konfigurierbar
 # 30.11.22 jsi
 # - PySide6 Migration
-#
-import os
+# 18.10.26 agent
+# - Dateinamen und Titel mit Gerätesuffix
+# - Zeit in der Tabelle auch bei Sekundenbruchteilen in ganzen Sekunden
+# - Messwerte aus cls_messwertspeicher statt aus Stringlisten
+# - Tabelle mit cls_MesswertModel, neue Messwerte werden nur angefügt
+# - GNUPLOT läuft dauerhaft in cls_GnuplotWorker, die Grafik kommt als PNG
+#   über stdout
+# - ohne GNUPLOT eigenes Diagramm (cls_PlotWidget) mit Zoom und Verschieben
+# - Auffrischen über cls_RefreshCoalescer höchstens einmal pro
+#   refreshinterval, nicht bei verdecktem oder minimiertem Fenster
+# - Logdatei wird mit cls_logreader inkrementell gelesen und verfolgt,
+#   solange der Kanal nicht aufzeichnet
+# - binäre Logdatei (.amb) wird mit cls_ambreader gelesen
+# - Logdatei wechselt mit jeder Aufzeichnung (Archivierung)
+# - Bilder von GNUPLOT über eine Marke dem Auftrag zuordnen, verspätete
+#   Bilder verwerfen, Fehlermeldungen von GNUPLOT anzeigen. threading.Event
+#   des Workers heißt wecker, damit QThread.event nicht überdeckt wird
+# - GNUPLOT erhält die Min/Max Reduktion auf die Plotbreite statt aller
+#   Messwerte, Kurven mit Linien statt smooth csplines
+# - Messwerte einer fortgesetzten Aufzeichnung beim Kanal anfordern
+#
+import io
+import queue
 import subprocess
+import threading
+import time
 import datetime
 
 from .alccore import *
@@ -45,20 +68,342 @@ if QTBINDINGS=="PySide6":
 if QTBINDINGS=="PyQt5":
    from PyQt5 import QtCore,  QtWidgets
 from .alcconfig import ALCCONFIG
+from .alcstore import cls_messwertspeicher, cls_minmaxreduktion
+from .alcamb import logreader
+from .alcplotwidget import cls_PlotWidget
+
+
+#
+# Table Modell für die Messwerttabelle, liest direkt aus dem Messwertspeicher.
+# Die Zellen werden erst in data() formatiert.
+#
+class cls_MesswertModel(QtCore.QAbstractTableModel):
+
+   def __init__(self,font,parent=None):
+      super().__init__(parent)
+      self.font= font
+      self.messwerte= cls_messwertspeicher()
+      self.zeilen=0
+      self.titel= ("Zeit", "Spannung", "Strom")
+
+   def rowCount(self,parent=QtCore.QModelIndex()):
+      if parent.isValid():
+         return 0
+      return self.zeilen
+
+   def columnCount(self,parent=QtCore.QModelIndex()):
+      if parent.isValid():
+         return 0
+      return 3
 
+   def data(self,index,role=QtCore.Qt.DisplayRole):
+      if not index.isValid():
+         return None
+      if role == QtCore.Qt.DisplayRole:
+         zeit, spannung, strom, richtung= self.messwerte[index.row()]
+         col= index.column()
+         if col == 0:
+            return str(datetime.timedelta(seconds=int(zeit)))
+         if col == 1:
+            return "%6.3f" % spannung
+         return "%5.3f" % strom
+      if role == QtCore.Qt.FontRole:
+         return self.font
+      if role == QtCore.Qt.TextAlignmentRole:
+         return int(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
+      return None
 
+   def headerData(self,section,orientation,role=QtCore.Qt.DisplayRole):
+      if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+         return self.titel[section]
+      return None
+#
+#  Messwertspeicher anzeigen. Bei einem anderen Speicher wird das Modell
+#  neu aufgebaut, sonst werden nur die neuen Zeilen eingefügt
+#
+   def set_messwerte(self,messwerte):
+      if messwerte is not self.messwerte:
+         self.beginResetModel()
+         self.messwerte= messwerte
+         self.zeilen= len(messwerte)
+         self.endResetModel()
+         return
+      anzahl= len(messwerte)
+      if anzahl > self.zeilen:
+         self.beginInsertRows(QtCore.QModelIndex(),self.zeilen,anzahl-1)
+         self.zeilen= anzahl
+         self.endInsertRows()
+
+#
+# GNUPLOT Prozess für ein Plotfenster ----------------------------------------
+#
+# Der Thread startet GNUPLOT einmal und hält die Messwerte in den Datenblöcken
+# $U (Spannung) und $I (Strom). Die Messwerte werden mit einer Min/Max
+# Reduktion (alcstore.cls_minmaxreduktion) auf die Plotbreite reduziert, bei
+# neuen Messwerten werden die Datenblöcke aus der Reduktion neu aufgebaut.
+# Der Aufwand hängt damit von der Plotbreite ab und nicht von der Dauer der
+# Aufzeichnung. Die Grafik schreibt GNUPLOT als PNG nach stdout,
+# ein eigener Lesethread zerlegt den Datenstrom in einzelne Bilder. Aufträge,
+# die während einer Ausgabe eintreffen, werden zu einem zusammengefasst.
+# Nach jedem Bild gibt GNUPLOT mit print eine Marke mit der Nummer des
+# Auftrags auf stdout aus. Bilder früherer Aufträge, die erst nach Ablauf
+# der Wartezeit eintreffen, werden damit verworfen. Fehlermeldungen von
+# GNUPLOT auf stderr werden gesammelt und nach dem Auftrag gemeldet.
 #
-# Table modell für Messwerttabelle
+PNG_SIGNATUR=b'\x89PNG\r\n\x1a\n'
+MARKE=b'pyalc7t-bild'
 #
-class TableModel(QtGui.QStandardItemModel):
-    _sort_order = QtCore.Qt.AscendingOrder
+# maximale Wartezeit auf ein Bild in Sekunden
+#
+TIMEOUT_BILD=10
+
+class cls_GnuplotWorker(QtCore.QThread):
 
-    def sortOrder(self):
-        return self._sort_order
+   if QTBINDINGS=="PySide6":
+      sig_bild= QtCore.Signal(object)
+      sig_fehler= QtCore.Signal(str)
+   if QTBINDINGS=="PyQt5":
+      sig_bild= QtCore.pyqtSignal(object)
+      sig_fehler= QtCore.pyqtSignal(str)
+
+   def __init__(self,gnuplot,plotsize):
+      super().__init__()
+      self.gnuplot= gnuplot
+      self.plotsize= plotsize
+      self.proc= None
+      self.stdin= None
+      self.running= True
+      self.lock= threading.Lock()
+      self.wecker= threading.Event()
+      self.auftrag= None
+      self.bilder= queue.Queue()
+      self.reduktion= cls_minmaxreduktion(plotsize)
+      self.nummer= 0
+      self.gestartet= False
+      self.fehler= [ ]
+      self.letzter_fehler= ""
+#
+#  Plot der Messwerte anfordern, wird vom GUI Thread aufgerufen
+#
+   def plot(self,messwerte):
+      with self.lock:
+         self.auftrag= messwerte
+      self.wecker.set()
+#
+#  Thread beenden
+#
+   def finish(self):
+      self.running= False
+      self.wecker.set()
+      self.wait()
+#
+#  Thread Ausführung
+#
+   def run(self):
+      try:
+         self.proc= subprocess.Popen([self.gnuplot],stdin=subprocess.PIPE,stdout=subprocess.PIPE,stderr=subprocess.PIPE)
+         self.gestartet= True
+         self.stdin= io.TextIOWrapper(self.proc.stdin,encoding="utf-8")
+         leser= threading.Thread(target=self.lesen,daemon=True)
+         leser.start()
+         threading.Thread(target=self.fehlerausgabe,daemon=True).start()
+         self.stdin.write("set term png size %d,%d\n" % (self.plotsize,self.plotsize))
+         self.stdin.write("set output\n")
+         self.stdin.write("set print \"-\"\n")
+         self.stdin.write("set xtics font \"Arial,8\"\n")
+         self.stdin.write("set ytics font \"Arial,8\"\n")
+         self.stdin.flush()
+         while True:
+            self.wecker.wait()
+            self.wecker.clear()
+            if not self.running:
+               break
+            with self.lock:
+               messwerte= self.auftrag
+               self.auftrag= None
+            if messwerte is None:
+               continue
+            self.nummer+=1
+            self.senden(messwerte)
+            self.zeichnen()
+            bild= self.warten(self.nummer)
+            if bild is not None:
+               self.sig_bild.emit(bild)
+            self.fehler_melden()
+      except EnvironmentError as e:
+         if self.gestartet:
+            self.sig_fehler.emit("GNUPLOT Fehler: "+e.strerror)
+         else:
+            self.sig_fehler.emit("GNUPLOT kann nicht gestartet werden. "+e.strerror)
+      self.beenden()
+#
+#  Auf die Marke des Auftrags nummer warten und dessen Bild zurückgeben,
+#  Ergebnisse früherer Aufträge verwerfen. None bei Timeout oder wenn
+#  GNUPLOT kein Bild erzeugt hat
+#
+   def warten(self,nummer):
+      ende= time.monotonic()+ TIMEOUT_BILD
+      while True:
+         rest= ende- time.monotonic()
+         if rest <= 0:
+            return None
+         try:
+            n, bild= self.bilder.get(timeout=rest)
+         except queue.Empty:
+            return None
+         if n == nummer:
+            return bild
+#
+#  Gesammelte Fehlermeldungen von GNUPLOT melden, die gleiche Meldung nur
+#  einmal hintereinander
+#
+   def fehler_melden(self):
+      with self.lock:
+         text= "\n".join(self.fehler)
+         self.fehler= [ ]
+      if text != "" and text != self.letzter_fehler:
+         self.sig_fehler.emit("GNUPLOT Fehler:\n"+text)
+      self.letzter_fehler= text
+#
+#  Reduktion mit den neuen Messwerten aktualisieren und die Datenblöcke
+#  daraus neu anlegen
+#
+   def senden(self,messwerte):
+      if not self.reduktion.update(messwerte):
+         return
+      w= self.stdin
+      for j, block in enumerate(("$U","$I")):
+         w.write("%s << EOD\n" % block)
+         for zeit, wert in self.reduktion.punkte(j):
+            w.write("%.3f %.3f\n" % (zeit, wert))
+         w.write("EOD\n")
+#
+#  Grafik ausgeben
+#
+   def zeichnen(self):
+      w= self.stdin
+      w.write("set size 1.0,0.5\n")
+      w.write("set origin 0,0.5\n")
+      w.write("set multiplot\n")
+      w.write("plot $U using 1:2 title \"Spannung V\" with lines\n")
+      w.write("set origin 0.0,0.0\n")
+      w.write("set size 1.0,0.5\n")
+      w.write("plot $I using 1:2 title \"Strom A\" with lines linecolor \"green\"\n")
+      w.write("unset multiplot\n")
+      w.write("print \"%s %d\"\n" % (MARKE.decode(),self.nummer))
+      w.flush()
+#
+#  Lesethread: PNG Bilder und Marken aus stdout von GNUPLOT lesen. Ein Bild
+#  besteht aus der Signatur und Chunks (Länge, Typ, Daten, CRC) bis zum
+#  Chunk IEND, eine Marke ist eine Zeile mit MARKE und der Nummer des
+#  Auftrags. Zu jeder Marke wird (nummer, bild) übergeben, bild ist None,
+#  wenn seit der letzten Marke kein Bild kam
+#
+   def lesen(self):
+      out= self.proc.stdout
+      bild= None
+      while True:
+         c= out.read(1)
+         if not c:
+            return
+         if c == PNG_SIGNATUR[0:1]:
+            kopf= c+ out.read(len(PNG_SIGNATUR)-1)
+            if kopf != PNG_SIGNATUR:
+               continue
+            bild= bytearray(kopf)
+            while True:
+               chunk= out.read(8)
+               if len(chunk) < 8:
+                  return
+               laenge= int.from_bytes(chunk[0:4],"big")
+               bild+= chunk
+               bild+= out.read(laenge+4)
+               if chunk[4:8] == b'IEND':
+                  break
+            continue
+         if c != MARKE[0:1]:
+            continue
+         worte= (c+ out.readline()).split()
+         if len(worte) == 2 and worte[0] == MARKE and worte[1].isdigit():
+            self.bilder.put((int(worte[1]), None if bild is None else bytes(bild)))
+            bild= None
+#
+#  Lesethread: Fehlermeldungen von GNUPLOT aus stderr sammeln
+#
+   def fehlerausgabe(self):
+      for zeile in io.TextIOWrapper(self.proc.stderr,encoding="utf-8",errors="replace"):
+         zeile= zeile.rstrip()
+         if zeile != "":
+            with self.lock:
+               self.fehler.append(zeile)
+#
+#  GNUPLOT beenden
+#
+   def beenden(self):
+      if self.proc is None:
+         return
+      try:
+         self.stdin.write("quit\n")
+         self.stdin.close()
+      except EnvironmentError:
+         pass
+      try:
+         self.proc.wait(timeout=5)
+      except subprocess.TimeoutExpired:
+         self.proc.kill()
+         self.proc.wait()
+      self.proc= None
+
+#
+# Auffrischen eines Fensters zusammenfassen ----------------------------------
+#
+# Der Kanal meldet jeden neuen Messwert mit sig_refresh. Die Meldungen werden
+# nur vorgemerkt, die Funktion wird höchstens einmal pro Intervall (Sekunden)
+# aufgerufen. Solange das Fenster nicht sichtbar oder minimiert ist, wird
+# nichts aufgefrischt, eine vorgemerkte Meldung wird beim Anzeigen des
+# Fensters nachgeholt (sichtbar_geworden). Der Aufwand hängt damit von der
+# Anzeigerate ab und nicht von der Messrate.
+#
+class cls_RefreshCoalescer(QtCore.QObject):
+
+   def __init__(self,fenster,funktion,intervall):
+      super().__init__(fenster)
+      self.fenster= fenster
+      self.funktion= funktion
+      self.intervall= max(intervall,0)
+      self.offen= False
+      self.letzte= None
+      self.timer= QtCore.QTimer(self)
+      self.timer.setSingleShot(True)
+      self.timer.timeout.connect(self.ausfuehren)
+#
+#  Auffrischen anfordern, der Timer läuft bis zum Ende des Intervalls seit
+#  dem letzten Auffrischen
+#
+   def anfordern(self):
+      self.offen= True
+      if self.timer.isActive() or not self.sichtbar():
+         return
+      warten= 0
+      if self.letzte is not None:
+         warten= self.intervall- (time.monotonic()- self.letzte)
+      self.timer.start(max(int(warten* 1000),0))
+
+   def sichtbar(self):
+      return self.fenster.isVisible() and not self.fenster.isMinimized()
+#
+#  Fenster wurde angezeigt oder wiederhergestellt
+#
+   def sichtbar_geworden(self):
+      if self.offen:
+         self.anfordern()
 
-    def sort(self, column, order):
-         self._sort_order = order
-         super().sort(column, order)
+   def ausfuehren(self):
+      if not self.offen or not self.sichtbar():
+         return
+      self.offen= False
+      self.letzte= time.monotonic()
+      self.funktion()
 
 #
 # Messwert-/Plotfenster
@@ -95,19 +440,11 @@ class cls_PlotDialog(QtWidgets.QDialog):
       self.table = QtWidgets.QTableView(self)
       self.table.setSortingEnabled(False)
       self.table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
-      self.rows=0
-      self.columns=3
       self.table.setFocusPolicy(QtCore.Qt.NoFocus)
       self.table.setShowGrid(False)
-      self.model=TableModel(self.rows, self.columns, self.table)
-#
-#     Header beschriften
-#
-      self.model.setHeaderData(0,QtCore.Qt.Horizontal,"Zeit")
-      self.model.setHeaderData(1,QtCore.Qt.Horizontal,"Spannung")
-      self.model.setHeaderData(2,QtCore.Qt.Horizontal,"Strom")
-      self.table.setModel(self.model)
       self.dataFont= QtGui.QFont()
+      self.model=cls_MesswertModel(self.dataFont,self.table)
+      self.table.setModel(self.model)
       metrics= QtGui.QFontMetrics(self.dataFont)
       item_width= metrics.boundingRect(" 00:00:0000 ").width()
       self.table.horizontalHeader().setDefaultSectionSize(item_width+2)
@@ -126,12 +463,22 @@ class cls_PlotDialog(QtWidgets.QDialog):
 
       self.hlayout.addWidget(self.table)
 #
-#     Plot window
+#     Plot window: GNUPLOT, falls konfiguriert, sonst eigenes Diagramm
 #
-      if self.gnuplot != "":
+      self.plotworker= None
+      self.plotwidget= None
+      if self.gnuplot == "":
+         self.plotwidget= cls_PlotWidget(self.plotsize,self)
+         self.hlayout.addWidget(self.plotwidget)
+      else:
          self.lblPlot = QtWidgets.QLabel(self)
          self.lblPlot.setFixedWidth(self.plotsize)
          self.hlayout.addWidget(self.lblPlot)
+         self.plotworker= cls_GnuplotWorker(self.gnuplot,self.plotsize)
+         self.plotworker.sig_bild.connect(self.show_plot,QtCore.Qt.QueuedConnection)
+         self.plotworker.sig_fehler.connect(self.plot_fehler,QtCore.Qt.QueuedConnection)
+         QtWidgets.QApplication.instance().aboutToQuit.connect(self.plotworker.finish)
+         self.plotworker.start()
       self.vlayout.addLayout(self.hlayout)
 
       self.hlayout2=QtWidgets.QHBoxLayout()
@@ -149,41 +496,65 @@ class cls_PlotDialog(QtWidgets.QDialog):
 # 
       self.kanal=kanal
       self.kanalnr=kanal.kanalnummer
-      self.setWindowTitle("Messwerte Kanal "+str(self.kanalnr))
-      self.label_Titel.setText("Messwerte für Kanal "+str(self.kanalnr))
+      self.kanalname= "Kanal "+str(self.kanalnr)
+      if kanal.alc7t.suffix != "":
+         self.kanalname= kanal.alc7t.name+" "+self.kanalname
+      self.setWindowTitle("Messwerte "+self.kanalname)
+      self.label_Titel.setText("Messwerte für "+self.kanalname)
       self.starttime=0
       self.anzmess=0
-      self.rowcount=0
-      self.fromfile= False
+#
+#     Meldungen des Kanals zusammenfassen
+#
+      self.coalescer= cls_RefreshCoalescer(self,self.refresh,ALCCONFIG.get("pyalc7t","refreshinterval"))
       self.sig_refresh= kanal.sig_refresh
-      self.sig_refresh.connect(self.refresh,QtCore.Qt.QueuedConnection)
+      self.sig_refresh.connect(self.coalescer.anfordern,QtCore.Qt.QueuedConnection)
+#
+#     Messwertdatei: Logdatei des Kanals. Zeichnet der Kanal nicht auf, wird
+#     sie im Abstand von refreshinterval auf neue Zeilen geprüft
+#
+      self.messwertdatei=kanal.logfilename
+      self.logreader= logreader(self.messwertdatei)
+      self.dateitimer= QtCore.QTimer(self)
+      self.dateitimer.setInterval(max(int(self.coalescer.intervall* 1000),100))
+      self.dateitimer.timeout.connect(self.datei_pruefen)
+
 #
-#     Messwertdatei: Logdatei des Kanals, plotdatei: von GNUPLOT erzeugte Grafik
+#  Vorgemerktes Auffrischen beim Anzeigen oder Wiederherstellen nachholen
 #
-      self.messwertdatei="0_kanal%d.amw" % self.kanalnr
-      self.plotdatei="0_kanal%d.png" % self.kanalnr
+   def showEvent(self,event):
+      super().showEvent(event)
+      self.dateitimer.start()
+      self.coalescer.sichtbar_geworden()
 
+   def hideEvent(self,event):
+      super().hideEvent(event)
+      self.dateitimer.stop()
 #
-#  Signal Routine: Messwerte anzeigen, Plot erstellen
+#  Timer Routine: Logdatei auf neue Zeilen prüfen lassen
+#
+   def datei_pruefen(self):
+      if not self.kanal.Aufz:
+         self.coalescer.anfordern()
+
+   def changeEvent(self,event):
+      super().changeEvent(event)
+      if event.type() == QtCore.QEvent.WindowStateChange:
+         self.coalescer.sichtbar_geworden()
+#
+#  Messwerte anzeigen, Plot erstellen, wird über den Coalescer aufgerufen
 #
    def refresh(self):
       if not self.isVisible():
          return
-      entries=[ ]
       try:
 #
-#        alte Plotdatei löschen
-#
-         if os.path.isfile(self.plotdatei):
-            os.remove(self.plotdatei)
-#
 #        wir lesen die Messwerte entweder aus der laufenden Aufzeichnung ...
 #
          if self.kanal.Aufz :
-            if self.fromfile:
-               self.fromfile= False
-            entries= self.kanal.messwerte
-            l=len(entries)
+            self.kanal.messwerte_anfordern()
+            messwerte= self.kanal.messwerte
+            l=len(messwerte)
             t=self.kanal.TStart
             if t == self.starttime and l == self.anzmess:
                return
@@ -191,90 +562,55 @@ class cls_PlotDialog(QtWidgets.QDialog):
             self.anzmess=l
          else:
 #
-#        oder aus der Logdatei
+#        oder aus der Logdatei, dabei nur neue Zeilen lesen
 #
-            if self.fromfile:
-               return
-            self.fromfile= True
-            entries=[ ]
-            if not os.path.isfile(self.messwertdatei):
+            self.starttime=0
+            self.anzmess=0
+            if self.logreader.dateiname != self.kanal.logfilename:
+               self.messwertdatei= self.kanal.logfilename
+               self.logreader= logreader(self.messwertdatei)
+            if not self.logreader.lesen() and self.model.messwerte is self.logreader.messwerte:
                return
-            f= open(self.messwertdatei,"r")
-            for line in f:
-               values=line.split(None)
-               if values[0] == "#" :
-                  continue
-               entries.append(values)
-            f.close()
+            messwerte= self.logreader.messwerte
       except EnvironmentError as e:
          reply=QtWidgets.QMessageBox.critical(self,'Fehler',"Zugriff auf Messwertdatei fehlgeschlagen. "+e.strerror,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
          self.do_exit()
+         return
 #
-#     Tabelle leeren, wenn befüllt
-#
-      if self.rowcount > 0:
-         self.model.removeRows(0,self.rowcount)
-         self.rowcount=0
-#
-#     Tabelle befüllen
+#     Tabelle aktualisieren
 #
-      for i, row in enumerate(entries):
-         for j, col in enumerate(row):
-            if j == 0 :
-               item=QtGui.QStandardItem(str(datetime.timedelta(seconds=int(col))))
-            else:
-               item=QtGui.QStandardItem(col)
-            item.setFont(self.dataFont)
-            item.setTextAlignment(QtCore.Qt.AlignLeft)
-            self.model.setItem(i,j,item)
-         self.rowcount+=1
+      anzahl= len(messwerte)
+      self.model.set_messwerte(messwerte)
 
-      self.label_Titel.setText("%d Messwerte für Kanal %d" % (len(entries),self.kanalnr))
+      self.label_Titel.setText("%d Messwerte für %s" % (anzahl,self.kanalname))
 
-      if self.gnuplot == "":
+      if self.plotwidget is not None:
+         self.plotwidget.set_messwerte(messwerte)
          return
-      if len(entries) < 4 :
+      if anzahl < 4 :
          self.lblPlot.setText("Plot wird ab 4 Messwerten angezeigt")
          return
 #
-#     Grafikdatei mit GNUPLOT erzeugen 
+#     Grafik im GNUPLOT Thread erzeugen
 #
-      try:
-         proc = subprocess.Popen([self.gnuplot],
-                        shell=True,
-                        universal_newlines=True,
-                        stdin=subprocess.PIPE,
-                        )
-         proc.stdin.write("set term png size %d,%d\n" % (self.plotsize,self.plotsize))
-         proc.stdin.write("set output \"%s\"\n" %self.plotdatei)
-         proc.stdin.write("set size 1.0,0.5\n")
-         proc.stdin.write("set origin 0,0.5\n")
-         proc.stdin.write("set xtics font \"Arial,8\"\n")
-         proc.stdin.write("set ytics font \"Arial,8\"\n")
-         proc.stdin.write("set multiplot\n")
-         proc.stdin.write("plot \"-\" using 1:2 title \"Spannung V\" smooth csplines\n")
-         for i, row in enumerate (entries):
-            proc.stdin.write("%s %s\n" % (row[0], row[1]))
-         proc.stdin.write("e\n")
-         proc.stdin.write("set origin 0.0,0.0\n")
-         proc.stdin.write("set size 1.0,0.5\n")
-         proc.stdin.write("plot \"-\" using 1:2 title \"Strom A\" smooth csplines linecolor \"green\"\n")
-         for i, row in enumerate (entries):
-            proc.stdin.write("%s %s\n" % (row[0], row[2]))
-         proc.stdin.write("e\n")
-         proc.stdin.write("unset multiplot\n")
-         proc.stdin.write("quit\n")
-         proc.communicate()[0]
-         proc.stdin.close()
-
-         pixmap = QtGui.QPixmap(self.plotdatei)
-         self.lblPlot.setPixmap(pixmap)
-         self.adjustSize()
-      except EnvironmentError as e:
-         reply=QtWidgets.QMessageBox.critical(self,'Fehler',"Zugriff auf Messwertdatei fehlgeschlagen. "+e.strerror,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+      self.plotworker.plot(messwerte)
+#
+#  Signal Routine: Grafik von GNUPLOT anzeigen
+#
+   def show_plot(self,bild):
+      pixmap = QtGui.QPixmap()
+      pixmap.loadFromData(bild,"PNG")
+      self.lblPlot.setPixmap(pixmap)
+      self.adjustSize()
+#
+#  Signal Routine: Fehler von GNUPLOT, das Fenster wird geschlossen, wenn
+#  GNUPLOT nicht gestartet werden konnte
+#
+   def plot_fehler(self,meldung):
+      reply=QtWidgets.QMessageBox.critical(self,'Fehler',meldung,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+      if not self.plotworker.gestartet:
          self.do_exit()
 
-
 #
 #  Action Script: Fenster schließen ---
 #
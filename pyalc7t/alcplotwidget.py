@@ -0,0 +1,329 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Diagramm für Spannung und Strom ohne GNUPLOT --------------------------------
+#
+# Das Widget zeichnet aus dem Messwertspeicher. Die Messwerte werden vorher
+# mit einer Min/Max Reduktion (alcstore.cls_minmaxreduktion) auf wenige Punkte
+# pro Pixel der Diagrammbreite reduziert, bei neuen Messwerten wird die
+# Reduktion nur fortgeschrieben. Spitzen bleiben dabei erhalten. Die Kurven
+# werden als QPolygonF in Messwertkoordinaten gehalten, die Umrechnung in
+# Pixel macht QPainter mit einer Transformation. Eine vergrößerte Ansicht
+# wird aus dem sichtbaren Ausschnitt reduziert, bei wenigen Messwerten im
+# Ausschnitt werden diese unverändert gezeichnet.
+#
+# Bedienung: Mausrad zoomt die Zeitachse um den Mauszeiger, Ziehen mit der
+# linken Maustaste verschiebt sie, Doppelklick zeigt wieder alle Messwerte.
+# In der Gesamtansicht wächst die Zeitachse mit der Aufzeichnung mit.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+# - Kurven mit Min/Max Reduktion auf die Diagrammbreite
+#
+import bisect
+import datetime
+
+from .alccore import *
+if QTBINDINGS=="PySide6":
+   from PySide6 import QtCore, QtGui, QtWidgets
+if QTBINDINGS=="PyQt5":
+   from PyQt5 import QtCore, QtGui, QtWidgets
+from .alcstore import cls_messwertspeicher, cls_minmaxreduktion, SP_SPANNUNG, SP_STROM
+
+#
+# Zoomfaktor pro Schritt des Mausrads
+#
+ZOOM_SCHRITT=1.25
+#
+# Ränder der Diagramme in Pixel: links, oben, rechts, unten
+#
+RAND=(48, 18, 10, 20)
+#
+# Bis zu dieser Zahl von Messwerten pro Pixel wird ein vergrößerter
+# Ausschnitt ohne Reduktion gezeichnet
+#
+PUNKTE_PRO_PIXEL=4
+
+#
+# Eine Kurve (Spannung oder Strom) ------------------------------------------
+#
+class cls_Kurve(object):
+
+   def __init__(self,spalte,titel,farbe):
+      self.spalte= spalte
+      self.titel= titel
+      self.farbe= QtGui.QColor(farbe)
+      self.reset()
+
+   def reset(self):
+      self.polygon= QtGui.QPolygonF()
+      self.ymin= None
+      self.ymax= None
+#
+#  Kurve aus einer Liste von (zeit, wert) neu aufbauen
+#
+   def setze_punkte(self,punkte):
+      self.polygon= QtGui.QPolygonF([QtCore.QPointF(t,v) for t, v in punkte])
+      if punkte:
+         self.ymin= min(v for t, v in punkte)
+         self.ymax= max(v for t, v in punkte)
+      else:
+         self.ymin= None
+         self.ymax= None
+
+#
+# Plot Widget ----------------------------------------------------------------
+#
+class cls_PlotWidget(QtWidgets.QWidget):
+
+   def __init__(self,plotsize,parent=None):
+      super().__init__(parent)
+      self.setFixedSize(plotsize,plotsize)
+      self.setMouseTracking(False)
+      self.messwerte= cls_messwertspeicher()
+      self.anzahl= 0
+      self.zeit= self.messwerte.zeit()
+      self.kurven= ( cls_Kurve(SP_SPANNUNG,"Spannung V","#9400d3"), cls_Kurve(SP_STROM,"Strom A","#009e73") )
+#
+#     Reduktion der Gesamtansicht, Breite in Pixel der Diagramme
+#
+      self.reduktion= cls_minmaxreduktion(self.diagrammbreite(),tuple(k.spalte for k in self.kurven))
+#
+#     Kurven des vergrößerten Ausschnitts, gültig für (xbereich, anzahl)
+#
+      self.ausschnitt= None
+      self.ausschnitt_kurven= tuple(cls_Kurve(k.spalte,k.titel,k.farbe) for k in self.kurven)
+#
+#     Sichtbarer Zeitbereich, None: alle Messwerte
+#
+      self.xbereich= None
+      self.zieh_x= None
+      self.zieh_bereich= None
+#
+#  Messwerte anzeigen, bei einem anderen Speicher neu aufbauen, sonst nur die
+#  neuen Messwerte in die Reduktion übernehmen
+#
+   def set_messwerte(self,messwerte):
+      if messwerte is not self.messwerte:
+         self.messwerte= messwerte
+         self.xbereich= None
+         for k in self.kurven:
+            k.reset()
+      if self.reduktion.update(messwerte):
+         for j, k in enumerate(self.kurven):
+            k.setze_punkte(self.reduktion.punkte(j))
+      self.anzahl= self.reduktion.verarbeitet
+      self.zeit= messwerte.zeit()[:self.anzahl]
+      self.update()
+#
+#  Breite der Diagramme in Pixel
+#
+   def diagrammbreite(self):
+      links, oben, rechts, unten= RAND
+      return max(self.width()- links- rechts,1)
+#
+#  Gesamter und sichtbarer Zeitbereich
+#
+   def gesamtbereich(self):
+      if self.anzahl == 0:
+         return (0.0, 1.0)
+      x1= self.zeit[self.anzahl-1]
+      if x1 <= self.zeit[0]:
+         x1= self.zeit[0]+ 1.0
+      return (self.zeit[0], x1)
+
+   def sichtbar(self):
+      if self.xbereich is None:
+         return self.gesamtbereich()
+      return self.xbereich
+#
+#  Rechteck der Diagramme im Widget
+#
+   def diagramme(self):
+      links, oben, rechts, unten= RAND
+      h= self.height() // len(self.kurven)
+      return [QtCore.QRectF(links, i*h+ oben, self.width()- links- rechts, h- oben- unten) for i in range(len(self.kurven))]
+#
+#  Kurven im sichtbaren Zeitbereich: in der Gesamtansicht die fortgeschriebene
+#  Reduktion, sonst die Messwerte des Ausschnitts, reduziert wenn es mehr als
+#  PUNKTE_PRO_PIXEL pro Pixel sind
+#
+   def sichtbare_kurven(self):
+      if self.xbereich is None:
+         return self.kurven
+      if self.ausschnitt == (self.xbereich, self.anzahl):
+         return self.ausschnitt_kurven
+      x0, x1= self.xbereich
+      i0= max(bisect.bisect_left(self.zeit,x0)-1,0)
+      i1= min(bisect.bisect_right(self.zeit,x1)+1,self.anzahl)
+      breite= self.diagrammbreite()
+      if i1- i0 > PUNKTE_PRO_PIXEL* breite:
+         r= cls_minmaxreduktion.ausschnitt(self.messwerte,i0,i1,breite,self.reduktion.spalten)
+         for j, k in enumerate(self.ausschnitt_kurven):
+            k.setze_punkte(r.punkte(j))
+      else:
+         zeit= self.zeit[i0:i1]
+         for k in self.ausschnitt_kurven:
+            k.setze_punkte(list(zip(zeit,self.messwerte.view(k.spalte)[i0:i1])))
+      self.ausschnitt= (self.xbereich, self.anzahl)
+      return self.ausschnitt_kurven
+#
+#  Wertebereich einer Kurve mit etwas Rand
+#
+   def wertebereich(self,kurve):
+      ymin, ymax= kurve.ymin, kurve.ymax
+      if ymin is None:
+         return (0.0, 1.0)
+      rand= (ymax- ymin)* 0.05
+      if rand == 0:
+         rand= 0.05
+      return (ymin- rand, ymax+ rand)
+#
+#  Achsenbeschriftung: ungefähr anzahl runde Teilstriche im Bereich a..b
+#
+   def teilung(self,a,b,anzahl):
+      schritt= (b- a)/ anzahl
+      basis= 10 ** int(("%e" % schritt).split("e")[1])
+      for f in (1, 2, 5, 10):
+         if basis* f >= schritt:
+            schritt= basis* f
+            break
+      t= (a // schritt + 1) * schritt
+      werte= [ ]
+      while t < b:
+         werte.append(t)
+         t+= schritt
+      return werte
+
+   def zeittext(self,t):
+      return str(datetime.timedelta(seconds=int(t)))
+#
+#  Zeichnen
+#
+   def paintEvent(self,event):
+      p= QtGui.QPainter(self)
+      p.fillRect(self.rect(),QtCore.Qt.white)
+      x0, x1= self.sichtbar()
+      fm= p.fontMetrics()
+      for kurve, r in zip(self.sichtbare_kurven(),self.diagramme()):
+         y0, y1= self.wertebereich(kurve)
+#
+#        Rahmen, Titel und Achsen
+#
+         p.setPen(QtCore.Qt.black)
+         p.drawRect(r)
+         p.setPen(kurve.farbe)
+         p.drawText(QtCore.QPointF(r.right()- fm.horizontalAdvance(kurve.titel)- 4, r.top()+ fm.ascent()+ 2),kurve.titel)
+         p.setPen(QtCore.Qt.gray)
+         for y in self.teilung(y0,y1,4):
+            py= r.bottom()- (y- y0)/ (y1- y0)* r.height()
+            p.drawLine(QtCore.QPointF(r.left()- 3,py),QtCore.QPointF(r.left(),py))
+            p.drawText(QtCore.QRectF(0,py- fm.height()/2,r.left()- 5,fm.height()),int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter),"%.3g" % y)
+         for x in self.teilung(x0,x1,3):
+            px= r.left()+ (x- x0)/ (x1- x0)* r.width()
+            p.drawLine(QtCore.QPointF(px,r.bottom()),QtCore.QPointF(px,r.bottom()+ 3))
+            p.drawText(QtCore.QPointF(px- fm.horizontalAdvance(self.zeittext(x))/2,r.bottom()+ fm.ascent()+ 3),self.zeittext(x))
+         if self.anzahl < 2:
+            continue
+#
+#        Kurve mit Transformation Messwert -> Pixel zeichnen
+#
+         sx= r.width()/ (x1- x0)
+         sy= -r.height()/ (y1- y0)
+         p.save()
+         p.setClipRect(r)
+         p.setTransform(QtGui.QTransform(sx,0,0,sy,r.left()- x0* sx,r.bottom()- y0* sy))
+         pen= QtGui.QPen(kurve.farbe)
+         pen.setCosmetic(True)
+         p.setPen(pen)
+         p.drawPolyline(kurve.polygon)
+         p.restore()
+      if self.anzahl == 0:
+         p.setPen(QtCore.Qt.black)
+         p.drawText(self.rect(),int(QtCore.Qt.AlignCenter),"Keine Messwerte")
+      p.end()
+#
+#  Zeit an der Pixelposition x
+#
+   def zeit_bei(self,px):
+      r= self.diagramme()[0]
+      x0, x1= self.sichtbar()
+      return x0+ (px- r.left())/ r.width()* (x1- x0)
+#
+#  Zoom mit dem Mausrad um den Mauszeiger
+#
+   def wheelEvent(self,event):
+      if self.anzahl < 2:
+         return
+      x0, x1= self.sichtbar()
+      if QTBINDINGS=="PySide6":
+         mitte= self.zeit_bei(event.position().x())
+      else:
+         mitte= self.zeit_bei(event.pos().x())
+      if event.angleDelta().y() > 0:
+         faktor= 1/ ZOOM_SCHRITT
+      else:
+         faktor= ZOOM_SCHRITT
+      self.setze_bereich(mitte- (mitte- x0)* faktor, mitte+ (x1- mitte)* faktor)
+      event.accept()
+#
+#  Verschieben mit der linken Maustaste
+#
+   def mousePressEvent(self,event):
+      if event.button() == QtCore.Qt.LeftButton:
+         self.zieh_x= event.pos().x()
+         self.zieh_bereich= self.sichtbar()
+
+   def mouseMoveEvent(self,event):
+      if self.zieh_x is None:
+         return
+      r= self.diagramme()[0]
+      x0, x1= self.zieh_bereich
+      d= (event.pos().x()- self.zieh_x)/ r.width()* (x1- x0)
+      self.setze_bereich(x0- d, x1- d)
+
+   def mouseReleaseEvent(self,event):
+      self.zieh_x= None
+#
+#  Doppelklick: alle Messwerte anzeigen
+#
+   def mouseDoubleClickEvent(self,event):
+      self.xbereich= None
+      self.update()
+#
+#  Sichtbaren Zeitbereich setzen, nicht über die Messwerte hinaus
+#
+   def setze_bereich(self,x0,x1):
+      g0, g1= self.gesamtbereich()
+      breite= min(max(x1- x0,1.0), g1- g0)
+      if x0 < g0:
+         x0= g0
+      if x0+ breite > g1:
+         x0= g1- breite
+      if breite >= g1- g0:
+         self.xbereich= None
+      else:
+         self.xbereich= (x0, x0+ breite)
+      self.update()
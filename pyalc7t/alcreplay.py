@@ -0,0 +1,191 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Wiedergabe eines Trace der seriellen Kommunikation ------------------------
+#
+# Spielt einen mit pyalc7t_serialtrace aufgezeichneten Trace (alctrace.py)
+# ohne Ladegerät ab. Die Befehle des Trace werden der Reihe nach über
+# cls_rs232 und die Kanäle ohne Anzeige (cls_kanalkern) ausgeführt: das
+# Lesen der Kanalkonfiguration über enable, jede Kanalabfrage über messung.
+# Die Kanäle erhalten dabei die aufgezeichneten Antworten und Zeitstempel,
+# Logdateien und Sitzungen entstehen wie bei der Aufzeichnung im
+# Arbeitsverzeichnis der Wiedergabe. Weicht ein gesendeter Befehl vom Trace
+# ab, wird die Wiedergabe abgebrochen.
+#
+# Mit --tempo 0 (Standard) läuft die Wiedergabe so schnell wie möglich und
+# dient als Regressionstest und Benchmark der Messwertverarbeitung, mit
+# --tempo 1 in der aufgezeichneten Geschwindigkeit.
+#
+# Aufruf: python3 -m pyalc7t.alcreplay TRACE [--tempo T] [--workdir DIR]
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+#
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from .alcconst import *
+from .alcconfig import ALCCONFIG
+from .alcdevicekern import cls_devicekern
+from .alcrs232 import cls_rs232, Rs232Error, decode_frame, encode_frame, POLL_BEFEHLE
+from .alcsessiondb import cls_sessiondb, SessionDbError
+from .alctrace import cls_replayport, TraceError
+
+class cls_replay(object):
+#
+#  Muss nach ALCCONFIG.defaults erzeugt werden, die Logdateien werden im
+#  aktuellen Verzeichnis geschrieben
+#
+   def __init__(self,datei,tempo=0.0,sessiondb=None,ausgabe=None):
+      self.name= "pyalc7t"
+      self.sessiondb= sessiondb
+      self.logarchiv= None
+      self.metriken= None
+      self.ausgabe= ausgabe
+      self.port= cls_replayport(datei,tempo) # throws TraceError, OSError
+      self.geraet= cls_devicekern(self,0)
+      self.geraet.commobject= cls_rs232("")
+      self.geraet.commobject.attach(self.port,self.port.uhr_ns)
+      self.geraet.status= STAT_ENABLED
+      self.befehle= 0
+      self.messungen= 0
+      self.verarbeitung= 0.0
+      self.fehler= ""
+#
+#  Statusmeldungen des Geräts
+#
+   def show_refresh_message(self):
+      if self.ausgabe is not None:
+         self.ausgabe(self.geraet.message)
+#
+#  Befehle des Trace ausführen bis zum Ende oder bis zur ersten Abweichung,
+#  danach die Kanäle disablen (Aufzeichnungen abschließen). True wenn der
+#  Trace vollständig wiedergegeben wurde
+#
+   def run(self):
+      geraet= self.geraet
+      comm= geraet.commobject
+      try:
+         while self.port.abweichung == "":
+            frame= self.port.naechster_befehl()
+            if frame is None:
+               break
+            self.befehle+=1
+            if frame == bytes((0x02,ord('v'),0x03)):
+               geraet.kennung= comm.read_ident()
+               continue
+            if frame == bytes((0x02,ord('V'),0x03)):
+               geraet.version= comm.read_version()
+               continue
+            b= decode_frame(frame) if len(frame) <= 9 else None
+            abfrage= False
+            if b is None:
+               for kanal in geraet.kanaele:
+                  if frame == b"".join(encode_frame(befehl,kanal,0,0) for befehl in POLL_BEFEHLE):
+                     abfrage= True
+                     break
+               else:
+                  raise TraceError("Unbekannter Befehl %r im Trace" % frame)
+            else:
+               befehl, kanal, param= b
+               if kanal not in geraet.kanaele:
+                  raise TraceError("Unbekannter Kanal %d im Trace" % kanal)
+            k= geraet.kanaele[kanal]
+            if abfrage:
+               beginn= time.perf_counter()
+               k.messung()
+               self.verarbeitung+= time.perf_counter()- beginn
+               self.messungen+=1
+            elif befehl == 'f' and k.status == STAT_DISABLED:
+               k.enable()
+            else:
+               comm.befehl(befehl,kanal,param,befehl.isupper())
+      except KanalError as e:
+#
+#        Ein am Ende des Trace abgebrochener Befehl ist kein Fehler
+#
+         if self.port.naechster_befehl() is not None or self.port.abweichung != "":
+            self.fehler= e.msg+": "+str(e.add_msg)
+      except (Rs232Error, TraceError) as e:
+         self.fehler= e.value
+      if self.port.abweichung != "":
+         self.fehler= self.port.abweichung
+      for k in geraet.kanaele.values():
+         k.disable()
+      self.port.close()
+      return self.fehler == ""
+
+def main():
+   parser=argparse.ArgumentParser(description='Replay a pyalc7t serial trace through the channel processing without a charger')
+   parser.add_argument('trace', help="trace file recorded with pyalc7t_serialtrace")
+   parser.add_argument('--tempo', type=float, default=0.0, help="replay speed, 1 = as recorded, 0 = as fast as possible (default)")
+   parser.add_argument('--workdir', default="", help="directory for the log files (default: new temporary directory)")
+   parser.add_argument('--logformat', choices=("amw","amb"), default="amw", help="log file format")
+   parser.add_argument('--subseconds', action='store_true', help="log times with fractions of seconds")
+   parser.add_argument('--sessiondb', default="", help="also record the sessions in this database in the workdir")
+   parser.add_argument('--verbose', action='store_true', help="print status messages")
+   args=parser.parse_args()
+   trace= os.path.abspath(args.trace)
+   workdir= args.workdir if args.workdir else tempfile.mkdtemp(prefix="pyalc7t-replay-")
+   os.makedirs(workdir,exist_ok=True)
+   os.chdir(workdir)
+#
+#  Konfiguration nur im Speicher, ohne Sicherung des Aufzeichnungszustands
+#
+   ALCCONFIG.defaults("pyalc7t")
+   ALCCONFIG.put("pyalc7t","logformat",args.logformat)
+   ALCCONFIG.put("pyalc7t","subseconds",args.subseconds)
+   ALCCONFIG.put("pyalc7t","checkpointinterval",0)
+   db= None
+   try:
+      if args.sessiondb:
+         db= cls_sessiondb(args.sessiondb)
+      replay= cls_replay(trace,args.tempo,db,print if args.verbose else None)
+   except (TraceError, SessionDbError) as e:
+      print(e.value,file=sys.stderr)
+      sys.exit(1)
+   except OSError as e:
+      print("cannot open %s: %s" % (trace, e.strerror),file=sys.stderr)
+      sys.exit(1)
+   beginn= time.perf_counter()
+   ok= replay.run()
+   dauer= time.perf_counter()- beginn
+   if db is not None:
+      db.close()
+   print("trace:      %s, recorded %s" % (trace, time.strftime("%Y-%m-%d %H:%M:%S",time.localtime(replay.port.beginn))))
+   print("commands:   %d, channel polls: %d, timeouts: %d" % (replay.befehle, replay.messungen, replay.port.timeouts))
+   print("replay:     %.3f s, %.1f polls/s" % (dauer, replay.messungen/ dauer if dauer > 0 else 0.0))
+   if replay.messungen:
+      print("processing: %.1f us per poll" % (replay.verarbeitung/ replay.messungen* 1e6))
+   print("logs:       %s" % workdir)
+   if not ok:
+      print("replay aborted: "+replay.fehler,file=sys.stderr)
+      sys.exit(1)
+
+if __name__ == "__main__":
+   main()
@@ -28,11 +28,34 @@
 # 06.02.17 - jsi:
 # - erste Version
 
+# 18.10.26 - agent:
+# - gepufferter Frame-Leser statt byteweisem read(1)
+# - Kanalabfrage a/s/h/w in einem Durchgang (poll_Kanal)
+# - Zeitstempel (time.monotonic_ns) bei Empfang der Messwerte
+# - Dauer, Timeouts und Wiederholungen jedes Befehls für die Metriken
+# - Aufzeichnung aller gesendeten und empfangenen Bytes (set_trace), Betrieb
+#   mit einer anderen Schnittstelle, z.B. der Wiedergabe eines Trace (attach)
+# - Fehlermeldung beim Öffnen enthält den Namen der Schnittstelle
+
 import serial
 import time
+from .alctrace import cls_traceport
 
 MAX_TIMEOUT_RETRY=6
 TIMEOUT=2
+READ_BUFSIZE=64
+
+#
+# Steuerzeichen des Protokolls
+#
+STX=0x02
+ETX=0x03
+ESC=0x05
+ACK=0x06
+#
+# Befehle der Kanalabfrage: Kanalstatus, Akkustatus, Stromrichtung, Messwerte
+#
+POLL_BEFEHLE=('a','s','h','w')
 
 class Rs232Error(Exception):
    def __init__(self,value):
@@ -40,6 +63,226 @@ class Rs232Error(Exception):
    def __str__(self):
       return repr(self.value)
 #
+#  Encode Byte mit den Escape Sequencen für 0x02, 0x03 und 0x05
+#
+def encode_byte(b):
+   r=bytearray()
+   if b == STX or b == ETX or b == ESC :
+      r.append(ESC)
+      r.append(b+0x10)
+   else:
+      r.append(b)
+   return r
+#
+#  Befehlsframe erzeugen: Befehl, Kanal und ggf zusätzlicher 1-Byte oder 
+#  2-Byte Parameter
+#
+def encode_frame(befehl, kanal, param, param_len):
+   b=bytearray()
+   b.append(STX)
+   b.append(ord(befehl))
+   b+=encode_byte(kanal-1)
+   if param_len == 0 :
+      b.append(0x00)
+      b.append(0x00)
+   if param_len == 1:
+      b+=encode_byte(param)
+      b.append(0x00)
+   if param_len == 2:
+      b+=encode_byte(param >> 8)
+      b+=encode_byte(param % 256)
+   b.append(ETX)
+   return b
+#
+#  Befehlsframe zerlegen, gibt (befehl, kanal, param) zurück. param enthält
+#  beide Parameterbytes, mit param_len=2 erzeugt encode_frame wieder den
+#  gleichen Frame. None, wenn b kein vollständiger Befehlsframe ist
+#
+def decode_frame(b):
+   if len(b) < 6 or b[0] != STX:
+      return None
+   werte=[]
+   i=2
+   while len(werte) < 3:
+      if i >= len(b):
+         return None
+      c=b[i]
+      if c == ESC:
+         i+=1
+         if i >= len(b):
+            return None
+         c=b[i]-0x10
+      elif c == STX or c == ETX:
+         return None
+      werte.append(c)
+      i+=1
+   if i >= len(b) or b[i] != ETX:
+      return None
+   return chr(b[1]), werte[0]+1, werte[1]*256+ werte[2]
+#
+#  Rückgabewerte aus den Nutzdaten eines Frames erzeugen, 
+#  1 Byte, 2 Byte und 3* 2 Byte
+#
+def decode_value(s):
+   count=len(s)
+   if count == 1:
+      return(int(s[0]))
+   elif count == 2:
+      return(int(s[0])*256+ int(s[1]))
+   elif count == 6:
+      r=[]
+      r.append(int(s[0])*256+ int(s[1]))
+      r.append(int(s[2])*256+ int(s[3]))
+      r.append(int(s[4])*256+ int(s[5]))
+      return r
+#
+# Ergebnis einer Kanalabfrage ---------------------------------------------------
+#
+class cls_kanalzustand(object):
+#
+#  Zeit_ns: monotone Zeit in ns bei Empfang der Antwort auf 'w'
+#
+   def __init__(self,KanStatus,AkStatus,IRichtg,Mess,Zeit_ns):
+      self.KanStatus= KanStatus
+      self.AkStatus= AkStatus
+      self.IRichtg= IRichtg
+      self.Mess= Mess
+      self.Zeit_ns= Zeit_ns
+#
+# Frame Leser -------------------------------------------------------------------
+#
+# Liest alle verfügbaren Bytes der Schnittstelle in einen wiederverwendeten
+# Puffer und zerlegt daraus die STX/ESC/ETX Frames. Ein Timeout wird wie bisher
+# pro Leseversuch gezählt. timeouts und wiederholungen zählen alle Timeouts,
+# erneut gesendeten Befehle und übersprungenen Bytes vor einem Frame.
+#
+class cls_framereader(object):
+
+   def __init__(self,ser):
+      self.__ser__= ser
+      self.__buf__= bytearray(READ_BUFSIZE)
+      self.__pos__= 0
+      self.__avail__= 0
+      self.timeouts= 0
+      self.wiederholungen= 0
+#
+#  Eingabepuffer leeren
+#
+   def clear(self):
+      self.__pos__= 0
+      self.__avail__= 0
+      try:
+         self.__ser__.flushInput()
+      except:
+         raise Rs232Error('Flush input auf serieller Schnittstelle fehlgeschlagen')
+#
+#  Puffer aus der Schnittstelle nachfüllen, wartet höchstens TIMEOUT
+#
+   def __fill__(self):
+      try:
+         n= self.__ser__.in_waiting
+         if n < 1:
+            n= 1
+         elif n > READ_BUFSIZE:
+            n= READ_BUFSIZE
+         data= self.__ser__.read(n)
+      except:
+         raise Rs232Error('Kann nicht von serieller Schnittstelle lesen')
+      n= len(data)
+      self.__buf__[0:n]= data
+      self.__pos__= 0
+      self.__avail__= n
+      return n
+#
+#  nächstes Byte, None bei Timeout
+#
+   def getbyte(self):
+      if self.__pos__ >= self.__avail__:
+         if self.__fill__() == 0:
+            return None
+      c= self.__buf__[self.__pos__]
+      self.__pos__+=1
+      return c
+#
+#  nächstes Byte, Rs232Error nach MAX_TIMEOUT_RETRY Timeouts
+#
+   def __getbyte_wait__(self):
+      timeout_retry=0
+      while True:
+         c= self.getbyte()
+         if c is not None:
+            return c
+         timeout_retry= timeout_retry+1
+         self.timeouts+=1
+         if timeout_retry > MAX_TIMEOUT_RETRY:
+            raise Rs232Error('Timeout beim Lesen von serieller Schnittstelle')
+#
+#  String bis Endekennung lesen (Kommando 'V' und 'v')
+#
+   def read_string(self,maxlen):
+      identifier=""
+      count=0
+      while True :
+         c= self.__getbyte_wait__()
+         if c == ETX :
+            break
+         if c < 32 :
+            continue
+         identifier+=chr(c)
+         count=count+1
+         if count > maxlen:
+            raise Rs232Error('Konnte keinen String von serieller Schnittstelle lesen')
+      return identifier
+#
+#  Auf ACK warten, bei anderen Zeichen den Befehl erneut senden
+#
+   def read_ack(self,frame):
+      retry=0
+      while True:
+         c= self.__getbyte_wait__()
+         if c == STX or c == ETX :
+            continue
+         if c == ACK :
+            return
+         try:
+            self.__ser__.write(frame)
+         except:
+            raise Rs232Error('Kann nicht von serieller Schnittstelle lesen')
+         retry=retry+1
+         self.wiederholungen+=1
+         if retry > 3 :
+            raise Rs232Error('Befehlsübermittlung fehlgeschlagen')
+#
+#  Frame lesen, auf Anfangskennung warten, dann Nutzdaten bis Endekennung
+#
+   def read_frame(self,maxlen):
+      retry=0
+      while True:
+         c= self.__getbyte_wait__()
+         if c == STX :
+            break
+         retry=retry+1
+         self.wiederholungen+=1
+         if retry > MAX_TIMEOUT_RETRY :
+            raise Rs232Error('Befehlsübermittlung fehlgeschlagen')
+
+      s=bytearray()
+      escape= False
+      while True:
+         c= self.__getbyte_wait__()
+         if escape:
+            c= c-0x10
+            escape = False
+         elif c == ETX :
+            break
+         elif c == ESC:
+            escape= True
+            continue
+         s.append(c & 0xFF)
+         if len(s) > maxlen:
+            raise Rs232Error('Befehlsübermittlung fehlgeschlagen')
+      return s
+#
 # RS232 Klasse -----------------------------------------------------------------
 #
 class cls_rs232(object):
@@ -47,20 +290,75 @@ class cls_rs232(object):
    def __init__(self,device,parent=None):
       self.__device__= device
       self.__isOpen__= False
+      self.__reader__= None
+      self.metriken= None
+      self.geraet= ""
+      self.tracedatei= ""
+      self.meldung= ""
+      self.uhr_ns= time.monotonic_ns
 
    def isOpen(self):
       return self.__isOpen__
 #
+#  Befehle in den Metriken (alcmetrics.cls_metriken) unter dem Namen geraet
+#  erfassen, None schaltet die Erfassung ab
+#
+   def set_metriken(self,metriken,geraet):
+      self.metriken= metriken
+      self.geraet= geraet
+#
+#  Alle gesendeten und empfangenen Bytes ab dem nächsten open in die Datei
+#  tracedatei aufzeichnen (alctrace.py), "" schaltet die Aufzeichnung ab.
+#  Kann die Datei nicht angelegt werden, läuft die Kommunikation ohne
+#  Aufzeichnung, der Grund steht nach open in meldung
+#
+   def set_trace(self,tracedatei):
+      self.tracedatei= tracedatei
+#
+#  Befehl ausführen und Dauer, Timeouts, Wiederholungen und Fehler erfassen
+#
+   def __messen__(self,befehl,funktion,*args):
+      reader= self.__reader__
+      timeouts= reader.timeouts
+      wiederholungen= reader.wiederholungen
+      fehler= True
+      beginn= time.perf_counter()
+      try:
+         ergebnis= funktion(*args)
+         fehler= False
+         return ergebnis
+      finally:
+         self.metriken.befehl(self.geraet,befehl,time.perf_counter()- beginn,
+            reader.timeouts- timeouts,reader.wiederholungen- wiederholungen,fehler)
+#
 # Kommunikation aufbauen
 #
    def open(self):
+      self.meldung= ""
       try:
          self.__ser__= serial.Serial(port=self.__device__,baudrate=9600,parity=serial.PARITY_EVEN,timeout=TIMEOUT,rtscts=False,dsrdtr=False)
-         self.__isOpen__= True
-         time.sleep(0.5)
       except:
+          meldung= 'Kann serielle Schnittstelle '+self.__device__+' nicht öffnen'
           self.__device__=""
-          raise Rs232Error('Kann serielle Schnittstelle '+self.__device__+' nicht öffnen')
+          raise Rs232Error(meldung)
+      if self.tracedatei != "":
+         try:
+            self.__ser__= cls_traceport(self.__ser__,self.tracedatei)
+         except OSError as e:
+            self.meldung= 'Kann Trace '+self.tracedatei+' nicht schreiben: '+str(e.strerror)
+      self.__reader__= cls_framereader(self.__ser__)
+      self.__isOpen__= True
+      time.sleep(0.5)
+#
+#  Kommunikation über eine bereits geöffnete Schnittstelle ser mit der
+#  Schnittstelle von serial.Serial (read, write, in_waiting, flushInput,
+#  close). uhr_ns liefert die Zeitstempel der Messwerte
+#
+   def attach(self,ser,uhr_ns=time.monotonic_ns):
+      self.__ser__= ser
+      self.__reader__= cls_framereader(ser)
+      self.uhr_ns= uhr_ns
+      self.__isOpen__= True
 #
 #  Kommunikation abbauen
 #
@@ -75,181 +373,78 @@ class cls_rs232(object):
 #  Kommunikation für das Lesen von Strings (Kommando 'V' und 'v')
 #
    def __com_string__(self,befehl):
+      if self.metriken is not None:
+         return self.__messen__(befehl,self.__string__,befehl)
+      return self.__string__(befehl)
+
+   def __string__(self,befehl):
       b=bytearray(3)
-      b[0]=0x02
+      b[0]=STX
       b[1]=ord(befehl)
-      b[2]=0x03
+      b[2]=ETX
 
       try:
          self.__ser__.write(b)
       except:
          raise Rs232Error('Kann nicht auf serielle Schnittstelle schreiben')
-      identifier=""
-      count=0
-      timeout_retry=0
-      while True :
-         try:
-            c=self.__ser__.read(1)
-         except:
-            raise Rs232Error('Kann nicht von serieller Schnittstelle lesen')
-         if c == b'' :
-            timeout_retry= timeout_retry+1
-            if timeout_retry > MAX_TIMEOUT_RETRY:
-               raise Rs232Error('Timeout beim Lesen von serieller Schnittstelle')
-            continue
-         timeout_retry=0
-         if c == b'\x03' :
-            break
-         if(ord(c) < 32) :
-            continue
-         identifier+=chr(ord(c))
-         count=count+1
-         if count > 20:
-            raise Rs232Error('Konnte keinen String von serieller Schnittstelle lesen')
-      return identifier 
-
-#
-#  Encode Befehl mit den Escape Sequencen für 0x02, 0x03 und 0x05
-#
-
-   def __encode__ (self,b):
-      r=bytearray()
-      if b == 2 or b == 3 or b == 5 :
-         r.append(0x05)
-         r.append(b+0x10)
-      else:
-         r.append(b)
-      return r
+      return self.__reader__.read_string(20)
 #
 #  Kommunikation mit ALC 7000 für alle anderen Befehle
 #
    def __com_data__ (self,befehl, kanal, param, param_len,ack):
-#
-#  Befehl und ggf zusätzlichen 1-Byte oder 2-Byte Parameter hinzufügen
-#
-      try:
-         self.__ser__.flushInput()
-      except:
-         raise Rs232Error('Flush input auf serieller Schnittstelle fehlgeschlagen')
-      kanal=kanal-1
-      b=bytearray()
-      s=bytearray()
-      b.append(0x02)
-      b.append(ord(befehl))
-      b=b+self.__encode__(kanal)
-      if param_len == 0 :
-         b.append(0x00)
-         b.append(0x00)
-      if param_len == 1:
-         b=b+self.__encode__(param)
-         b.append(0x00)
-      if param_len == 2:
-         hibyte= param >> 8
-         lobyte= param % 256
-         b=b+self.__encode__(hibyte)
-         b=b+self.__encode__(lobyte)
-      b.append(0x03)
+      if self.metriken is not None:
+         return self.__messen__(befehl,self.__data__,befehl,kanal,param,param_len,ack)
+      return self.__data__(befehl,kanal,param,param_len,ack)
+
+   def __data__(self,befehl, kanal, param, param_len,ack):
+      self.__reader__.clear()
+      b=encode_frame(befehl,kanal,param,param_len)
       try:
          self.__ser__.write(b)
       except:
          raise Rs232Error('Kann nicht auf serielle Schnittstelle schreiben')
-
 #
 #     Kein Rückgabewert, nur ack
 #
       if ack:
-         retry=0
-         timeout_retry=0
-         while True:
-            try:
-               c=self.__ser__.read(1)
-            except:
-               raise Rs232Error('Kann nicht von serieller Schnittstelle lesen')
-            if c == b'' :
-               timeout_retry=timeout_retry+1
-               if timeout_retry > MAX_TIMEOUT_RETRY:
-                  raise Rs232Error('Timeout beim Lesen von serieller Schnittstelle')
-               continue
-            timeout_retry=0
-            if c == b'\x02' :
-               continue
-            if c == b'\x03' :
-               continue
-            if c == b'\x06' :
-               return 
-            try:
-               self.__ser__.write(b)
-            except:
-               raise Rs232Error('Kann nicht von serieller Schnittstelle lesen')
-            retry=retry+1
-            if retry > 3 :
-               raise Rs232Error('Befehlsübermittlung fehlgeschlagen')
+         self.__reader__.read_ack(b)
          return
 #
-#     Rückgabewert, auf Anfangskennung warten
+#     Rückgabewert lesen
 #
-
-      retry=0
-      timeout_retry=0
-      while True:
-         try:
-            c=self.__ser__.read(1)
-         except:
-               raise Rs232Error('Kann nicht von serieller Schnittstelle lesen')
-         if c == b'':
-            timeout_retry=timeout_retry+1
-            if timeout_retry > MAX_TIMEOUT_RETRY:
-               raise Rs232Error('Timeout beim Lesen von serieller Schnittstelle')
-            continue
-         timeout_retry=0
-
-         if c == b'\x02' :
-            break
-         retry=retry+1
-         if retry > MAX_TIMEOUT_RETRY :
-            raise Rs232Error('Befehlsübermittlung fehlgeschlagen')
+      return decode_value(self.__reader__.read_frame(6))
 #
-#     Werte bis Endekennung lesen
+#  Kanalabfrage: alle Anfragen auf einmal senden, die Antworten der Reihe
+#  nach lesen
 #
-      count=0
-      timeout_retry=0
-      escape= False
-      while True:
-         try:
-            c=self.__ser__.read(1)
-         except:
-            raise Rs232Error('Kann nicht von serieller Schnittstelle lesen')
-         if c == b'':
-            timeout_retry=timeout_retry+1
-            if timeout_retry > MAX_TIMEOUT_RETRY:
-               raise Rs232Error('Timeout beim Lesen von serieller Schnittstelle')
-            continue
-         timeout_retry=0
-         if escape:
-            c= chr(ord(c)-0x10)
-            escape = False
-         if c == b'\x03' :
-            break
-         if c == b'\x05':
-            escape= True
-            continue
-         s.append(ord(c)) 
-         count=count+1
-         if count > 6:
-            raise Rs232Error('Befehlsübermittlung fehlgeschlagen')
+   def __com_poll__(self,kanal):
+      if self.metriken is not None:
+         return self.__messen__("poll",self.__poll__,kanal)
+      return self.__poll__(kanal)
+
+   def __poll__(self,kanal):
+      self.__reader__.clear()
+      b=bytearray()
+      for befehl in POLL_BEFEHLE:
+         b+=encode_frame(befehl,kanal,0,0)
+      try:
+         self.__ser__.write(b)
+      except:
+         raise Rs232Error('Kann nicht auf serielle Schnittstelle schreiben')
+      r=[]
+      for befehl in POLL_BEFEHLE:
+         r.append(decode_value(self.__reader__.read_frame(6)))
+         if befehl == 'w':
+            zeit_ns= self.uhr_ns()
 #
-#     Rückgabewerte erzeugen, 1 Byte, 2 Byte und 3* 2 Byte
+#     Status: je 1 Byte, Messwerte: 3* 2 Byte
 #
-      if count == 1:
-         return(int(s[0]))
-      elif count == 2:
-         return(int(s[0])*256+ int(s[1]))
-      elif count == 6:
-         r=[]
-         r.append(int(s[0])*256+ int(s[1]))
-         r.append(int(s[2])*256+ int(s[3]))
-         r.append(int(s[4])*256+ int(s[5]))
-         return r
+      for v in r[0:3]:
+         if not isinstance(v,int):
+            raise Rs232Error('Befehlsübermittlung fehlgeschlagen')
+      if not isinstance(r[3],list):
+         raise Rs232Error('Befehlsübermittlung fehlgeschlagen')
+      return cls_kanalzustand(r[0],r[1],r[2],r[3],zeit_ns)
 #
 # high level funktionen
 #
@@ -288,6 +483,15 @@ class cls_rs232(object):
       
    def read_IRichtg(self,kanal):
       return(self.__com_data__('h',kanal,0,0,0))
+
+   def poll_Kanal(self,kanal):
+      return(self.__com_poll__(kanal))
+#
+#  Beliebiger Befehl mit 2-Byte Parameter, z.B. bei der Wiedergabe eines
+#  Trace. ack: Befehl ohne Rückgabewert
+#
+   def befehl(self,befehl,kanal,param,ack):
+      return(self.__com_data__(befehl,kanal,param,2,ack))
       
    def write_Progr(self,kanal,programm):
       self.__com_data__('F',kanal,programm,1,1)
@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Zeitplan für die Kanalabfrage ---------------------------------------------
+#
+# Jeder Kanal hat einen festen Termin auf der monotonen Uhr. Nach einer
+# Abfrage wird der Termin um die Periode weitergeschoben, unabhängig davon
+# wie lange die Abfrage gedauert hat. Damit bleibt das Messintervall stabil.
+# Die Termine der Kanäle sind gleichmäßig über die Periode verteilt.
+#
+# Die Periode hängt von der Abfrageklasse ab, die der Kanal nach jeder
+# Abfrage meldet: Kanäle kurz vor Delta-Peak oder einem Grenzwert werden am
+# häufigsten abgefragt, aufzeichnende Kanäle mit der eingestellten Periode,
+# ruhende Kanäle selten und leere Kanäle nur, um das Einlegen eines Akkus
+# zu erkennen.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+# - adaptive Abfrage nach Abfrageklassen
+#
+import time
+
+#
+# Eine Abfrage gilt als verspätet, wenn sie mehr als diesen Anteil der
+# Periode nach ihrem Termin beginnt
+#
+TOLERANZ=0.1
+#
+# Zeitraum für die Ermittlung der Messrate in Sekunden
+#
+RATE_INTERVALL=5.0
+#
+# Abfrageklassen
+#
+POLL_KRITISCH=0
+POLL_AKTIV=1
+POLL_RUHE=2
+POLL_LEER=3
+#
+# Kritische Kanäle werden um diesen Faktor häufiger abgefragt als aktive
+#
+FAKTOR_KRITISCH=4
+
+class cls_pollscheduler(object):
+#
+#  periode: Periode aktiver Kanäle, periode_ruhe: Periode ruhender Kanäle,
+#  periode_leer: Periode leerer Kanäle. Die Perioden ruhender und leerer
+#  Kanäle sind mindestens so lang wie die aktiver Kanäle
+#
+   def __init__(self,kanaele,periode,periode_ruhe=None,periode_leer=None,uhr=time.monotonic):
+      self.kanaele= list(kanaele)
+      self.periode= periode
+      if periode_ruhe is None:
+         periode_ruhe= periode
+      if periode_leer is None:
+         periode_leer= periode_ruhe
+      self.perioden= { POLL_KRITISCH: periode/ FAKTOR_KRITISCH,
+                       POLL_AKTIV: periode,
+                       POLL_RUHE: max(periode,periode_ruhe),
+                       POLL_LEER: max(periode,periode_leer) }
+      self.klassen= dict.fromkeys(self.kanaele,POLL_AKTIV)
+      self.uhr= uhr
+      self.verpasst= 0
+      self.anzahl= 0
+      self.rate= 0.0
+      self.termine= { }
+      jetzt= self.uhr()
+      for i, k in enumerate(self.kanaele):
+         self.termine[k]= jetzt+ i* self.periode/ len(self.kanaele)
+      self.__rate_beginn__= jetzt
+      self.__rate_anzahl__= 0
+#
+#  Kanal mit dem frühesten Termin, gibt (kanal, termin) zurück
+#
+   def naechste(self):
+      k= min(self.kanaele, key=lambda k: self.termine[k])
+      return k, self.termine[k]
+#
+#  Abfrage eines Kanals wurde zum Zeitpunkt beginn gestartet und ist
+#  abgeschlossen, klasse ist die neue Abfrageklasse des Kanals. Nächsten
+#  Termin festlegen, verspätete Abfragen zählen. Liegt der Kanal mehr als
+#  eine Periode zurück, wird der Zeitplan neu ausgerichtet statt die
+#  ausgefallenen Abfragen nachzuholen.
+#
+   def erledigt(self,kanal,beginn,klasse=POLL_AKTIV):
+      termin= self.termine[kanal]
+      periode= self.perioden[self.klassen[kanal]]
+      if periode > 0 and beginn- termin > periode* TOLERANZ:
+         self.verpasst+=1
+      if klasse != self.klassen[kanal]:
+         self.klassen[kanal]= klasse
+         termin= beginn
+      periode= self.perioden[klasse]
+      termin+= periode
+      if termin < beginn:
+         termin= beginn+ periode
+      self.termine[kanal]= termin
+      self.anzahl+=1
+      self.__rate_anzahl__+=1
+#
+#  Kanal sofort abfragen, z.B. nach einem Befehl für diesen Kanal
+#
+   def sofort(self,kanal):
+      self.termine[kanal]= self.uhr()
+#
+#  Erreichte Messrate (Abfragen pro Sekunde aller Kanäle), True wenn ein
+#  neuer Wert ermittelt wurde
+#
+   def rate_neu(self):
+      jetzt= self.uhr()
+      dauer= jetzt- self.__rate_beginn__
+      if dauer < RATE_INTERVALL:
+         return False
+      self.rate= self.__rate_anzahl__ / dauer
+      self.__rate_beginn__= jetzt
+      self.__rate_anzahl__= 0
+      return True
@@ -0,0 +1,230 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Sitzungsdatenbank ---------------------------------------------------------
+#
+# Jede Aufzeichnung wird eine Zeile der Tabelle sitzung in einer SQLite
+# Datenbank (WAL Modus): Gerät, Kanal, Einstellungen, Beschreibung des Akkus,
+# Zusammenfassung (geladene und entladene Kapazität, Maximal-, Minimal- und
+# Delta-Peak Spannung, Abbruchgrund) und die Messwerte als BLOB. Die Zeile
+# wird beim Öffnen der Logdatei angelegt und beim Schließen vervollständigt,
+# nach einem Absturz bleibt sie mit ende NULL erhalten.
+#
+# Der BLOB ist spaltenweise aufgebaut wie cls_messwertspeicher: anzahl
+# Zeiten (s), Spannungen (V), Ströme (A) als little endian double, danach
+# anzahl Stromrichtungen als Bytes. Er steht als letzte Spalte in der Zeile,
+# Abfragen ohne Messwerte lesen ihn daher nicht.
+#
+# Indizes auf Beschreibung, Beginn und Programm halten Abfragen über viele
+# Jahre im Millisekundenbereich:
+#
+#    python3 -m pyalc7t.alcsessiondb sessions.db --akku "Sanyo 2700" --von 2025-01-01
+#
+# Die Verbindung wird von den I/O Threads aller Geräte und dem GUI Thread
+# benutzt und ist daher mit einem Lock geschützt.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+#
+import argparse
+import datetime
+import sys
+import threading
+from array import array
+
+try:
+   import sqlite3
+   HAS_SQLITE=True
+except ImportError:
+   HAS_SQLITE=False
+
+from .alcconst import dict_programme
+from .alcstore import cls_messwertspeicher, SP_ZEIT, SP_SPANNUNG, SP_STROM, SP_RICHTUNG
+
+SCHEMA="""
+CREATE TABLE IF NOT EXISTS sitzung (
+   id INTEGER PRIMARY KEY,
+   geraet TEXT NOT NULL,
+   kanal INTEGER NOT NULL,
+   beginn TEXT NOT NULL,
+   ende TEXT,
+   programm INTEGER NOT NULL,
+   akkutyp INTEGER NOT NULL,
+   zellen INTEGER NOT NULL,
+   unenn REAL NOT NULL,
+   ilad REAL NOT NULL,
+   cnenn REAL NOT NULL,
+   ientl REAL NOT NULL,
+   beschreibung TEXT NOT NULL,
+   logdatei TEXT NOT NULL,
+   clad REAL,
+   centl REAL,
+   umax REAL,
+   umin REAL,
+   dp REAL,
+   abbruch TEXT,
+   anzahl INTEGER NOT NULL DEFAULT 0,
+   messwerte BLOB
+);
+CREATE INDEX IF NOT EXISTS sitzung_beschreibung ON sitzung(beschreibung, beginn);
+CREATE INDEX IF NOT EXISTS sitzung_beginn ON sitzung(beginn);
+CREATE INDEX IF NOT EXISTS sitzung_programm ON sitzung(programm, beginn);
+"""
+#
+# Spalten der Zusammenfassung, ohne Messwerte
+#
+SPALTEN=("id", "geraet", "kanal", "beginn", "ende", "programm", "akkutyp", "zellen", "unenn", "ilad", "cnenn", "ientl", "beschreibung", "logdatei", "clad", "centl", "umax", "umin", "dp", "abbruch", "anzahl")
+
+class SessionDbError(Exception):
+   def __init__(self,value):
+      self.value=value
+   def __str__(self):
+      return repr(self.value)
+
+#
+# Messwerte in den BLOB packen und daraus entpacken
+#
+def messwerte_packen(messwerte):
+   spalten= [array("d",messwerte.view(s)) for s in (SP_ZEIT, SP_SPANNUNG, SP_STROM)]
+   if sys.byteorder == "big":
+      for s in spalten:
+         s.byteswap()
+   return b"".join(s.tobytes() for s in spalten)+ messwerte.view(SP_RICHTUNG).tobytes()
+
+def messwerte_entpacken(blob,anzahl):
+   messwerte= cls_messwertspeicher(max(anzahl,1))
+   spalten= [ ]
+   for i in range(3):
+      s= array("d")
+      s.frombytes(blob[i* 8* anzahl:(i+1)* 8* anzahl])
+      if sys.byteorder == "big":
+         s.byteswap()
+      spalten.append(s)
+   richtung= array("b")
+   richtung.frombytes(blob[24* anzahl:25* anzahl])
+   messwerte.erweitern(spalten[0],spalten[1],spalten[2],richtung)
+   return messwerte
+
+class cls_sessiondb(object):
+
+   def __init__(self,dateiname):
+      if not HAS_SQLITE:
+         raise SessionDbError("Python ohne sqlite3 Modul")
+      self.lock= threading.Lock()
+      try:
+         self.db= sqlite3.connect(dateiname,check_same_thread=False,isolation_level=None)
+         self.db.execute("PRAGMA journal_mode=WAL")
+         self.db.execute("PRAGMA synchronous=NORMAL")
+         self.db.executescript(SCHEMA)
+      except sqlite3.Error as e:
+         raise SessionDbError(str(e))
+
+   def close(self):
+      with self.lock:
+         try:
+            self.db.close()
+         except sqlite3.Error:
+            pass
+
+   def __ausfuehren__(self,sql,parameter=()):
+      with self.lock:
+         try:
+            return self.db.execute(sql,parameter)
+         except sqlite3.Error as e:
+            raise SessionDbError(str(e))
+#
+#  Neue Sitzung beim Öffnen der Logdatei, gibt die id zurück
+#
+   def beginn(self,geraet,logkopf,beschreibung,logdatei):
+      beginn= datetime.datetime.strptime(logkopf.datum+" "+logkopf.zeit,"%d-%m-%Y %H:%M:%S").isoformat(" ")
+      c= self.__ausfuehren__("INSERT INTO sitzung (geraet, kanal, beginn, programm, akkutyp, zellen, unenn, ilad, cnenn, ientl, beschreibung, logdatei) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+         (geraet, logkopf.kanal, beginn, logkopf.programm, logkopf.akkutyp, logkopf.zellen, logkopf.unenn, logkopf.ilad, logkopf.cnenn, logkopf.ientl, beschreibung, logdatei))
+      return c.lastrowid
+#
+#  Sitzung beim Schließen der Logdatei abschließen. abbruch ist None bei
+#  regulärem Programmende
+#
+   def abschliessen(self,sid,clad,centl,umax,umin,dp,abbruch,messwerte):
+      ende= datetime.datetime.now().replace(microsecond=0).isoformat(" ")
+      self.__ausfuehren__("UPDATE sitzung SET ende=?, clad=?, centl=?, umax=?, umin=?, dp=?, abbruch=?, anzahl=?, messwerte=? WHERE id=?",
+         (ende, clad, centl, umax, umin, dp, abbruch, len(messwerte), messwerte_packen(messwerte), sid))
+#
+#  Sitzungen suchen, neueste zuerst. von, bis: Datum als "JJJJ-MM-TT",
+#  bis einschließlich. Gibt eine Liste von dicts mit den Spalten SPALTEN
+#  zurück
+#
+   def suchen(self,beschreibung=None,programm=None,von=None,bis=None,anzahl=100):
+      bedingungen= [ ]
+      parameter= [ ]
+      if beschreibung is not None:
+         bedingungen.append("beschreibung=?")
+         parameter.append(beschreibung)
+      if programm is not None:
+         bedingungen.append("programm=?")
+         parameter.append(programm)
+      if von is not None:
+         bedingungen.append("beginn>=?")
+         parameter.append(von)
+      if bis is not None:
+         bedingungen.append("beginn<?")
+         parameter.append(bis+ " 24:00:00")
+      sql= "SELECT "+ ", ".join(SPALTEN)+ " FROM sitzung"
+      if bedingungen:
+         sql+= " WHERE "+ " AND ".join(bedingungen)
+      sql+= " ORDER BY beginn DESC LIMIT ?"
+      parameter.append(anzahl)
+      return [dict(zip(SPALTEN,z)) for z in self.__ausfuehren__(sql,parameter).fetchall()]
+#
+#  Messwerte einer Sitzung als cls_messwertspeicher, None wenn es die
+#  Sitzung nicht gibt
+#
+   def messwerte(self,sid):
+      z= self.__ausfuehren__("SELECT anzahl, messwerte FROM sitzung WHERE id=?",(sid,)).fetchone()
+      if z is None:
+         return None
+      anzahl, blob= z
+      if blob is None:
+         return cls_messwertspeicher()
+      return messwerte_entpacken(blob,anzahl)
+
+def main():
+   parser=argparse.ArgumentParser(description='List charge/discharge sessions of the pyalc7t session database')
+   parser.add_argument('datei',help='session database')
+   parser.add_argument('--akku',default=None,help='battery description')
+   parser.add_argument('--programm',type=int,default=None,help='program number')
+   parser.add_argument('--von',default=None,help='first date YYYY-MM-DD')
+   parser.add_argument('--bis',default=None,help='last date YYYY-MM-DD')
+   parser.add_argument('--anzahl',type=int,default=100,help='maximum number of sessions')
+   args=parser.parse_args()
+   db= cls_sessiondb(args.datei)
+   for s in db.suchen(args.akku,args.programm,args.von,args.bis,args.anzahl):
+      print("%5d %s %-10s K%d %-14s %-20s %7s Ah %7s Ah %6d %s" % (s["id"], s["beginn"], s["geraet"], s["kanal"],
+         dict_programme.get(s["programm"],"?"), s["beschreibung"],
+         "-" if s["clad"] is None else "%.3f" % s["clad"], "-" if s["centl"] is None else "%.3f" % s["centl"],
+         s["anzahl"], s["abbruch"] or ""))
+   db.close()
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,274 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Messwertspeicher ----------------------------------------------------------
+#
+# Die Messwerte einer Aufzeichnung werden spaltenweise in array.array Puffern
+# gespeichert: Zeit seit Beginn der Aufzeichnung (s), Spannung (V), Strom (A)
+# und Stromrichtung. Die Puffer wachsen geometrisch. Beim Wachsen werden neue
+# Puffer angelegt statt die alten zu vergrößern, damit die von view()
+# gelieferten memoryviews gültig bleiben. Ein View zeigt immer den Stand zum
+# Zeitpunkt des Aufrufs. Der I/O Thread hängt an, der GUI Thread liest nur
+# über Views, daher ist kein Lock erforderlich.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+# - Min/Max Reduktion der Messwerte für die Anzeige (cls_minmaxreduktion)
+# - mehrere Messwerte auf einmal anhängen (erweitern)
+#
+from array import array
+
+#
+# Spalten
+#
+SP_ZEIT=0
+SP_SPANNUNG=1
+SP_STROM=2
+SP_RICHTUNG=3
+#
+# Typen der Spalten für array.array
+#
+SPALTEN_TYP= ('d', 'd', 'd', 'b')
+#
+# Anfangsgröße der Puffer (Messwerte)
+#
+KAPAZITAET=1024
+
+class cls_messwertspeicher(object):
+
+   def __init__(self,kapazitaet=KAPAZITAET):
+      self.__anzahl__= 0
+      self.__kapazitaet__= kapazitaet
+      self.__spalten__= [array(t,bytes(array(t).itemsize* kapazitaet)) for t in SPALTEN_TYP]
+
+   def __len__(self):
+      return self.__anzahl__
+#
+#  Messwert anhängen
+#
+   def append(self,zeit,spannung,strom,richtung):
+      n= self.__anzahl__
+      if n == self.__kapazitaet__:
+         self.__wachsen__()
+      s= self.__spalten__
+      s[SP_ZEIT][n]= zeit
+      s[SP_SPANNUNG][n]= spannung
+      s[SP_STROM][n]= strom
+      s[SP_RICHTUNG][n]= richtung
+      self.__anzahl__= n+1
+#
+#  Mehrere Messwerte anhängen, je eine Folge gleicher Länge pro Spalte
+#
+   def erweitern(self,zeit,spannung,strom,richtung):
+      neu= [array(t,w) for t, w in zip(SPALTEN_TYP,(zeit,spannung,strom,richtung))]
+      n= self.__anzahl__
+      k= len(neu[SP_ZEIT])
+      while n+ k > self.__kapazitaet__:
+         self.__wachsen__()
+      for s, w in zip(self.__spalten__,neu):
+         s[n:n+k]= w
+      self.__anzahl__= n+ k
+#
+#  Puffer verdoppeln, die alten Puffer bleiben für bestehende Views erhalten
+#
+   def __wachsen__(self):
+      n= self.__anzahl__
+      kapazitaet= self.__kapazitaet__* 2
+      spalten= [ ]
+      for t, alt in zip(SPALTEN_TYP,self.__spalten__):
+         neu= array(t,bytes(alt.itemsize* kapazitaet))
+         neu[0:n]= alt[0:n]
+         spalten.append(neu)
+      self.__spalten__= spalten
+      self.__kapazitaet__= kapazitaet
+#
+#  Nur lesbarer View auf eine Spalte ohne Kopie, von start bis zum aktuellen
+#  Ende der Aufzeichnung
+#
+   def view(self,spalte,start=0):
+      n= self.__anzahl__
+      return memoryview(self.__spalten__[spalte]).toreadonly()[start:n]
+
+   def zeit(self,start=0):
+      return self.view(SP_ZEIT,start)
+
+   def spannung(self,start=0):
+      return self.view(SP_SPANNUNG,start)
+
+   def strom(self,start=0):
+      return self.view(SP_STROM,start)
+
+   def richtung(self,start=0):
+      return self.view(SP_RICHTUNG,start)
+#
+#  Messwert i als Tupel (zeit, spannung, strom, richtung)
+#
+   def __getitem__(self,i):
+      if i < 0:
+         i+= self.__anzahl__
+      if i < 0 or i >= self.__anzahl__:
+         raise IndexError("Messwert nicht vorhanden")
+      return tuple(s[i] for s in self.__spalten__)
+#
+#  Belegter Speicher in Bytes
+#
+   def speicherbedarf(self):
+      return sum(s.itemsize* len(s) for s in self.__spalten__)
+
+#
+# Min/Max Reduktion für die Anzeige ------------------------------------------
+#
+# Die Zeitachse wird in gleich breite Abschnitte geteilt. Pro Abschnitt und
+# Spalte werden erster, kleinster, größter und letzter Messwert mit Zeit
+# gehalten. Gibt es mehr als 2*breite Abschnitte, wird die Abschnittsbreite
+# verdoppelt und je zwei Abschnitte werden zusammengefasst. Die Kurve behält
+# so alle Spitzen, die Zahl der Punkte hängt nur von der Breite des
+# Diagramms ab und nicht von der Dauer der Aufzeichnung. Neue Messwerte
+# werden nur an den letzten Abschnitt angefügt.
+#
+# Anfangsbreite eines Abschnitts in Sekunden
+#
+ABSCHNITT_START=0.001
+
+class cls_minmaxreduktion(object):
+
+   def __init__(self,breite,spalten=(SP_SPANNUNG,SP_STROM)):
+      self.breite= breite
+      self.spalten= spalten
+      self.reset()
+
+   def reset(self):
+      self.messwerte= None
+      self.verarbeitet= 0
+      self.t0= None
+      self.dt= ABSCHNITT_START
+      self.feste_breite= False
+#
+#     Abschnitte: [Nummer, Werte der 1. Spalte, Werte der 2. Spalte, ...]
+#     Werte: [t_erster, erster, t_min, min, t_max, max, t_letzter, letzter]
+#
+      self.abschnitte= [ ]
+#
+#  Neue Messwerte übernehmen, bei einem anderen Speicher neu beginnen.
+#  Gibt True zurück, wenn sich die Reduktion geändert hat
+#
+   def update(self,messwerte):
+      if messwerte is not self.messwerte:
+         self.reset()
+         self.messwerte= messwerte
+      anzahl= len(messwerte)
+      if anzahl <= self.verarbeitet:
+         return False
+      self.__verarbeiten__(messwerte,self.verarbeitet,anzahl)
+      self.verarbeitet= anzahl
+      return True
+#
+#  Reduktion eines Ausschnitts (Messwerte i0 bis i1-1) mit breite Abschnitten,
+#  z.B. für eine vergrößerte Ansicht
+#
+   @classmethod
+   def ausschnitt(cls,messwerte,i0,i1,breite,spalten=(SP_SPANNUNG,SP_STROM)):
+      r= cls(breite,spalten)
+      if i1 <= i0:
+         return r
+      zeit= messwerte.zeit()
+      r.t0= zeit[i0]
+      r.dt= max((zeit[i1-1]- zeit[i0])/ breite, ABSCHNITT_START)
+      r.feste_breite= True
+      r.__verarbeiten__(messwerte,i0,i1)
+      return r
+
+   def __verarbeiten__(self,messwerte,von,bis):
+      zeit= messwerte.zeit(von)
+      werte= [messwerte.view(s,von) for s in self.spalten]
+      if self.t0 is None:
+         self.t0= zeit[0]
+      abschnitte= self.abschnitte
+      for i in range(bis- von):
+         t= zeit[i]
+         nummer= int((t- self.t0)/ self.dt)
+         while nummer >= 2* self.breite and not self.feste_breite:
+            self.__verdoppeln__()
+            abschnitte= self.abschnitte
+            nummer= int((t- self.t0)/ self.dt)
+         if abschnitte and nummer <= abschnitte[-1][0]:
+            a= abschnitte[-1]
+            for j, w in enumerate(werte):
+               v= w[i]
+               z= a[j+1]
+               if v < z[3]:
+                  z[2]= t
+                  z[3]= v
+               if v > z[5]:
+                  z[4]= t
+                  z[5]= v
+               z[6]= t
+               z[7]= v
+         else:
+            a= [nummer]
+            for w in werte:
+               v= w[i]
+               a.append([t, v, t, v, t, v, t, v])
+            abschnitte.append(a)
+#
+#  Abschnittsbreite verdoppeln und je zwei Abschnitte zusammenfassen
+#
+   def __verdoppeln__(self):
+      self.dt*= 2
+      neu= [ ]
+      for a in self.abschnitte:
+         nummer= a[0] // 2
+         if neu and neu[-1][0] == nummer:
+            b= neu[-1]
+            for z, y in zip(b[1:],a[1:]):
+               if y[3] < z[3]:
+                  z[2]= y[2]
+                  z[3]= y[3]
+               if y[5] > z[5]:
+                  z[4]= y[4]
+                  z[5]= y[5]
+               z[6]= y[6]
+               z[7]= y[7]
+         else:
+            neu.append([nummer]+ [list(z) for z in a[1:]])
+      self.abschnitte= neu
+#
+#  Punkte der reduzierten Kurve für Spalte j (Index in spalten) als Liste
+#  von (zeit, wert), zeitlich sortiert
+#
+   def punkte(self,j):
+      p= [ ]
+      for a in self.abschnitte:
+         z= a[j+1]
+         for t, v in sorted({(z[0],z[1]), (z[2],z[3]), (z[4],z[5]), (z[6],z[7])}):
+            p.append((t,v))
+      return p
+#
+#  Kleinster und größter Wert der Spalte j, None wenn keine Messwerte
+#
+   def wertebereich(self,j):
+      if not self.abschnitte:
+         return None, None
+      return min(a[j+1][3] for a in self.abschnitte), max(a[j+1][5] for a in self.abschnitte)
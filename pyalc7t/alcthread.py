@@ -29,110 +29,158 @@
 # - Ersterstellung
 # 30.11.2022 jsi
 # - PySide6 Migration
-#
-from .alccore import *
-if QTBINDINGS=="PySide6":
-   from PySide6 import QtCore, QtWidgets
-if QTBINDINGS=="PyQt5":
-   from PyQt5 import QtCore, QtWidgets
-
-from .alckanal import KanalError
+# 18.10.2026 agent
+# - I/O Worker mit Prioritätswarteschlange statt halt/resume, Befehle
+#   werden vor der nächsten Messung ausgeführt und liefern ein Future
+# - Kanalabfrage nach festen Terminen (cls_pollscheduler), Meldung der
+#   erreichten Messrate und der verspäteten Abfragen
+# - adaptive Kanalabfrage, Kanal wird nach einem Befehl sofort abgefragt
+# - threading.Thread statt QThread, damit der Worker auch ohne Qt (Daemon)
+#   läuft. Meldungen an die GUI gehen weiterhin über queued signals des Geräts
+# - Messungen und verspätete Abfragen in den Metriken erfassen
+#
+import itertools
+import queue
+import threading
+import traceback
+from concurrent.futures import Future
+from .alcconst import *
+from .alcconfig import ALCCONFIG
+from .alcsched import cls_pollscheduler
 
+#
+# Prioritäten der Aufträge, kleinere Werte werden zuerst ausgeführt. Messungen
+# laufen nur, wenn kein Auftrag ansteht.
+#
+PRIO_ENDE=0
+PRIO_BEFEHL=1
 
-class cls_AlcThread(QtCore.QThread):
+#
+# I/O Worker: einziger Thread, der mit dem ALC 7000 kommuniziert -------------
+#
+class cls_AlcThread(threading.Thread):
 
    def __init__(self, parent, kanaele ):
-      super().__init__()
+      super().__init__(daemon=True)
       self.parent=parent
       self.kanaele= kanaele
-      self.pause= False
       self.running=True
-      self.cond=QtCore.QMutex()
-      self.stop=QtCore.QMutex()
-      self.pauseCond=QtCore.QWaitCondition()
-      self.stoppedCond=QtCore.QWaitCondition()
+      self.lock=threading.Lock()
+      self.auftraege=queue.PriorityQueue()
+      self.seq=itertools.count()
+      self.scheduler=None
       self.parent.emit_message("Keine Verbindung ALC 7000")
 
    def isRunning(self):
       return(self.running)
 #
-#  Thread anhalten
-#   
-   def halt(self):
-      if self.pause:
-         return
-      self.cond.lock()
-      self.pause= True
-      self.cond.unlock()
-      self.stop.lock()
-      self.stoppedCond.wait(self.stop)
-      self.stop.unlock()
-      self.parent.emit_message("Verbindung zu ALC 7000 angehalten")
-#
-#  Angehaltenen Thread weiter laufen lassen
-#
-   def resume(self):
-      if not self.pause:
-         return
-      self.cond.lock()
-      self.pause= False
-      self.cond.unlock()
-      self.pauseCond.wakeAll()
-      self.parent.emit_message("Verbindung zu ALC 7000 hergestellt")
+#  Auftrag einreihen. job wird im Thread ausgeführt, das zurückgegebene
+#  Future enthält das Ergebnis oder die Exception von job. Ist kanal
+#  angegeben, wird dieser Kanal anschließend sofort abgefragt
+#
+   def submit(self,job,prio=PRIO_BEFEHL,kanal=None):
+      future=Future()
+      with self.lock:
+         if self.running:
+            self.auftraege.put((prio,next(self.seq),job,future,kanal))
+            return future
+      future.set_exception(KanalError("Keine Verbindung zu ALC 7000",""))
+      return future
 #
-#  Thread beenden
+#  Thread beenden, noch nicht ausgeführte Aufträge werden abgebrochen
 #
    def finish(self):
       if not self.running:
          return
-      if self.pause:
-         self.terminate()
+      self.auftraege.put((PRIO_ENDE,next(self.seq),None,None,None))
+      self.join()
+#
+#  Auftrag ausführen
+#
+   def ausfuehren(self,job,future):
+      if not future.set_running_or_notify_cancel():
+         return
+      try:
+         result= job()
+      except Exception as e:
+         future.set_exception(e)
       else:
-         self.cond.lock()
-         self.pause= True
+         future.set_result(result)
+#
+#  Wartende Aufträge abbrechen, nachdem der Thread beendet ist
+#
+   def abbrechen(self):
+      with self.lock:
          self.running= False
-         self.cond.unlock()
-         self.stop.lock()
-         self.stoppedCond.wait(self.stop)
-         self.stop.unlock()
+         while True:
+            try:
+               prio, seq, job, future, kanal= self.auftraege.get_nowait()
+            except queue.Empty:
+               break
+            if future is not None:
+               future.cancel()
 
 #
 #  Thread Ausführung
 #         
    def run(self):
 #
-      
+      fehler= None
       try:
          for k in self.kanaele:
             self.kanaele[k].enable()
 
          self.parent.emit_message("Verbindung zu ALC 7000 hergestellt")
 #
-#        Hauptschleife
+#        Messperiode pro Kanal, ohne eigene Einstellung entspricht sie
+#        der Wartezeit zwischen den Messungen mal Anzahl der Kanäle.
+#        Ruhende und leere Kanäle werden seltener abgefragt
+#
+         periode= ALCCONFIG.get("pyalc7t","period")
+         if not periode:
+            periode= len(self.kanaele)* ALCCONFIG.get("pyalc7t","delay")
+         self.scheduler= cls_pollscheduler(self.kanaele,periode,ALCCONFIG.get("pyalc7t","idleperiod"),ALCCONFIG.get("pyalc7t","probeperiod"))
+         metriken= self.parent.metriken()
+#
+#        Hauptschleife: auf Aufträge warten, bis der Termin der nächsten
+#        Messung erreicht ist. Aufträge werden sofort ausgeführt.
 #
-         self.kanalindex= KANAL1
          while True:
-            self.cond.lock()
-            if(self.pause):
-               self.stop.lock()
-               if not self.running:
-                  self.stoppedCond.wakeAll()
-                  self.stop.unlock()
-                  break
-               self.stoppedCond.wakeAll()
-               self.stop.unlock()
-               self.pauseCond.wait(self.cond)
-            self.cond.unlock()
-#
-#           Messwerte verarbeiten
-#
-            self.kanaele[self.kanalindex].messung()
-            self.kanalindex+=1
-            if self.kanalindex > KANAL4:
-               self.kanalindex = KANAL1
+            kanal, termin= self.scheduler.naechste()
+            try:
+               prio, seq, job, future, kanal_befehl= self.auftraege.get(timeout=max(0.0,termin-self.scheduler.uhr()))
+            except queue.Empty:
+#
+#              Messwerte verarbeiten
+#
+               beginn= self.scheduler.uhr()
+               self.kanaele[kanal].messung()
+               self.scheduler.erledigt(kanal,beginn,self.kanaele[kanal].pollklasse())
+               if metriken is not None:
+                  self.kanaele[kanal].metriken_melden(metriken)
+                  metriken.abfragen(self.parent.name,self.scheduler.verpasst)
+               if self.scheduler.rate_neu():
+                  self.parent.emit_message("Messrate %.1f/s, verspätete Abfragen: %d" % (self.scheduler.rate, self.scheduler.verpasst))
+               continue
+            if job is None:
+               break
+            self.ausfuehren(job,future)
+            if kanal_befehl is not None:
+               self.scheduler.sofort(kanal_befehl)
 
       except KanalError as e:
-         self.parent.emit_message('Fehler: '+e.msg+': '+e.add_msg)
-         self.parent.emit_crash()
-      else:
+         fehler= e.msg+': '+e.add_msg
+#
+#     Programmfehler: ebenfalls die Verbindung beenden, sonst bleibt der
+#     Thread als laufend markiert und Aufträge werden nie erledigt
+#
+      except Exception as e:
+         traceback.print_exc()
+         fehler= "%s: %s" % (type(e).__name__, e)
+      finally:
+         self.abbrechen()
+      if fehler is None:
          self.parent.emit_message('nicht mit ALC 7000 verbunden')
+      else:
+         self.parent.emit_message('Fehler: '+fehler)
+         self.parent.emit_crash()
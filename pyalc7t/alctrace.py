@@ -0,0 +1,246 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# pyalc7t 1.0.0
+#
+# Steuerprogramm und Datenlogger für das Ladegerät ALC 7000 von ELV-Elektronik
+# Das Kommunikationsprotokoll und die Messwertverarbeitung wurden aus dem
+# Programm alc7t.bas von Frank Steinberg (www.FrankSteinberg.de) entnommen.
+# (c) Frank Steinberg 2006
+# (c) Joachim Siebold (Python version) 2017
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# Aufzeichnung und Wiedergabe der seriellen Kommunikation --------------------
+#
+# cls_traceport liegt zwischen cls_rs232 und der seriellen Schnittstelle und
+# schreibt alle gesendeten und empfangenen Bytes mit dem Zeitstempel der
+# monotonen Uhr in eine Binärdatei. Jeder Leseversuch wird aufgezeichnet,
+# ein Timeout als Eintrag ohne Daten.
+#
+# cls_replayport ersetzt die serielle Schnittstelle und liefert die
+# empfangenen Bytes eines Trace in der gleichen Stückelung wieder, entweder
+# mit der aufgezeichneten Geschwindigkeit (tempo 1.0), schneller oder so
+# schnell wie möglich (tempo 0). Gesendete Bytes werden mit dem Trace
+# verglichen, die erste Abweichung wird in abweichung festgehalten.
+#
+# Dateiformat: Kopf MAGIC, Version (1 Byte), Wanduhrzeit des Beginns
+# (double), dann Einträge aus Typ (1 Byte, S oder E), Zeitstempel in ns
+# (8 Byte), Länge (2 Byte) und Daten. Alle Zahlen little endian.
+#
+# Changelog
+# 18.10.2026 agent
+# - erste Version
+#
+import struct
+import time
+
+MAGIC=b"ALC7TRC"
+VERSION=1
+KOPF=struct.Struct("<7sBd")
+EINTRAG=struct.Struct("<BQH")
+#
+# Typen der Einträge: gesendet, empfangen
+#
+SENDEN=ord("S")
+EMPFANGEN=ord("E")
+
+class TraceError(Exception):
+   def __init__(self,value):
+      self.value=value
+   def __str__(self):
+      return repr(self.value)
+#
+# Einträge eines Trace als (typ, zeit_ns, daten), ein unvollständiger letzter
+# Eintrag (abgebrochene Aufzeichnung) wird ignoriert. Gibt zuerst die
+# Wanduhrzeit des Beginns zurück
+#
+def lesen(datei):
+   with open(datei,"rb") as f:
+      kopf= f.read(KOPF.size)
+      if len(kopf) < KOPF.size:
+         raise TraceError("Datei "+datei+" ist kein Trace")
+      magic, version, beginn= KOPF.unpack(kopf)
+      if magic != MAGIC:
+         raise TraceError("Datei "+datei+" ist kein Trace")
+      if version != VERSION:
+         raise TraceError("Version %d des Trace wird nicht unterstützt" % version)
+      yield beginn
+      while True:
+         e= f.read(EINTRAG.size)
+         if len(e) < EINTRAG.size:
+            return
+         typ, zeit_ns, laenge= EINTRAG.unpack(e)
+         daten= f.read(laenge)
+         if len(daten) < laenge:
+            return
+         yield typ, zeit_ns, daten
+
+#
+# Aufzeichnung -----------------------------------------------------------------
+#
+class cls_traceport(object):
+#
+#  ser: geöffnete serielle Schnittstelle. OSError, wenn die Datei nicht
+#  angelegt werden kann. Schlägt später das Schreiben fehl, läuft die
+#  Kommunikation ohne Aufzeichnung weiter
+#
+   def __init__(self,ser,datei):
+      self.__ser__= ser
+      self.__datei__= open(datei,"wb")
+      try:
+         self.__datei__.write(KOPF.pack(MAGIC,VERSION,time.time()))
+      except OSError:
+         self.__datei__.close()
+         raise
+
+   def __eintrag__(self,typ,daten):
+      if self.__datei__ is None:
+         return
+      try:
+         self.__datei__.write(EINTRAG.pack(typ,time.monotonic_ns(),len(daten)))
+         self.__datei__.write(daten)
+      except OSError:
+         self.__schliessen__()
+
+   def __schliessen__(self):
+      try:
+         self.__datei__.close()
+      except OSError:
+         pass
+      self.__datei__= None
+
+   def write(self,b):
+      n= self.__ser__.write(b)
+      self.__eintrag__(SENDEN,bytes(b))
+      return n
+
+   def read(self,n):
+      daten= self.__ser__.read(n)
+      self.__eintrag__(EMPFANGEN,daten)
+      return daten
+
+   @property
+   def in_waiting(self):
+      return self.__ser__.in_waiting
+
+   def flushInput(self):
+      self.__ser__.flushInput()
+
+   def close(self):
+      if self.__datei__ is not None:
+         self.__schliessen__()
+      self.__ser__.close()
+
+#
+# Wiedergabe -------------------------------------------------------------------
+#
+class cls_replayport(object):
+#
+#  tempo: 1.0 aufgezeichnete Geschwindigkeit, 0 so schnell wie möglich
+#
+   def __init__(self,datei,tempo=0.0):
+      self.__eintraege__= lesen(datei)
+      self.beginn= next(self.__eintraege__)
+      self.tempo= tempo
+      self.abweichung= ""
+      self.zeit_ns= 0
+      self.gesendet= 0
+      self.empfangen= 0
+      self.timeouts= 0
+      self.__t0__= None
+      self.__start__= None
+      self.__rest__= b""
+      self.__naechster__= None
+      self.__holen__()
+#
+#  Nächsten Eintrag bereitstellen, None am Ende des Trace
+#
+   def __holen__(self):
+      self.__naechster__= next(self.__eintraege__,None)
+      if self.__naechster__ is not None and self.__t0__ is None:
+         self.__t0__= self.__naechster__[1]
+         self.__start__= time.perf_counter()
+#
+#  Bis zum aufgezeichneten Zeitpunkt zeit_ns warten
+#
+   def __warten__(self,zeit_ns):
+      if self.tempo <= 0:
+         return
+      ziel= self.__start__+ (zeit_ns- self.__t0__)/ 1e9/ self.tempo
+      dauer= ziel- time.perf_counter()
+      if dauer > 0:
+         time.sleep(dauer)
+#
+#  Nächster gesendeter Befehl im Trace, ohne ihn zu verbrauchen. Nicht
+#  gelesene empfangene Bytes davor werden übersprungen. None am Ende
+#
+   def naechster_befehl(self):
+      while self.__naechster__ is not None and self.__naechster__[0] != SENDEN:
+         self.__holen__()
+      self.__rest__= b""
+      if self.__naechster__ is None:
+         return None
+      return self.__naechster__[2]
+
+   def uhr_ns(self):
+      return self.zeit_ns
+
+   def write(self,b):
+      erwartet= self.naechster_befehl()
+      if erwartet is None:
+         if self.abweichung == "":
+            self.abweichung= "Befehl %r nach dem Ende des Trace" % bytes(b)
+         return len(b)
+      if bytes(b) != erwartet and self.abweichung == "":
+         self.abweichung= "Befehl %r statt %r im Trace" % (bytes(b), erwartet)
+      self.__warten__(self.__naechster__[1])
+      self.gesendet+=1
+      self.__holen__()
+      return len(b)
+
+   @property
+   def in_waiting(self):
+      if self.__rest__:
+         return len(self.__rest__)
+      if self.__naechster__ is not None and self.__naechster__[0] == EMPFANGEN:
+         return len(self.__naechster__[2])
+      return 0
+#
+#  Empfangene Bytes in der aufgezeichneten Stückelung, ein aufgezeichneter
+#  Timeout liefert b"". Fehlen Bytes im Trace, wird ebenfalls ein Timeout
+#  gemeldet
+#
+   def read(self,n):
+      if not self.__rest__:
+         if self.__naechster__ is None or self.__naechster__[0] != EMPFANGEN:
+            self.timeouts+=1
+            return b""
+         typ, zeit_ns, self.__rest__= self.__naechster__
+         self.__warten__(zeit_ns)
+         self.zeit_ns= zeit_ns
+         self.__holen__()
+         if not self.__rest__:
+            self.timeouts+=1
+            return b""
+      daten= self.__rest__[:n]
+      self.__rest__= self.__rest__[n:]
+      self.empfangen+= len(daten)
+      return daten
+
+   def flushInput(self):
+      pass
+
+   def close(self):
+      self.__eintraege__.close()
@@ -48,6 +48,12 @@
 # - PySide6 Migration
 # 05.02.2024 jsi
 # - removed deprecation warnings
+# 18.10.2026 agent
+# - Kanalmenüs und Kanalanzeigen pro Gerät (cls_ui.add_device)
+# - Kanalkonfiguration wird ohne Warten auf den I/O Thread programmiert
+# - Web View der Online-Hilfe wird erst beim ersten Öffnen geladen
+# - Feld Beschreibung in der Kanalkonfiguration wieder eingeführt, die
+#   Beschreibung wird in der Sitzungsdatenbank gespeichert
 #
 import os
 import glob
@@ -60,14 +66,8 @@ if isWINDOWS():
    import winreg
 if QTBINDINGS=="PySide6":
    from PySide6 import QtCore, QtWidgets
-   if HAS_WEBENGINE:
-      from PySide6 import QtWebEngineWidgets
 if QTBINDINGS=="PyQt5":
    from PyQt5 import QtCore, QtWidgets
-   if HAS_WEBKIT:
-      from PyQt5 import QtWebKitWidgets
-   if HAS_WEBENGINE:
-      from PyQt5 import QtWebEngineWidgets
 
 import pyalc7t
 
@@ -123,12 +123,10 @@ class cls_HelpWindow(QtWidgets.QDialog):
 
       self.vlayout = QtWidgets.QVBoxLayout()
       self.setLayout(self.vlayout)
-      if HAS_WEBKIT:
-         self.view = QtWebKitWidgets.QWebView()
-      if HAS_WEBENGINE:
-         self.view = QtWebEngineWidgets.QWebEngineView()
-      if not HAS_WEBENGINE and not HAS_WEBKIT:
+      webview= webview_klasse()
+      if webview is None:
          raise HelpError("Die Python bindings für QtWebKit oder QtWebEngine fehlen. Die Online-Hilfe kann nicht angezeitg werden.")
+      self.view = webview()
       self.view.setMinimumWidth(600)
       self.vlayout.addWidget(self.view)
       self.buttonExit = QtWidgets.QPushButton('Exit')
@@ -143,9 +141,8 @@ class cls_HelpWindow(QtWidgets.QDialog):
       self.hlayout.addWidget(self.buttonExit)
       self.hlayout.addWidget(self.buttonForward)
       self.vlayout.addLayout(self.hlayout)
-      if HAS_WEBKIT or HAS_WEBENGINE:
-         self.buttonBack.clicked.connect(self.do_back)
-         self.buttonForward.clicked.connect(self.do_forward)
+      self.buttonBack.clicked.connect(self.do_back)
+      self.buttonForward.clicked.connect(self.do_forward)
 
    def do_exit(self):
       self.hide()
@@ -558,14 +555,12 @@ class cls_ui(QtWidgets.QMainWindow):
 
    def __init__(self,parent,version):
       super().__init__()
-      self.kmenus= { }
       self.setWindowTitle("pyALC7T "+version)
+      self.scroll= None
 #
 #     signals
 #
-      self.sig_crash= parent.sig_crash
       self.sig_quit= parent.sig_quit
-      self.sig_show_message= parent.sig_show_message
 #
 #     Fonts initialisieren 
 #
@@ -583,8 +578,6 @@ class cls_ui(QtWidgets.QMainWindow):
       self.menubar = self.menuBar()
       self.menubar.setNativeMenuBar(False)
       self.menuFile= self.menubar.addMenu('Datei')
-      for k in { KANAL1, KANAL2, KANAL3, KANAL4 } :
-         self.kmenus[k]= self.menubar.addMenu("Kanal "+str(k))
       self.menuHelp= self.menubar.addMenu('Hilfe')
 
       self.actionConfig=self.menuFile.addAction("pyALC7T Konfiguration")
@@ -612,50 +605,6 @@ class cls_ui(QtWidgets.QMainWindow):
       self.progname.setContentsMargins(0,5,5,5)
 
       self.vbox.addWidget(self.progname)
-      self.hbox= QtWidgets.QHBoxLayout()
-      self.hbox.setAlignment( QtCore.Qt.AlignLeft)
-      self.vbox.addLayout(self.hbox)
-#
-#     Labels Frame
-#
-      self.lframe=QtWidgets.QFrame()
-      self.vlbox= QtWidgets.QVBoxLayout()
-      self.lframe.setLayout(self.vlbox)
-      self.vlbox.setAlignment(QtCore.Qt.AlignTop)
-      self.lh=QtWidgets.QLabel("Einstallungen")
-      self.lh.setFont(FONT_BOLD)
-      self.vlbox.addWidget(self.lh)
- 
-      self.vlbox.addSpacing(10)
-
-      self.vlbox.addWidget(QtWidgets.QLabel("Programm"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Akkutyp"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Zellenzahl"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Nennspannung"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Nennkapazität"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Ladestrom"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Entladestrom"))
-      
-      self.vlbox.addSpacing(10)
-      self.mw=QtWidgets.QLabel("Messwerte")
-      self.mw.setFont(FONT_BOLD)
-      self.vlbox.addWidget(self.mw)
-      self.vlbox.addSpacing(10)
-     
-      self.vlbox.addWidget(QtWidgets.QLabel("Kanalstatus"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Akkustatus"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Dauer der Aufzeichnung"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Aktuelle Spannung"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Maximalspannung"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Mininalspannung"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Delta-Peak des letzten Ladens"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Aktueller Strom"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Stromrichtung"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Letzte geladene Kapazität"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Letzte entladene Kapazität"))
-      self.vlbox.addWidget(QtWidgets.QLabel("Messwertdatei"))
-      self.hbox.addWidget(self.lframe)
-
 #
 #     Status bar
 #
@@ -667,16 +616,79 @@ class cls_ui(QtWidgets.QMainWindow):
       self.show()
 
 #
-#  queued signal emit für die Anzeige der Statusmeldung
+#  Gerät hinzufügen: Kanalmenüs und Zeile für die Kanalanzeigen erzeugen
 #
-   def emit_message(self,s):
-      self.sig_show_message.emit(s)
-
-#
-#  queued signal emit um einen Crash anzuzeigen
+   def add_device(self,devnr,name):
+      kmenus= { }
+      if devnr == 0:
+         for k in ( KANAL1, KANAL2, KANAL3, KANAL4 ) :
+            kmenus[k]= QtWidgets.QMenu("Kanal "+str(k),self.menubar)
+            self.menubar.insertMenu(self.menuHelp.menuAction(),kmenus[k])
+      else:
 #
-   def emit_crash(self):
-      self.sig_crash.emit()
+#        weitere Geräte erhalten ein eigenes Menü, das Fenster wird scrollbar
+#
+         if self.scroll is None:
+            self.scroll= QtWidgets.QScrollArea()
+            self.scroll.setFrameShape(QtWidgets.QFrame.NoFrame)
+            self.scroll.setWidgetResizable(True)
+            self.scroll.setWidget(self.takeCentralWidget())
+            self.setCentralWidget(self.scroll)
+         dmenu= QtWidgets.QMenu(name,self.menubar)
+         self.menubar.insertMenu(self.menuHelp.menuAction(),dmenu)
+         for k in ( KANAL1, KANAL2, KANAL3, KANAL4 ) :
+            kmenus[k]= dmenu.addMenu("Kanal "+str(k))
+         devname= QtWidgets.QLabel(name)
+         devname.setFont(self.progname.font())
+         devname.setContentsMargins(0,15,5,5)
+         self.vbox.addWidget(devname)
+      hbox= QtWidgets.QHBoxLayout()
+      hbox.setAlignment( QtCore.Qt.AlignLeft)
+      self.vbox.addLayout(hbox)
+      hbox.addWidget(self.labelframe())
+      return kmenus, hbox
+#
+#  Beschriftung der Kanalanzeigen
+#
+   def labelframe(self):
+      lframe=QtWidgets.QFrame()
+      vlbox= QtWidgets.QVBoxLayout()
+      lframe.setLayout(vlbox)
+      vlbox.setAlignment(QtCore.Qt.AlignTop)
+      lh=QtWidgets.QLabel("Einstallungen")
+      lh.setFont(FONT_BOLD)
+      vlbox.addWidget(lh)
+ 
+      vlbox.addSpacing(10)
+
+      vlbox.addWidget(QtWidgets.QLabel("Programm"))
+      vlbox.addWidget(QtWidgets.QLabel("Akkutyp"))
+      vlbox.addWidget(QtWidgets.QLabel("Zellenzahl"))
+      vlbox.addWidget(QtWidgets.QLabel("Nennspannung"))
+      vlbox.addWidget(QtWidgets.QLabel("Nennkapazität"))
+      vlbox.addWidget(QtWidgets.QLabel("Ladestrom"))
+      vlbox.addWidget(QtWidgets.QLabel("Entladestrom"))
+      
+      vlbox.addSpacing(10)
+      mw=QtWidgets.QLabel("Messwerte")
+      mw.setFont(FONT_BOLD)
+      vlbox.addWidget(mw)
+      vlbox.addSpacing(10)
+     
+      vlbox.addWidget(QtWidgets.QLabel("Kanalstatus"))
+      vlbox.addWidget(QtWidgets.QLabel("Akkustatus"))
+      vlbox.addWidget(QtWidgets.QLabel("Dauer der Aufzeichnung"))
+      vlbox.addWidget(QtWidgets.QLabel("Aktuelle Spannung"))
+      vlbox.addWidget(QtWidgets.QLabel("Maximalspannung"))
+      vlbox.addWidget(QtWidgets.QLabel("Mininalspannung"))
+      vlbox.addWidget(QtWidgets.QLabel("Delta-Peak des letzten Ladens"))
+      vlbox.addWidget(QtWidgets.QLabel("Aktueller Strom"))
+      vlbox.addWidget(QtWidgets.QLabel("Stromrichtung"))
+      vlbox.addWidget(QtWidgets.QLabel("Letzte geladene Kapazität"))
+      vlbox.addWidget(QtWidgets.QLabel("Letzte entladene Kapazität"))
+      vlbox.addWidget(QtWidgets.QLabel("Messwertdatei"))
+      return lframe
+
 #
 #  close event abfangen
 #
@@ -743,6 +755,7 @@ class cls_KanalConfigWindow(QtWidgets.QDialog):
       self.gridLayout2.addWidget(QtWidgets.QLabel("Nennkapazität (Ah)"),4,0)
       self.gridLayout2.addWidget(QtWidgets.QLabel("Ladestrom (A)"),5,0)
       self.gridLayout2.addWidget(QtWidgets.QLabel("Entladestrom (A)"),6,0)
+      self.gridLayout2.addWidget(QtWidgets.QLabel("Beschreibung"),7,0)
 
       self.comboBox_akkutyp = QtWidgets.QComboBox()
       self.gridLayout2.addWidget(self.comboBox_akkutyp,1,1)
@@ -763,6 +776,9 @@ class cls_KanalConfigWindow(QtWidgets.QDialog):
       self.lineEdit_Entladestrom = QtWidgets.QLineEdit()
       self.gridLayout2.addWidget(self.lineEdit_Entladestrom,6,1)
 
+      self.lineEdit_Beschreibung = QtWidgets.QLineEdit()
+      self.gridLayout2.addWidget(self.lineEdit_Beschreibung,7,1)
+
 #
 #     Buttown Spalte
 #
@@ -820,6 +836,8 @@ class cls_KanalConfigWindow(QtWidgets.QDialog):
       self.lineEdit_Entladestrom.setInputMask("0.00")
       self.lineEdit_Entladestrom.editingFinished.connect(self.do_lineEdit_Entladestrom)
 
+      self.lineEdit_Beschreibung.editingFinished.connect(self.do_lineEdit_Beschreibung)
+
       self.update_gui()
 #
 #  Action-Script: Spin Box Anzahl Zellen geändert ---
@@ -912,6 +930,10 @@ class cls_KanalConfigWindow(QtWidgets.QDialog):
       self.lineEdit_Nennkapazitaet.setText("%5.3f" % self.config['CNenn'])
       self.lineEdit_Ladestrom.setText("%5.3f" % self.config['ILad'])
       self.lineEdit_Entladestrom.setText("%5.3f" % self.config['IEntl'])
+#
+#     ältere Kanalkonfigurationsdateien enthalten keine Beschreibung
+#
+      self.lineEdit_Beschreibung.setText(self.config.get('Beschreibung',""))
       self.spinBox_Zellenzahl.setValue(self.config['AnzZellen'])
       self.lbl_titel.setText("Konfiguration für Kanal %d" % self.kanalnr)
       if self.geprueft :
@@ -1071,20 +1093,17 @@ class cls_KanalConfigWindow(QtWidgets.QDialog):
 
 #
 # Action-Script: Konfiguration programmieren ---
+#
+#  Fehlermeldungen gibt der Kanal aus, wenn der Befehl ausgeführt wurde
 #
    def do_programmieren(self):
-      g=QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
       self.kanal.AKTyp= self.config['AKTyp']
       self.kanal.AnzZellen= self.config['AnzZellen']
       self.kanal.CNenn=self.config['CNenn']
       self.kanal.ILad= self.config['ILad']
       self.kanal.IEntl= self.config['IEntl']
-      try:
-         self.kanal.kanal_programmieren(self.config)
-         g=QtWidgets.QApplication.restoreOverrideCursor()
-      except KanalError as e:
-         g=QtWidgets.QApplication.restoreOverrideCursor()
-         reply=QtWidgets.QMessageBox.critical(self,'Fehler',"Kanalkonfiguration kann nicht eingestellt werden. "+e.msg,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+      self.kanal.Beschreibung= self.config.get('Beschreibung',"")
+      self.kanal.kanal_programmieren(self.config)
 
    @staticmethod
    def getKanalConfig(kanal):
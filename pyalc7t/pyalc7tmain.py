@@ -43,6 +43,25 @@
 # - PySide6 Migration
 # 05.02.2024 jsi
 # - removed deprecation warnings
+# 18.10.2026 agent
+# - mehrere Geräte (Konfigurationsparameter devices), Geräteklassen in
+#   alcdevice.py
+# - Konfigurationsparameter period (Messperiode pro Kanal)
+# - Konfigurationsparameter idleperiod, probeperiod
+# - Konfigurationsparameter subseconds
+# - Konfigurationsparameter refreshinterval
+# - Konfigurationsparameter logflushinterval, logflushsize, logsync
+# - Konfigurationsparameter logformat
+# - Sitzungsdatenbank (Konfigurationsparameter sessiondb)
+# - Archivierung der Logdateien (Konfigurationsparameter logarchive,
+#   logcompress, logkeep, logmaxage)
+# - Fortsetzen von Aufzeichnungen (Konfigurationsparameter checkpointinterval)
+# - Standardwerte der Konfiguration mit ALCCONFIG.defaults, gemeinsam mit dem
+#   Daemon (alcdaemon.py)
+# - AA_ShareOpenGLContexts vor dem Erzeugen der QApplication (vorbereiten),
+#   damit die Web Engine erst mit der Online-Hilfe geladen werden kann
+# - Metriken (Konfigurationsparameter metricsport, metricsaddress,
+#   metricsfile)
 #
 #
 import os
@@ -56,10 +75,12 @@ if QTBINDINGS=="PySide6":
 if QTBINDINGS=="PyQt5":
    from PyQt5 import QtCore, QtWidgets
 
-from .alcrs232 import cls_rs232, Rs232Error
+from .alcrs232 import Rs232Error
 from .alcconfig import AlcConfigError, ALCCONFIG
-from .alckanal import cls_kanal
-from .alcthread import cls_AlcThread
+from .alcdevice import cls_device, cls_deviceregistry
+from .alcsessiondb import cls_sessiondb, SessionDbError
+from .alcarchiv import cls_logarchiv
+from .alcmetrics import cls_metriken, cls_metrikexport
 from .alcwidgets import cls_ui, cls_AboutWindow, cls_HelpWindow, HelpError,cls_AlcConfigWindow
 
 #
@@ -68,12 +89,8 @@ from .alcwidgets import cls_ui, cls_AboutWindow, cls_HelpWindow, HelpError,cls_A
 class cls_alc7t(QtCore.QObject):
 
    if QTBINDINGS=="PySide6":
-      sig_show_message=QtCore.Signal(str)
-      sig_crash=QtCore.Signal()
       sig_quit=QtCore.Signal()
    if QTBINDINGS=="PyQt5":
-      sig_show_message=QtCore.pyqtSignal(str)
-      sig_crash=QtCore.pyqtSignal()
       sig_quit=QtCore.pyqtSignal()
 
 
@@ -86,12 +103,14 @@ class cls_alc7t(QtCore.QObject):
          if args.instance.isalnum():
             self.instance=args.instance
       self.status= STAT_DISABLED
-      self.commobject= None
-      self.commthread= None
+      self.devices= None
       self.helpwin= None
       self.aboutwin=None
-      self.kanaele={ }
       self.message=""
+      self.sessiondb= None
+      self.logarchiv= None
+      self.metriken= None
+      self.metrikexport= None
       self.msgTimer= QtCore.QTimer()
       self.msgTimer.timeout.connect(self.show_refresh_message) 
 
@@ -106,12 +125,8 @@ class cls_alc7t(QtCore.QObject):
       self.ui.actionHelp.triggered.connect(self.do_Help)
 
 #
-#     queued signal to show a status message. This is the only update of
-#     the user interface that is issued by the thread process and must
-#     be issued as a queued connection
+#     queued signal to exit
 #
-      self.sig_show_message.connect(self.show_message, QtCore.Qt.QueuedConnection)
-      self.sig_crash.connect(self.do_crash_cleanup, QtCore.Qt.QueuedConnection)
       self.sig_quit.connect(self.do_Exit, QtCore.Qt.QueuedConnection)
 
 #
@@ -119,14 +134,7 @@ class cls_alc7t(QtCore.QObject):
 #
       try:
          ALCCONFIG.open(self.name,CONFIG_VERSION,self.instance)
-         ALCCONFIG.get(self.name,"tty","")
-         ALCCONFIG.get(self.name,"workdir", os.path.expanduser('~'))
-         ALCCONFIG.get(self.name,"gnuplot", "")
-         ALCCONFIG.get(self.name,"plotsize", 400)
-         ALCCONFIG.get(self.name,"version","0.0.0")
-         ALCCONFIG.get(self.name,"position","")
-         ALCCONFIG.get(self.name,"helpposition","")
-         ALCCONFIG.get(self.name,"delay",2)
+         ALCCONFIG.defaults(self.name)
          ALCCONFIG.save()
       except AlcConfigError as e:
          reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',e.msg+': '+e.add_msg,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
@@ -138,11 +146,9 @@ class cls_alc7t(QtCore.QObject):
       thisversion=encode_version(VERSION)
       ALCCONFIG.put(self.name,"version",VERSION)
 #
-#     Kanäle erzeugen
+#     Geräte und Kanäle erzeugen
 #
-      
-      for k in { KANAL1, KANAL2, KANAL3, KANAL4 } :
-         self.kanaele[k]=cls_kanal(self,k)
+      self.devices= cls_deviceregistry(self,cls_device)
 #
 #     Fenster an die letze gespeicherte Position verschieben
 #
@@ -190,28 +196,44 @@ class cls_alc7t(QtCore.QObject):
          reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann nicht auf Arbeitsverzeichnis wechseln",QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
          return
 #
-#     Verbindung zu ALC7000 aufbauen
+#     Sitzungsdatenbank im Arbeitsverzeichnis öffnen
 #
-      try:
-         self.commobject=cls_rs232(ALCCONFIG.get(self.name,'tty'))
-         self.commobject.open()
-         self.kennung= self.commobject.read_ident()
-         self.version=self.commobject.read_version()
-      except Rs232Error as e:
-         reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',e.value,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
-         return
-      if not self.kennung == "ALC7000":
-         reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Gerät nicht gefunden",QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
-         return
+      dbname= ALCCONFIG.get(self.name,"sessiondb")
+      if dbname != "":
+         try:
+            self.sessiondb= cls_sessiondb(dbname)
+         except SessionDbError as e:
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',"Kann Sitzungsdatenbank nicht öffnen: "+e.value,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
 #
-#     Thread erzuegen
+#     Archiv der Logdateien
 #
-      self.commthread= cls_AlcThread(self.ui, self.kanaele)
-
+      if ALCCONFIG.get(self.name,"logarchive"):
+         self.logarchiv= cls_logarchiv(ALCCONFIG.get(self.name,"logcompress"),ALCCONFIG.get(self.name,"logkeep"),ALCCONFIG.get(self.name,"logmaxage"))
+#
+#     Metriken über HTTP oder in eine Datei exportieren
 #
-#     start thread
+      port= ALCCONFIG.get(self.name,"metricsport")
+      datei= ALCCONFIG.get(self.name,"metricsfile")
+      if port or datei != "":
+         self.metriken= cls_metriken()
+         self.metrikexport= cls_metrikexport(self.metriken,port,ALCCONFIG.get(self.name,"metricsaddress"),datei)
+         if self.metrikexport.meldung != "":
+            reply=QtWidgets.QMessageBox.warning(self.ui,'Warnung',self.metrikexport.meldung,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
 #
-      self.commthread.start()
+#     Verbindung zu den Geräten aufbauen, Kanäle und Thread starten
+#
+      for d in self.devices:
+         try:
+            d.enable()
+         except Rs232Error as e:
+            if len(self.devices) > 1:
+               msg= d.name+": "+e.value
+            else:
+               msg= e.value
+            reply=QtWidgets.QMessageBox.critical(self.ui,'Fehler',msg,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
+            continue
+         if d.meldung != "":
+            reply=QtWidgets.QMessageBox.warning(self.ui,'Warnung',d.meldung,QtWidgets.QMessageBox.Ok,QtWidgets.QMessageBox.Ok)
       self.status= STAT_ENABLED
 #
 #   alc7t disablen
@@ -220,52 +242,26 @@ class cls_alc7t(QtCore.QObject):
       if self.status== STAT_DISABLED:
          return
 #
-#     stop thread
-#
-      if self.commthread is not None:
-         if self.commthread.isRunning:
-            self.commthread.finish()
-#
-#     Kanäle disablen
-#
-      for k in { KANAL1, KANAL2, KANAL3, KANAL4 } :
-         self.kanaele[k].disable()
-#
-#     Verbindung abbauen
-#
-      if self.commobject != None:
-         try:
-            self.commobject.close()
-         except:
-            pass
-      self.commobject=None
+#     Threads beenden, Kanäle disablen, Verbindungen abbauen
+#
+      for d in self.devices:
+         d.disable()
+      if self.sessiondb is not None:
+         self.sessiondb.close()
+         self.sessiondb= None
+      if self.logarchiv is not None:
+         self.logarchiv.beenden()
+         self.logarchiv= None
+      if self.metrikexport is not None:
+         self.metrikexport.beenden()
+         self.metrikexport= None
+      self.metriken= None
       self.status= STAT_DISABLED
 #
-#     pause thread
-#
-   def pause_commthread(self):
-      self.commthread.halt()
-#
-#     resume thread
-#
-   def resume_commthread(self):
-      self.commthread.resume()
-#
-#     clean up from crash
-#
-   def do_crash_cleanup(self):
-      self.commthread=None
-      self.disable()
-#
-#     Status Meldung anzeigen
-#
-   def show_message(self,message):
-      self.message=self.kennung+' '+self.version+': '+message
-      self.ui.statusbar.showMessage(self.message)
-#
-#     Status Meldung aktualisieren
+#     Status Meldung aller Geräte anzeigen/aktualisieren
 #
    def show_refresh_message(self):
+      self.message= self.devices.messages()
       self.ui.statusbar.showMessage(self.message)
 #
 #     callback alc7t Konfiguration
@@ -358,6 +354,14 @@ def dumpstacks(signal, frame):
     traceback.print_stack(f=stack)
 
 
+#
+# Einstellungen vor dem Erzeugen der QApplication. Die Web Engine wird erst
+# mit der Online-Hilfe geladen, dafür müssen die OpenGL Kontexte geteilt
+# werden
+#
+def vorbereiten():
+   QtCore.QCoreApplication.setAttribute(QtCore.Qt.AA_ShareOpenGLContexts)
+
 #
 # Hauptprogramm ---------------------------------------------------------------------
 #
@@ -369,6 +373,7 @@ def main():
    if not isWINDOWS():
       signal.signal(signal.SIGQUIT, dumpstacks)
 
+   vorbereiten()
    app = QtWidgets.QApplication(sys.argv)
    alc7t= cls_alc7t(args)
    sys.exit(app.exec())
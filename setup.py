@@ -69,5 +69,6 @@ setup(
 
     entry_points={
        'gui_scripts': [ 'pyalc7t= pyalc7t:main', ] ,
+       'console_scripts': [ 'pyalc7t-daemon= pyalc7t:daemon', ] ,
     }
 )